@@ -0,0 +1,1275 @@
+"""
+Bitboard implementation of the checkers game logic (supports 6x6 up to 20x20).
+
+The men and kings of each player are stored as Python integers where every bit
+stands for one square of the board. Square (row, col) is stored at bit
+row * (size + 1) + col, so every row has one extra "ghost" column that is never
+part of the board. Stepping along a diagonal is then a shift by size or
+size + 2 bits, and a shift that leaves the board always lands on a ghost bit or
+outside of the board mask instead of wrapping around to the other side.
+
+BitboardCheckersGame has the methods of CheckersGame that the players and the
+bots use, so it can be used in its place by the TUI, the GUI and the bots:
+
+    game = BitboardCheckersGame(nrows)
+    game.player_valid_moves(color)
+    game.move(color, start, end)
+    game.get_winner()
+
+Moves returned by generate_moves are checkers.Move values with the same dark
+square indices as CheckersGame. Positions (to_fen, snapshot, position) and
+pickling are only supported by CheckersGame.
+"""
+from typing import Callable, Optional, List, Tuple, Dict
+
+from checkers import PieceColor, Move, MoveEvent, dark_squares
+
+BitboardMoveRecord = Tuple[int, int, int, int, Optional[Tuple[int, int]], int,
+                           int, Optional[PieceColor], PieceColor]
+"""
+Type for the undo record returned by BitboardCheckersGame.make_move: the four
+bitboards, the jumping location, the moves since capture counters, the winner
+and the player to move from before the move.
+"""
+
+class BitboardGeometry:
+    """
+    Class for storing the masks and bit layout of a board size. A geometry is
+    built once per board size and shared by every game of that size.
+    """
+
+    #
+    # PUBLIC ATTRIBUTES
+    #
+
+    # number of rows and columns of the board
+    size: int
+
+    # number of bits used per row (one more than the number of columns)
+    width: int
+
+    # mask of every playable (dark) square on the board
+    board_mask: int
+
+    # masks of the rows where black and red pieces are promoted
+    black_promotion: int
+    red_promotion: int
+
+    # bit shifts of the forward directions of each player and of kings, in the
+    # same order CheckersGame checks the directions in
+    black_dirs: Tuple[int, ...]
+    red_dirs: Tuple[int, ...]
+    king_dirs: Tuple[int, ...]
+
+    # coordinates of each bit index (None for squares off the board)
+    coords: List[Optional[Tuple[int, int]]]
+
+    # locations of the dark squares in the order of their square indices, as
+    # used by Move
+    dark_coords: List[Tuple[int, int]]
+
+    # square index of each bit index (None for squares off the board) and bit
+    # index of each square index
+    squares: List[Optional[int]]
+    bits: List[int]
+
+    #
+    # PUBLIC METHODS
+    #
+
+    def __init__(self, size: int):
+        """
+        Constructor
+
+        Parameters:
+            size (int): number of rows and columns of the board
+        """
+        self.size = size
+        self.width = size + 1
+        self.board_mask = 0
+        self.black_promotion = 0
+        self.red_promotion = 0
+        self.coords = [None] * (size * self.width)
+        self.dark_coords = dark_squares(size)
+        self.squares = [None] * (size * self.width)
+        self.bits = []
+
+        for r in range(size):
+            for c in range(size):
+                if r % 2 != c % 2:
+                    index = r * self.width + c
+                    self.coords[index] = (r, c)
+                    self.squares[index] = len(self.bits)
+                    self.bits.append(index)
+                    self.board_mask |= 1 << index
+                    if r == size - 1:
+                        self.black_promotion |= 1 << index
+                    elif r == 0:
+                        self.red_promotion |= 1 << index
+
+        down_right = self.width + 1
+        down_left = self.width - 1
+        self.black_dirs = (down_right, down_left)
+        self.red_dirs = (-down_left, -down_right)
+        self.king_dirs = self.black_dirs + self.red_dirs
+
+    def index(self, coord: Tuple[int, int]) -> int:
+        """
+        Returns the bit index of the given square.
+
+        Parameters:
+            coord (tuple(int, int)): location on the board
+
+        Raises:
+            ValueError: If the given location is not valid
+
+        Returns:
+            int: bit index of the square
+        """
+        row, col = coord
+        if not 0 <= row < self.size or not 0 <= col < self.size:
+            raise ValueError("Invalid coordinates")
+        return row * self.width + col
+
+# geometries that have already been built, keyed by board size
+_GEOMETRIES: Dict[int, BitboardGeometry] = {}
+
+def get_geometry(size: int) -> BitboardGeometry:
+    """
+    Returns the shared geometry of the given board size, building it the first
+    time it is needed.
+
+    Parameters:
+        size (int): number of rows and columns of the board
+
+    Returns:
+        BitboardGeometry: geometry of the board size
+    """
+    geometry = _GEOMETRIES.get(size)
+    if geometry is None:
+        geometry = BitboardGeometry(size)
+        _GEOMETRIES[size] = geometry
+    return geometry
+
+def shift(mask: int, amount: int) -> int:
+    """
+    Shifts a bitboard by the given number of bits. Positive amounts move the
+    pieces down the board and negative amounts move them up.
+
+    Parameters:
+        mask (int): bitboard to be shifted
+        amount (int): number of bits to shift by
+
+    Returns:
+        int: shifted bitboard
+    """
+    if amount > 0:
+        return mask << amount
+    return mask >> -amount
+
+def iter_bits(mask: int):
+    """
+    Yields the indices of the set bits of a bitboard in increasing order.
+
+    Parameters:
+        mask (int): bitboard
+
+    Returns:
+        generator of int: bit indices
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def movers(pieces: int, empty: int, dirs: Tuple[int, ...]) -> int:
+    """
+    Returns the pieces that can make a non-jump move in one of the given
+    directions.
+
+    Parameters:
+        pieces (int): bitboard of the pieces
+        empty (int): bitboard of the empty squares
+        dirs (tuple(int, ...)): directions the pieces can move in
+
+    Returns:
+        int: bitboard of the pieces that can move
+    """
+    result = 0
+    for d in dirs:
+        result |= pieces & shift(empty, -d)
+    return result
+
+def jumpers(pieces: int, opponent: int, empty: int,
+            dirs: Tuple[int, ...]) -> int:
+    """
+    Returns the pieces that can jump over an opponent piece in one of the given
+    directions.
+
+    Parameters:
+        pieces (int): bitboard of the pieces
+        opponent (int): bitboard of the opponent's pieces
+        empty (int): bitboard of the empty squares
+        dirs (tuple(int, ...)): directions the pieces can move in
+
+    Returns:
+        int: bitboard of the pieces that can jump
+    """
+    result = 0
+    for d in dirs:
+        result |= pieces & shift(opponent & shift(empty, -d), -d)
+    return result
+
+def complete_jumps(index: int, dirs: Tuple[int, ...], opponent: int,
+                   empty: int, captured: int) -> List[List[int]]:
+    """
+    Returns all the complete jumps a piece at the given bit index can make as
+    lists of the bit indices it lands on. The piece's own square stays occupied
+    and jumped pieces stay on the board until the move is made, which matches
+    CheckersGame.
+
+    Parameters:
+        index (int): bit index of the jumping piece
+        dirs (tuple(int, ...)): directions the piece can move in
+        opponent (int): bitboard of the opponent's pieces
+        empty (int): bitboard of the empty squares
+        captured (int): bitboard of the pieces that were already jumped over
+
+    Returns:
+        list[list[int]]: all the complete jumps
+    """
+    paths = []
+    for d in dirs:
+        over = index + d
+        land = over + d
+        if (land >= 0 and (empty >> land) & 1 and (opponent >> over) & 1 and
+                not (captured >> over) & 1):
+            sub_paths = complete_jumps(land, dirs, opponent, empty,
+                                       captured | (1 << over))
+            if sub_paths == []:
+                paths.append([land])
+            else:
+                for sub_path in sub_paths:
+                    paths.append([land] + sub_path)
+    return paths
+
+class BitboardCheckersGame:
+    """
+    Class for representing a game of checkers using bitboards.
+    """
+
+    #
+    # PRIVATE ATTRIBUTES
+    #
+
+    # layout of the board
+    _geometry: BitboardGeometry
+
+    # number of rows of pieces
+    _rows: int
+
+    # bitboards of the men and kings of each player
+    _black_men: int
+    _black_kings: int
+    _red_men: int
+    _red_kings: int
+
+    # location of piece that is in the middle of a jump
+    _jumping: Optional[Tuple[int, int]]
+
+    # player whose turn it is
+    _turn: PieceColor
+
+    # winner of the game if there is one
+    _winner: Optional[PieceColor]
+
+    # True if a draw has been offered, otherwise False
+    _draw_offered: bool
+
+    # number of moves since the last capture
+    _black_moves_since_capture: int
+    _red_moves_since_capture: int
+
+    # functions called with a MoveEvent after every move played with move or
+    # play
+    _listeners: List[Callable[[MoveEvent], None]]
+
+    #
+    # PUBLIC METHODS
+    #
+
+    def __init__(self, nrows: int):
+        """
+        Constructor
+
+        Parameters:
+            nrows (int): number of rows of pieces each player begins the game
+            with
+        """
+        self._geometry = get_geometry(2 * nrows + 2)
+        self._rows = nrows
+        self._draw_offered = False
+        self._listeners = []
+
+        self.setup()
+
+    def clone(self) -> "BitboardCheckersGame":
+        """
+        Returns an independent copy of the game. The bitboards are immutable
+        integers, so only the object itself is copied.
+
+        Parameters:
+            None
+
+        Returns:
+            BitboardCheckersGame: the copy
+        """
+        game = BitboardCheckersGame.__new__(BitboardCheckersGame)
+        game.__dict__.update(self.__dict__)
+        game._listeners = []
+        return game
+
+    def __str__(self) -> str:
+        """
+        Returns a basic string representation of the game's board.
+
+        Parameters:
+            None
+
+        Returns:
+            str: basic string representation of the game's board
+        """
+        return "".join("".join(row) + "\n" for row in self.board_to_str())
+
+    def board_to_str(self) -> Tuple[Tuple[str, ...], ...]:
+        """
+        Returns the game's board as a tuple of tuples of strings, in the same
+        format as CheckersGame.board_to_str.
+
+        Parameters:
+            None
+
+        Returns:
+            tuple(tuple(str)): A tuple of rows with the same dimensions as the
+            board. In each row, the values will be " " (no piece), "B" (black
+            king piece), "b" (black non-king piece), "R" (red kings piece), "r"
+            (red non-king piece).
+        """
+        size = self._geometry.size
+        width = self._geometry.width
+        str_grid = [[" "] * size for _ in range(size)]
+        for mask, char in ((self._black_men, "b"), (self._black_kings, "B"),
+                           (self._red_men, "r"), (self._red_kings, "R")):
+            for index in iter_bits(mask):
+                str_grid[index // width][index % width] = char
+        return tuple(tuple(row) for row in str_grid)
+
+    def setup(self) -> None:
+        """
+        Places the pieces on the correct squares of the board. Black pieces will
+        be placed on the first n rows of the board and red pieces will be placed
+        on the last n rows of the board.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        geometry = self._geometry
+        rows_mask = (1 << (self._rows * geometry.width)) - 1
+
+        self._black_men = geometry.board_mask & rows_mask
+        self._red_men = (geometry.board_mask >>
+                         ((geometry.size - self._rows) * geometry.width) <<
+                         ((geometry.size - self._rows) * geometry.width))
+        self._black_kings = 0
+        self._red_kings = 0
+        self._winner = None
+        self._jumping = None
+        self._turn = PieceColor.BLACK
+        self._black_moves_since_capture = 0
+        self._red_moves_since_capture = 0
+
+    def move(self, color: PieceColor, start: Tuple[int, int],
+             end: Tuple[int, int]) -> None:
+        """
+        Moves the piece of the given color from the start location to the end
+        location, following the same rules as CheckersGame.move.
+
+        Parameters:
+            color (PieceColor): player color
+            start (tuple(int, int)): the position of piece to be moved
+            end (tuple(int, int)): destination position
+
+        Raises:
+            ValueError: If the selected move is invalid
+
+        Returns:
+            None
+        """
+        if not self.is_valid_move(color, start, end):
+            raise ValueError("Invalid move")
+
+        index = self._geometry.index
+        start_index = index(start)
+        end_index = index(end)
+        kings = self._black_kings | self._red_kings
+        captures = []
+
+        if self._require_jump(color):   # jump move
+            for move in self.piece_valid_moves(start):
+                if end in move:
+                    if end == move[-1]: # complete jump move
+                        self._jumping = None
+                    else:   # incomplete jump move
+                        self._jumping = end
+
+                    current = start_index
+                    for step in move[: move.index(end) + 1]:
+                        step = index(step)
+                        captures.append((current + step) // 2)
+                        self._piece_jump_to(color, current, step)
+                        current = step
+                    break
+
+            if color == PieceColor.BLACK:
+                self._black_moves_since_capture = 0
+            elif color == PieceColor.RED:
+                self._red_moves_since_capture = 0
+
+        else:   # non-jump move
+            self._piece_move_to(color, start_index, end_index)
+            self._jumping = None
+
+            if color == PieceColor.BLACK:
+                self._black_moves_since_capture += 1
+            elif color == PieceColor.RED:
+                self._red_moves_since_capture += 1
+
+        self._check_promote(color, end_index)
+
+        if not self.turn_incomplete():
+            self._turn = self._opponent(color)
+            self._update_winner(color)
+        else:
+            self._turn = color
+
+        if self._listeners:
+            promoted = (not (kings >> start_index) & 1 and
+                        ((self._black_kings | self._red_kings) >>
+                         end_index) & 1)
+            self._emit_move(color, start_index, end_index, captures,
+                            bool(promoted))
+
+    def make_move(self, color: PieceColor, start: Tuple[int, int],
+                  path: List[Tuple[int, int]]) -> BitboardMoveRecord:
+        """
+        Plays a complete move (a non-jump move or a whole jump path) without
+        checking that it is valid and returns a record that can be passed to
+        unmake_move to take it back.
+
+        Parameters:
+            color (PieceColor): player color
+            start (tuple(int, int)): position of the piece to be moved
+            path (list[tuple(int, int)]): squares the piece moves to
+
+        Returns:
+            BitboardMoveRecord: record needed to undo the move
+        """
+        index = self._geometry.index
+        return self._make_move(color, index(start),
+                               [index(step) for step in path])
+
+    def apply_move(self, move: Move) -> BitboardMoveRecord:
+        """
+        Plays a move returned by generate_moves without checking that it is
+        still valid and returns a record that can be passed to unmake_move to
+        take it back.
+
+        Parameters:
+            move (Move): move to be played
+
+        Returns:
+            BitboardMoveRecord: record needed to undo the move
+        """
+        bits = self._geometry.bits
+        return self._make_move(move.get_color(),
+                               bits[move.get_start_square()],
+                               [bits[square] for square in
+                                move.get_path_squares()])
+
+    def play(self, move: Move) -> None:
+        """
+        Plays a complete move returned by generate_moves, checking it against
+        the valid moves of the current position.
+
+        Parameters:
+            move (Move): move to be played
+
+        Raises:
+            ValueError: If the move is not valid in the current position
+
+        Returns:
+            None
+        """
+        color = move.get_color()
+        if move not in self.generate_moves(color):
+            raise ValueError("Invalid move")
+
+        bits = self._geometry.bits
+        start = bits[move.get_start_square()]
+        end = bits[move.get_path_squares()[-1]]
+        kings = self._black_kings | self._red_kings
+        self.apply_move(move)
+
+        if self._listeners:
+            promoted = (not (kings >> start) & 1 and
+                        ((self._black_kings | self._red_kings) >> end) & 1)
+            self._emit_move(color, start, end,
+                            [bits[square] for square in move.get_captures()],
+                            bool(promoted))
+
+    def unmake_move(self, record: BitboardMoveRecord) -> None:
+        """
+        Takes back a move played with make_move or apply_move. Moves must be
+        taken back in the reverse order they were made in.
+
+        Parameters:
+            record (BitboardMoveRecord): record returned by make_move or
+            apply_move
+
+        Returns:
+            None
+        """
+        (self._black_men, self._black_kings, self._red_men, self._red_kings,
+         self._jumping, self._black_moves_since_capture,
+         self._red_moves_since_capture, self._winner, self._turn) = record
+
+    def player_valid_moves(self,
+                           color: PieceColor) -> Dict[Optional[Tuple[int, int]],
+                                                   List[List[Tuple[int, int]]]]:
+        """
+        Returns all the complete valid moves (jumps or non-jump moves) for all
+        the available specified colored pieces. Pieces are listed in row-major
+        order.
+
+        Parameters:
+            color (PieceColor): player's color
+
+        Returns:
+            dict{tuple(int, int): list[list[tuple(int, int)]]}: dictionary of
+            all the complete valid moves the player of the given color can make
+            where the keys are the coordinates of a piece that can be moved and
+            the values are the list of complete valid moves the player can make
+            with each piece.
+        """
+        coords = self._geometry.coords
+        moves = {}
+        for start, path in self._bit_moves(color):
+            moves.setdefault(coords[start], []).append(
+                [coords[step] for step in path])
+        return moves
+
+    def generate_moves(self, color: PieceColor) -> List[Move]:
+        """
+        Returns all the complete valid moves of the player of the given color
+        as Move values, in the same order as player_valid_moves lists them
+        (pieces in row-major order). The moves can be played with play or
+        apply_move.
+
+        Parameters:
+            color (PieceColor): player's color
+
+        Returns:
+            list[Move]: valid moves of the player
+        """
+        geometry = self._geometry
+        squares = geometry.squares
+        jump = geometry.width + 1
+        moves = []
+        for start, path in self._bit_moves(color):
+            if abs(path[0] - start) > jump:
+                captures = tuple(squares[(before + after) // 2] for
+                                 before, after in zip([start] + path, path))
+            else:
+                captures = ()
+            moves.append(Move(color, squares[start],
+                              [squares[step] for step in path], captures,
+                              geometry.dark_coords))
+        return moves
+
+    def piece_valid_moves(self, coord: Tuple[int, int]) -> List[List
+                                                            [Tuple[int, int]]]:
+        """
+        Returns all the complete valid moves for the given piece.
+
+        Parameters:
+            coord (tuple(int, int)): position of the given piece
+
+        Returns:
+            list[list[tuple(int, int)]]: list of all the possible moves the
+            given piece can move to
+        """
+        jumps = self._get_all_jumps(coord)
+        if jumps:
+            return jumps
+        return self._get_all_non_jumps(coord)
+
+    def subscribe(self, listener: Callable[[MoveEvent], None]) -> None:
+        """
+        Registers a function to be called with a MoveEvent after every move
+        played with move or play. Moves made with make_move and apply_move
+        (for searching) do not send events.
+
+        Parameters:
+            listener (callable): function taking a MoveEvent
+
+        Returns:
+            None
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[MoveEvent], None]) -> None:
+        """
+        Stops calling a function registered with subscribe.
+
+        Parameters:
+            listener (callable): function taking a MoveEvent
+
+        Raises:
+            ValueError: If the function is not registered
+
+        Returns:
+            None
+        """
+        self._listeners.remove(listener)
+
+    def must_capture(self, color: PieceColor) -> bool:
+        """
+        Returns if the player of the given color has to make a jump with their
+        next move.
+
+        Parameters:
+            color (PieceColor): player color
+
+        Returns:
+            bool: True if one of the player's pieces can jump
+        """
+        return self._require_jump(color)
+
+    def move_promotes(self, move: Move) -> bool:
+        """
+        Returns if playing the given complete move of the current position
+        would promote the moving piece to a king.
+
+        Parameters:
+            move (Move): a move returned by generate_moves
+
+        Returns:
+            bool: True if the piece ends the move on the far row as a
+            non-king piece
+        """
+        geometry = self._geometry
+        start = geometry.bits[move.get_start_square()]
+        end = geometry.bits[move.get_path_squares()[-1]]
+        men, _, _ = self._sides(move.get_color())
+        if move.get_color() == PieceColor.BLACK:
+            promotion = geometry.black_promotion
+        else:
+            promotion = geometry.red_promotion
+        return bool((men >> start) & 1 and (promotion >> end) & 1)
+
+    def is_valid_move(self, color: PieceColor, start: Tuple[int, int],
+                      end: Tuple[int, int]) -> bool:
+        """
+        Determines if the move is a possible move at the given color's player's
+        current turn.
+
+        Parameters:
+            color: color of the player
+            start: coordinates of the piece to be moved
+            end: coordinates of the destination location of the move
+
+        Returns:
+            bool: returns True if the given move is valid, otherwise, returns
+            False
+        """
+        paths = self.player_valid_moves(color).get(start)
+        if paths is None:
+            return False
+        for path in paths:
+            if end in path:
+                return True
+        return False
+
+    def is_valid_dest(self, start: Tuple[int, int],
+                      end: Tuple[int, int]) -> bool:
+        """
+        Given a location of a piece on the board and a location to move the
+        piece to, determines if the move is valid or not, regardless of other
+        pieces.
+
+        Parameters:
+            start (tuple(int, int)): position of the piece
+            end (tuple(int, int)): destination position
+
+        Returns:
+            bool: returns True if the move is valid, otherwise, returns False
+        """
+        for path in self.piece_valid_moves(start):
+            if path[-1] == end:
+                return True
+        return False
+
+    def turn_incomplete(self) -> bool:
+        """
+        Boolean value for if the turn is incomplete, meaning the player has not
+        completed all possible successive jumps.
+
+        Parameters:
+            None
+
+        Returns:
+            bool: True if the turn is incomplete, otherwise returns False
+        """
+        return self._jumping is not None
+
+    def is_draw_offered(self) -> bool:
+        """
+        Returns true if a draw has been offered. Otherwise, returns false.
+
+        Parameters:
+            None
+
+        Returns:
+            bool: True if a draw has been offered, otherwise returns False
+        """
+        return self._draw_offered
+
+    def end_turn(self, color: PieceColor, cmd: str) -> None:
+        """
+        Method for ending a player's turn. The player can choose to resign,
+        offer a draw, or simply end their current turn.
+
+        Parameters:
+            color (PieceColor): current player's color
+            cmd (str): the player's command to end turn, resign, or offer draw
+
+        Returns:
+            None
+        """
+        if cmd == "Resign":
+            if color == PieceColor.BLACK:
+                self._winner = PieceColor.RED
+            elif color == PieceColor.RED:
+                self._winner = PieceColor.BLACK
+        elif cmd == "Offer Draw":
+            self._draw_offered = True
+
+    def accept_draw(self, cmd: str) -> None:
+        """
+        Method for player to either accept or decline a draw offered by the
+        other player.
+
+        Parameters:
+            cmd (str): command for accepting or declining a draw
+
+        Returns:
+            None
+        """
+        if cmd == "Accept":
+            self._winner = PieceColor.DRAW
+        else:
+            self._draw_offered = False
+
+    def get_winner(self) -> Optional[PieceColor]:
+        """
+        Find the winner of the game and the color won, if it exists.
+
+        Parameters:
+            None
+
+        Returns:
+            PieceColor or None: If there is a winner, return the color. If it is
+            a tie, returns PieceColor.DRAW. Otherwise, return None.
+        """
+        return self._winner
+
+    def position_hash(self) -> int:
+        """
+        Returns a 64-bit hash of the current position: the pieces on the
+        board, the player whose turn it is and the piece in the middle of a
+        jump. The hash is computed from the bitboards when it is asked for.
+
+        Parameters:
+            None
+
+        Returns:
+            int: hash of the position
+        """
+        return hash((self._black_men, self._black_kings, self._red_men,
+                     self._red_kings, self._jumping,
+                     self._turn.value)) & 0xFFFFFFFFFFFFFFFF
+
+    def evaluate(self) -> float:
+        """
+        Evaluates the value of the current position. The more positive the value
+        the more favorable the position is for player with the black pieces. The
+        more negative the value, the more favorable the position is for player
+        with the red pieces.
+
+        Parameters:
+            None
+
+        Returns:
+            value (float): value of current position
+        """
+        black_king, black_nonking, red_king, red_nonking = self._composition()
+        value = ((black_nonking - red_nonking) +
+                 (0.5 * black_king - 0.5 * red_king))
+        return value
+
+    #
+    # PRIVATE METHODS
+    #
+
+    def _sides(self, color: PieceColor) -> Tuple[int, int, int]:
+        """
+        Returns the men and kings of the given player and all the pieces of
+        their opponent.
+
+        Parameters:
+            color (PieceColor): player color
+
+        Returns:
+            tuple(int, int, int): bitboards of the player's men, the player's
+            kings and the opponent's pieces
+        """
+        if color == PieceColor.BLACK:
+            return (self._black_men, self._black_kings,
+                    self._red_men | self._red_kings)
+        return (self._red_men, self._red_kings,
+                self._black_men | self._black_kings)
+
+    def _forward_dirs(self, color: PieceColor) -> Tuple[int, ...]:
+        """
+        Returns the directions the men of the given player move in.
+
+        Parameters:
+            color (PieceColor): player color
+
+        Returns:
+            tuple(int, ...): bit shifts of the directions
+        """
+        if color == PieceColor.BLACK:
+            return self._geometry.black_dirs
+        return self._geometry.red_dirs
+
+    def _empty(self) -> int:
+        """
+        Returns the bitboard of the empty playable squares.
+
+        Parameters:
+            None
+
+        Returns:
+            int: bitboard of the empty squares
+        """
+        return self._geometry.board_mask & ~(self._black_men |
+                                             self._black_kings |
+                                             self._red_men | self._red_kings)
+
+    def _color_at(self, coord: Tuple[int, int]) -> Optional[PieceColor]:
+        """
+        Returns the color of the piece at the given location if there is one.
+
+        Parameters:
+            coord (tuple(int, int)): location on the board
+
+        Raises:
+            ValueError: If the given location is not valid
+
+        Returns:
+            Optional[PieceColor]: color of the piece at the location
+        """
+        index = self._geometry.index(coord)
+        if ((self._black_men | self._black_kings) >> index) & 1:
+            return PieceColor.BLACK
+        if ((self._red_men | self._red_kings) >> index) & 1:
+            return PieceColor.RED
+        return None
+
+    def _piece_dirs(self, coord: Tuple[int, int]) -> Tuple[int, ...]:
+        """
+        Returns the directions the piece at the given location can move in.
+
+        Parameters:
+            coord (tuple(int, int)): location of the piece
+
+        Raises:
+            ValueError: if there is no piece at the given location
+
+        Returns:
+            tuple(int, ...): bit shifts of the directions
+        """
+        color = self._color_at(coord)
+        if color is None:
+            raise ValueError("No piece at starting position")
+        index = self._geometry.index(coord)
+        if ((self._black_kings | self._red_kings) >> index) & 1:
+            return self._geometry.king_dirs
+        return self._forward_dirs(color)
+
+    def _steps(self, index: int, dirs: Tuple[int, ...],
+               empty: int) -> List[List[Tuple[int, int]]]:
+        """
+        Returns the non-jump moves of the piece at the given bit index.
+
+        Parameters:
+            index (int): bit index of the piece
+            dirs (tuple(int, ...)): directions the piece can move in
+            empty (int): bitboard of the empty squares
+
+        Returns:
+            list[list[tuple(int, int)]]: all the non-jump moves of the piece
+        """
+        coords = self._geometry.coords
+        steps = []
+        for d in dirs:
+            dest = index + d
+            if dest >= 0 and (empty >> dest) & 1:
+                steps.append([coords[dest]])
+        return steps
+
+    def _get_all_jumps(self,
+                       start: Tuple[int, int]) -> List[List[Tuple[int, int]]]:
+        """
+        Returns a list of all the possible complete jumps the piece at the
+        given location can make.
+
+        Parameters:
+            start (tuple(int, int)): position of the piece
+
+        Raises:
+            ValueError: if there is no piece at the given starting position
+
+        Returns:
+            list(list(tuple(int, int))): list of moves the piece can make
+        """
+        dirs = self._piece_dirs(start)
+        _, _, opponent = self._sides(self._color_at(start))
+        coords = self._geometry.coords
+        return [[coords[i] for i in path] for path in
+                complete_jumps(self._geometry.index(start), dirs, opponent,
+                               self._empty(), 0)]
+
+    def _get_all_non_jumps(self,
+                           start: Tuple[int, int]) -> List[List[Tuple[int,
+                                                                      int]]]:
+        """
+        Returns a list of the non-jump moves the piece at the given location
+        can make.
+
+        Parameters:
+            start (tuple(int, int)): location of the piece
+
+        Raises:
+            ValueError: if there is no piece at the given starting position
+
+        Returns:
+            list[list[tuple(int, int)]]: all possible places the given piece can
+            non-jump move to
+        """
+        dirs = self._piece_dirs(start)
+        return self._steps(self._geometry.index(start), dirs, self._empty())
+
+    def _bit_moves(self, color: PieceColor) -> List[Tuple[int, List[int]]]:
+        """
+        Returns the complete valid moves of the player of the given color with
+        bit indices instead of positions, for player_valid_moves and
+        generate_moves.
+
+        Parameters:
+            color (PieceColor): player's color
+
+        Returns:
+            list[tuple(int, list[int])]: the bit index of the piece to be
+            moved and the bit indices it moves to, pieces in row-major order
+        """
+        men, kings, opponent = self._sides(color)
+        empty = self._empty()
+        dirs = self._forward_dirs(color)
+        king_dirs = self._geometry.king_dirs
+
+        if (self.turn_incomplete() and
+                self._color_at(self._jumping) == color):
+            start = self._geometry.index(self._jumping)
+            return [(start, path) for path in
+                    complete_jumps(start, self._piece_dirs(self._jumping),
+                                   opponent, empty, 0)]
+
+        moves = []
+        capturing = (jumpers(men, opponent, empty, dirs) |
+                     jumpers(kings, opponent, empty, king_dirs))
+        if capturing:
+            for index in iter_bits(capturing):
+                piece_dirs = king_dirs if (kings >> index) & 1 else dirs
+                for path in complete_jumps(index, piece_dirs, opponent, empty,
+                                           0):
+                    moves.append((index, path))
+        else:
+            moving = (movers(men, empty, dirs) |
+                      movers(kings, empty, king_dirs))
+            for index in iter_bits(moving):
+                piece_dirs = king_dirs if (kings >> index) & 1 else dirs
+                for d in piece_dirs:
+                    dest = index + d
+                    if dest >= 0 and (empty >> dest) & 1:
+                        moves.append((index, [dest]))
+        return moves
+
+    def _make_move(self, color: PieceColor, start: int,
+                   path: List[int]) -> BitboardMoveRecord:
+        """
+        Plays a complete move given by bit indices without checking that it
+        is valid, completing the player's turn.
+
+        Parameters:
+            color (PieceColor): player color
+            start (int): bit index of the piece to be moved
+            path (list[int]): bit indices the piece moves to
+
+        Returns:
+            BitboardMoveRecord: record needed to undo the move
+        """
+        record = (self._black_men, self._black_kings, self._red_men,
+                  self._red_kings, self._jumping,
+                  self._black_moves_since_capture,
+                  self._red_moves_since_capture, self._winner, self._turn)
+
+        if abs(path[0] - start) > self._geometry.width + 1:   # jump move
+            current = start
+            for step in path:
+                self._piece_jump_to(color, current, step)
+                current = step
+
+            if color == PieceColor.BLACK:
+                self._black_moves_since_capture = 0
+            elif color == PieceColor.RED:
+                self._red_moves_since_capture = 0
+
+        else:   # non-jump move
+            self._piece_move_to(color, start, path[0])
+
+            if color == PieceColor.BLACK:
+                self._black_moves_since_capture += 1
+            elif color == PieceColor.RED:
+                self._red_moves_since_capture += 1
+
+        self._jumping = None
+        self._turn = self._opponent(color)
+        self._check_promote(color, path[-1])
+        self._update_winner(color)
+        return record
+
+    def _emit_move(self, color: PieceColor, start: int, end: int,
+                   captures: List[int], promoted: bool) -> None:
+        """
+        Sends a MoveEvent for a move that was just played to the listeners.
+
+        Parameters:
+            color (PieceColor): color of the player who moved
+            start (int): bit index the piece left
+            end (int): bit index the piece arrived on
+            captures (list[int]): bit indices of the captured pieces
+            promoted (bool): if the piece was promoted
+
+        Returns:
+            None
+        """
+        coords = self._geometry.coords
+        event = MoveEvent(color, [coords[start]], [coords[end]],
+                          [coords[index] for index in captures],
+                          coords[end] if promoted else None,
+                          not self.turn_incomplete(), self._winner)
+        for listener in list(self._listeners):
+            listener(event)
+
+    def _opponent(self, color: PieceColor) -> PieceColor:
+        """
+        Returns the color of the given player's opponent.
+
+        Parameters:
+            color (PieceColor): player color
+
+        Returns:
+            PieceColor: opponent's color
+        """
+        if color == PieceColor.BLACK:
+            return PieceColor.RED
+        return PieceColor.BLACK
+
+    def _piece_move_to(self, color: PieceColor, start: int, end: int) -> None:
+        """
+        Moves the piece at the given bit index to the given empty bit index.
+
+        Parameters:
+            color (PieceColor): color of the piece being moved
+            start (int): bit index of the piece to be moved
+            end (int): bit index the piece is moving to
+
+        Returns:
+            None
+        """
+        move_mask = (1 << start) | (1 << end)
+        if color == PieceColor.BLACK:
+            if self._black_kings & move_mask:
+                self._black_kings ^= move_mask
+            else:
+                self._black_men ^= move_mask
+        else:
+            if self._red_kings & move_mask:
+                self._red_kings ^= move_mask
+            else:
+                self._red_men ^= move_mask
+
+    def _piece_jump_to(self, color: PieceColor, start: int, end: int) -> None:
+        """
+        Jumps with the piece at the given bit index and removes the piece that
+        was jumped over.
+
+        Parameters:
+            color (PieceColor): color of the piece being moved
+            start (int): bit index of the piece to be moved
+            end (int): bit index the piece is moving to
+
+        Returns:
+            None
+        """
+        self._piece_move_to(color, start, end)
+        keep = ~(1 << ((start + end) // 2))
+        self._black_men &= keep
+        self._black_kings &= keep
+        self._red_men &= keep
+        self._red_kings &= keep
+
+    def _remove_piece(self, coord: Tuple[int, int]) -> None:
+        """
+        Removes the piece at the given location.
+
+        Parameters:
+            coord (tuple(int, int)): location on the board
+
+        Raises:
+            ValueError: If the given location is invalid or if there is not a
+            piece at the given location
+
+        Returns:
+            None
+        """
+        keep = ~(1 << self._geometry.index(coord))
+        if self._color_at(coord) is None:
+            raise ValueError("No piece to remove at this coordinate")
+        self._black_men &= keep
+        self._black_kings &= keep
+        self._red_men &= keep
+        self._red_kings &= keep
+
+    def _require_jump(self, color: PieceColor) -> bool:
+        """
+        Given a player color returns a boolean if the player must make a jump
+        with his or her turn.
+
+        Parameters:
+            color (PieceColor): player color
+
+        Returns:
+            bool: if the player must make a jump with his or her turn
+        """
+        if (self.turn_incomplete() and
+                self._color_at(self._jumping) == color):
+            return True
+
+        men, kings, opponent = self._sides(color)
+        empty = self._empty()
+        return bool(jumpers(men, opponent, empty, self._forward_dirs(color)) or
+                    jumpers(kings, opponent, empty, self._geometry.king_dirs))
+
+    def _has_moves(self, color: PieceColor) -> bool:
+        """
+        Returns if the player of the given color has a jump or non-jump move
+        at the start of their turn.
+
+        Parameters:
+            color (PieceColor): player color
+
+        Returns:
+            bool: True if the player can move, otherwise False
+        """
+        men, kings, opponent = self._sides(color)
+        empty = self._empty()
+        dirs = self._forward_dirs(color)
+        king_dirs = self._geometry.king_dirs
+        return bool(movers(men, empty, dirs) or
+                    movers(kings, empty, king_dirs) or
+                    jumpers(men, opponent, empty, dirs) or
+                    jumpers(kings, opponent, empty, king_dirs))
+
+    def _composition(self) -> Tuple[int, int, int, int]:
+        """
+        Returns the number of kings and nonking pieces each player currently has
+        on the board.
+
+        Parameters:
+            None
+
+        Returns:
+            tuple (int, int, int, int): number of black kings, black nonkings,
+            red kings and red nonkings on the board
+        """
+        return (bin(self._black_kings).count("1"),
+                bin(self._black_men).count("1"),
+                bin(self._red_kings).count("1"),
+                bin(self._red_men).count("1"))
+
+    def _check_promote(self, color: PieceColor, index: int) -> None:
+        """
+        Checks if the piece at the given bit index should be promoted to a
+        king.
+
+        Parameters:
+            color (PieceColor): color of the given piece
+            index (int): bit index of the given piece
+
+        Returns:
+            None
+        """
+        bit = 1 << index
+        if color == PieceColor.BLACK:
+            if self._black_men & bit & self._geometry.black_promotion:
+                self._black_men ^= bit
+                self._black_kings |= bit
+        elif color == PieceColor.RED:
+            if self._red_men & bit & self._geometry.red_promotion:
+                self._red_men ^= bit
+                self._red_kings |= bit
+
+    def _update_winner(self, color: PieceColor) -> None:
+        """
+        Checks if the given player has won the game or the game has reached a
+        draw.
+
+        Parameters:
+            color (PieceColor): player color
+
+        Returns:
+            None
+        """
+        if color == PieceColor.BLACK and not self._has_moves(PieceColor.RED):
+            self._winner = PieceColor.BLACK
+        elif color == PieceColor.RED and not self._has_moves(PieceColor.BLACK):
+            self._winner = PieceColor.RED
+        elif (self._black_moves_since_capture >= 40 or
+                self._red_moves_since_capture >= 40):
+            self._winner = PieceColor.DRAW
@@ -1,8 +1,31 @@
 from checkers import CheckersGame, PieceColor
-from copy import deepcopy
+from bitboard import BitboardCheckersGame
 import random
+import time
 import click
 
+# Search algorithms smartBot can use. Both choose the same move with the same
+# score; alphabeta skips the parts of the tree that cannot change the result.
+SEARCH_MODES = ("minimax", "alphabeta")
+
+# Game engines the command line programs can play on, by option name: the
+# board grid of CheckersGame or the bitboards of BitboardCheckersGame
+ENGINES = {"grid": CheckersGame, "bitboard": BitboardCheckersGame}
+
+# Kinds of scores stored in the transposition table: the exact value of the
+# position, or only a lower or upper bound when the search was cut off
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# Deepest search of iterative deepening, however much time is left
+MAX_DEPTH = 64
+
+class _SearchTimeout(Exception):
+    """
+    Raised inside a timed search when its time runs out.
+    """
+
 class randomBot():
     """
     Class for bot that suggests random moves.
@@ -30,46 +53,497 @@ class randomBot():
             the random piece, second tuple represents end coordinates of the 
             random path
         """
-        valid_moves = list(self._board.player_valid_moves(self._color).items())
-        rand_piece = random.choice(valid_moves)
-        rand_path = random.choice(rand_piece[1])
-        start, end = rand_piece[0], rand_path[-1]
-        return start, end
+        move = self.choose_move()
+        return move.get_start(), move.get_end()
+
+    def choose_move(self):
+        """
+        Randomly selects a piece and randomly selects one of the moves the
+        piece can make.
+
+        Parameters:
+            None
+
+        Returns:
+            Move obj: the random move, which can be passed to the board's play
+            method
+        """
+        valid_moves = self._board.generate_moves(self._color)
+        starts = list(dict.fromkeys(move.get_start_square()
+                                    for move in valid_moves))
+        rand_start = random.choice(starts)
+        return random.choice([move for move in valid_moves
+                              if move.get_start_square() == rand_start])
+
+class TranspositionTable():
+    """
+    Class for a fixed-size table of search results keyed on position hashes,
+    so positions reached through different move orders are searched once.
+    The table is split into buckets of two entries. The first entry of a
+    bucket keeps the deepest result of the current search and the second
+    entry always takes the newest result that did not replace the first one.
+    """
+    # Approximate memory used by one entry: its list slot, the entry tuple
+    # and the integers and float it holds
+    ENTRY_BYTES = 192
+
+    def __init__(self, mb):
+        """
+            Constructor
+
+            mb (float): memory limit of the table in megabytes. The number of
+                buckets is the largest power of two that fits in the limit
+                (at least one bucket).
+
+            Raises:
+                ValueError: if mb is not positive
+        """
+        if mb <= 0:
+            raise ValueError("Transposition table size must be positive")
+        nbuckets = 1
+        while 4 * nbuckets * self.ENTRY_BYTES <= mb * 2 ** 20:
+            nbuckets *= 2
+        self._mask = nbuckets - 1
+        self._entries = [None] * (2 * nbuckets)
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._collisions = 0
+
+    def __len__(self):
+        """
+        Returns the number of entries the table can hold.
+
+        Parameters:
+            None
+
+        Returns:
+            int: number of entries
+        """
+        return len(self._entries)
+
+    def new_search(self):
+        """
+        Starts a new generation of entries. Entries from older searches can
+        be replaced by any new result, however deep they were.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        self._generation += 1
+
+    def clear(self):
+        """
+        Removes all the entries and resets the counters.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        self._entries = [None] * len(self._entries)
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._collisions = 0
+
+    def probe(self, key):
+        """
+        Looks up the result stored for a position.
+
+        Parameters:
+            key (int): hash of the position
+
+        Returns:
+            tuple or None: (key, depth, score, bound, move key, generation) of
+            the entry, or None if the position is not in the table
+        """
+        index = 2 * (key & self._mask)
+        entries = self._entries
+        for entry in (entries[index], entries[index + 1]):
+            if entry is not None and entry[0] == key:
+                self._hits += 1
+                return entry
+        self._misses += 1
+        return None
+
+    def store(self, key, depth, score, bound, move_key):
+        """
+        Stores the result of searching a position. The result replaces the
+        first entry of the bucket if it is at least as deep or if the first
+        entry is from an older search, and the second entry otherwise.
+
+        Parameters:
+            key (int): hash of the position
+            depth (int): depth the position was searched to
+            score (float): value found by the search
+            bound (int): EXACT, LOWER or UPPER
+            move_key (int or None): key of the best move, if there is one
+
+        Returns:
+            None
+        """
+        index = 2 * (key & self._mask)
+        entries = self._entries
+        first = entries[index]
+        if (first is not None and first[1] > depth and
+                first[5] == self._generation):
+            index += 1
+        old = entries[index]
+        if old is not None and old[0] != key:
+            self._collisions += 1
+        entries[index] = (key, depth, score, bound, move_key,
+                          self._generation)
+        self._stores += 1
+
+    def get_stats(self):
+        """
+        Returns how many lookups found and missed an entry, how many results
+        were stored and how many stores replaced another position's entry.
+
+        Parameters:
+            None
+
+        Returns:
+            tuple(int, int, int, int): hits, misses, stores and collisions
+        """
+        return self._hits, self._misses, self._stores, self._collisions
+
+class MoveOrdering():
+    """
+    Class for ordering the moves searched by the alphabeta search so the
+    moves most likely to cut the search off are tried first:
+
+    1. the best move of an earlier search of the position (from the
+       transposition table, or the previous iteration at the root),
+    2. captures, taking the most pieces first, then promotions,
+    3. the two most recent quiet moves that cut the search off at the same
+       ply (killer moves),
+    4. the remaining moves by how often and how deep they caused cutoffs
+       (history table).
+
+    Moves that score the same keep the order they were generated in. Any
+    object with the same public methods can be given to smartBot instead.
+    """
+    # Number of killer moves kept for each ply
+    KILLERS = 2
+
+    def __init__(self):
+        """
+            Constructor
+        """
+        self._killers = []
+        self._history = {}
+
+    def new_search(self):
+        """
+        Prepares for the search of a new move. Killer moves are forgotten
+        since the plies now refer to different positions, and the history
+        scores are halved so older searches count for less. Both are kept
+        between the iterations of one search.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        self._killers = []
+        for key in self._history:
+            self._history[key] //= 2
+
+    def order(self, board, moves, ply, move_key):
+        """
+        Returns the moves in the order they should be searched.
+
+        Parameters:
+            board (Game obj): board in the position of the moves
+            moves (list[Move]): moves of the position (not modified)
+            ply (int): number of moves played since the root of the search
+            move_key (int or None): key of the best move found by an earlier
+                search of the position, if there is one
+
+        Returns:
+            list[Move]: the ordered moves
+        """
+        killers = self._killers[ply] if ply < len(self._killers) else ()
+        history = self._history
+
+        def score(move):
+            key = move.get_key()
+            if key == move_key:
+                return (4, 0, 0)
+            captures = len(move.get_captures())
+            promotes = board.move_promotes(move)
+            if captures or promotes:
+                return (3, captures, promotes)
+            if key in killers:
+                return (2, -killers.index(key), 0)
+            return (1, history.get(self._history_key(move), 0), 0)
+
+        return sorted(moves, key=score, reverse=True)
+
+    def record_cutoff(self, move, ply, depth):
+        """
+        Remembers a move that cut the search off.
+
+        Parameters:
+            move (Move): the move
+            ply (int): number of moves played since the root of the search
+            depth (int): depth the move's position was searched to
+
+        Returns:
+            None
+        """
+        if move.get_captures():
+            # captures are already searched first
+            return
+
+        while len(self._killers) <= ply:
+            self._killers.append([])
+        killers = self._killers[ply]
+        key = move.get_key()
+        if key in killers:
+            killers.remove(key)
+        killers.insert(0, key)
+        del killers[self.KILLERS:]
+
+        history_key = self._history_key(move)
+        self._history[history_key] = (self._history.get(history_key, 0) +
+                                      depth * depth)
+
+    def _history_key(self, move):
+        """
+        Returns the key of the history table of a move: its color, start
+        square and end square.
+
+        Parameters:
+            move (Move): the move
+
+        Returns:
+            tuple(PieceColor, int, int): history key
+        """
+        return (move.get_color(), move.get_start_square(),
+                move.get_path_squares()[-1])
 
 class smartBot():
     """
     Class for bot that uses Minimax algorithm to suggest moves.
     """
-    def __init__(self, board, color, depth):
+    def __init__(self, board, color, depth, search="minimax", tt_mb=0,
+                 move_time=None, ordering=None, quiescence_depth=0,
+                 clock=time.perf_counter):
         """
             Constructor
 
             board (Game obj): board that bot will play on
             color (PieceColor obj): color of the pieces the bot will play with 
             depth (int): depth of the Minimax algorithm
+            search (str): "minimax" to search the whole tree or "alphabeta"
+                to prune it; both choose the same move
+            tt_mb (float): memory limit in megabytes of the transposition
+                table of the alphabeta search (0 for no table)
+            move_time (float or None): default time limit in seconds of
+                each move (None to always search to depth)
+            ordering (MoveOrdering or None): move ordering of the alphabeta
+                search (None to search the moves in the order they are
+                generated)
+            quiescence_depth (int): number of forced captures the alphabeta
+                search may play past its depth before evaluating the board
+                (0 to always evaluate at the depth)
+            clock (function): returns the current time in seconds, for timed
+                searches (can be replaced to make them repeatable in tests)
+
+            Raises:
+                ValueError: if search is not one of SEARCH_MODES, or if a
+                    transposition table is asked for with minimax
         """
+        if search not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {search}")
+        if tt_mb and search != "alphabeta":
+            raise ValueError("The transposition table needs alphabeta search")
+        if ordering is not None and search != "alphabeta":
+            raise ValueError("Move ordering needs alphabeta search")
+        if quiescence_depth and search != "alphabeta":
+            raise ValueError("Quiescence search needs alphabeta search")
         self._board = board
         self._color = color
         self._depth = depth
+        self._search = search
+        self._table = TranspositionTable(tt_mb) if tt_mb else None
+        self._move_time = move_time
+        self._deadline = None
+        self._last_depth = 0
+        self._ordering = ordering
+        self._quiescence_depth = quiescence_depth
+        self._clock = clock
+        self._pv_key = None
+        self._cutoffs = 0
+        self._first_move_cutoffs = 0
     
-    def suggest_move(self):
+    def suggest_move(self, time_limit=None):
         """
         Calls the private method _minimax() to return the coordinates of the 
         piece that should be moved and where it should be moved to.
 
         Parameters:
-            None
+            time_limit (float or None): seconds the search may take (see
+                choose_move)
 
         Returns:
             tuple(tuple, tuple): first tuple represents starting coordinates of 
             Minimax chosen piece, second tuple represents end coordinates of 
             Minimax chosen path
         """
-        move = self._minimax(self._board, self._depth, self._color)
-        start, end = move[0], move[1]
-        return start, end
+        move = self.choose_move(time_limit)
+        return move.get_start(), move.get_end()
+
+    def choose_move(self, time_limit=None):
+        """
+        Calls the private method _minimax() to return the move the bot
+        should play.
+
+        Without a time limit the search goes to the bot's depth. With a time
+        limit, the depth is ignored and the position is searched to depth 1,
+        2, 3, ... until the time runs out, and the move of the deepest
+        completed search is returned. Depth 1 is always completed, so a move
+        is returned even if the time limit is very small.
+
+        Parameters:
+            time_limit (float or None): seconds the search may take (the
+                bot's move_time if None)
+
+        Returns:
+            Move obj: Minimax chosen move, which can be passed to the board's
+            play method
+        """
+        if time_limit is None:
+            time_limit = self._move_time
+        if self._table is not None:
+            self._table.new_search()
+        if self._ordering is not None:
+            self._ordering.new_search()
+
+        if time_limit is None:
+            move, _ = self._search_to_depth(self._board, self._depth)
+            self._last_depth = self._depth
+            return move
+        return self._iterative_deepening(time_limit)
+
+    def get_cutoff_stats(self):
+        """
+        Returns how many times the alphabeta search was cut off and how many
+        of those times the first move searched caused the cutoff, which shows
+        how good the move ordering is.
+
+        Parameters:
+            None
+
+        Returns:
+            tuple(int, int): number of cutoffs and of first move cutoffs
+        """
+        return self._cutoffs, self._first_move_cutoffs
+
+    def get_last_depth(self):
+        """
+        Returns the depth of the last completed search.
+
+        Parameters:
+            None
+
+        Returns:
+            int: depth the last chosen move was searched to
+        """
+        return self._last_depth
+
+    def get_tt_stats(self):
+        """
+        Returns the counters of the transposition table.
+
+        Parameters:
+            None
+
+        Returns:
+            tuple(int, int, int, int): hits, misses, stores and collisions
+            (all 0 if the bot has no table)
+        """
+        if self._table is None:
+            return 0, 0, 0, 0
+        return self._table.get_stats()
+
+    def _iterative_deepening(self, time_limit):
+        """
+        Searches deeper and deeper until the time limit runs out. The search
+        is made on a copy of the board, so stopping it in the middle of a
+        move cannot leave the bot's board changed.
+
+        Parameters:
+            time_limit (float): seconds the search may take
+
+        Returns:
+            Move obj: move of the deepest completed search
+        """
+        deadline = self._clock() + time_limit
+        board = self._board.clone()
+        move, val = self._search_to_depth(board, 1)
+        self._last_depth = 1
+
+        self._deadline = deadline
+        try:
+            for depth in range(2, MAX_DEPTH + 1):
+                if abs(val) == float('inf'):
+                    # the result of the game is already known
+                    break
+                self._pv_key = move.get_key()
+                deeper_move, val = self._search_to_depth(board, depth)
+                if deeper_move is not None:
+                    move = deeper_move
+                self._last_depth = depth
+        except _SearchTimeout:
+            pass
+        finally:
+            self._deadline = None
+            self._pv_key = None
+        return move
+
+    def _search_to_depth(self, board, depth):
+        """
+        Searches the position with the bot's search algorithm.
+
+        Parameters:
+            board (Game obj): board to search on
+            depth (int): the number of moves that the bot thinks ahead
+
+        Returns:
+            tuple(Move, int): chosen move and evaluation of the board
+        """
+        if self._search == "alphabeta":
+            return self._alphabeta(board, depth, self._color, -float('inf'),
+                                   float('inf'))
+        return self._minimax(board, depth, self._color)
+
+    def _check_time(self):
+        """
+        Stops a timed search whose time has run out.
+
+        Parameters:
+            None
+
+        Raises:
+            _SearchTimeout: if the search is past its deadline
+
+        Returns:
+            None
+        """
+        if self._deadline is not None and self._clock() > self._deadline:
+            raise _SearchTimeout()
 
-        
     def _minimax(self, board, depth, color):
         """
         Minimax algorithm that traverses a tree of paths given a starting 
@@ -88,55 +562,236 @@ class smartBot():
             color (PieceColor obj): color of the pieces the bot will play with 
 
         Returns:
-            tuple(tuple, tuple, int): first tuple represents starting 
-            coordinates of Minimax chosen piece, second tuple represents end 
-            coordinates of Minimax chosen path, third tuple represents 
+            tuple(Move, int): Minimax chosen move (None at the leaves) and
             evaluation of the board
         """
         # Base case --> leaf of tree (depth has been fully explored)
         if depth == 0: 
-            return None, None, board.evaluate()
+            return None, board.evaluate()
+        self._check_time()
         
         if color == PieceColor.BLACK:
             # Maximize eval value for "BLACK"
             max_val = -float('inf')
-            start_coord = None
             best_move = None
             # Consider all paths for a given position
-            for start, paths in board.player_valid_moves(color).items():
-                for path in paths:
-                    end = path[-1]
-                    # Use deepycopy so original board is not affected when a 
-                    # move is made
-                    tmp_board = deepcopy(board)
-                    tmp_board.move(color, start, end)
-                    # Recurses a level below. "BLACK" will try to maximize the
-                    # values of the nodes in this level
-                    _, _, val = self._minimax(tmp_board, depth - 1, PieceColor.RED)
-                    if val > max_val:
-                        max_val = val
-                        start_coord = start
-                        best_move = end
-            return start_coord, best_move, max_val
+            for move in board.generate_moves(color):
+                # Play the move on the board itself and take it back once
+                # the subtree has been searched
+                record = board.apply_move(move)
+                # Recurses a level below. "BLACK" will try to maximize the
+                # values of the nodes in this level
+                _, val = self._minimax(board, depth - 1, PieceColor.RED)
+                board.unmake_move(record)
+                if val > max_val:
+                    max_val = val
+                    best_move = move
+            return best_move, max_val
 
         if color == PieceColor.RED:
             # Minimize eval value for "RED"
             min_val = float('inf')
-            start_coord = None
             best_move = None
-            for start, paths in board.player_valid_moves(color).items():
-                for path in paths:
-                    end = path[-1]
-                    tmp_board = deepcopy(board)
-                    tmp_board.move(color, start, end)
-                    # Recurses a level below. "RED" will try to minimize the
-                    # values of the nodes in this level
-                    _, _, val = self._minimax(tmp_board, depth - 1, PieceColor.BLACK)
-                    if val < min_val:
-                        min_val = val
-                        start_coord = start
-                        best_move = end
-            return start_coord, best_move, min_val
+            for move in board.generate_moves(color):
+                record = board.apply_move(move)
+                # Recurses a level below. "RED" will try to minimize the
+                # values of the nodes in this level
+                _, val = self._minimax(board, depth - 1, PieceColor.BLACK)
+                board.unmake_move(record)
+                if val < min_val:
+                    min_val = val
+                    best_move = move
+            return best_move, min_val
+
+    def _alphabeta(self, board, depth, color, alpha, beta, ply=0):
+        """
+        Minimax with alpha-beta pruning. alpha is the value black is already
+        sure to get and beta the value red is already sure to get, so as soon
+        as a move shows that the current node is outside of that window the
+        remaining moves are skipped. Values outside of the window are clamped
+        to it (fail-hard), and a move only replaces the best move if it is
+        strictly better, so called with an infinite window and no
+        transposition table this returns the same move and value as _minimax.
+
+        With a transposition table, results of earlier searches of the same
+        position at least as deep are used instead of searching it again
+        (except at the root, which needs a move), and the best move found
+        before is searched first. With a move ordering, the moves are
+        searched in the order it gives, which changes which of several
+        equally good moves is chosen but not the value. With a quiescence
+        depth, positions at the depth where a capture is pending are
+        searched further with _quiescence instead of being evaluated.
+
+        Parameters:
+            board (Game obj): board that bot will play on
+            depth (int): the number of moves that the bot thinks ahead
+            color (PieceColor obj): color of the pieces the bot will play with
+            alpha (float): lower bound of the values still of interest
+            beta (float): upper bound of the values still of interest
+            ply (int): number of moves played since the root of the search
+
+        Returns:
+            tuple(Move, int): chosen move (None at the leaves or if no move
+            is inside the window) and evaluation of the board
+        """
+        if depth == 0:
+            if self._quiescence_depth:
+                return None, self._quiescence(board, color, alpha, beta,
+                                              self._quiescence_depth)
+            return None, board.evaluate()
+        self._check_time()
+
+        moves = board.generate_moves(color)
+        move_key = self._pv_key if ply == 0 else None
+        table = self._table
+        if table is not None:
+            key = 2 * board.position_hash() + (color == PieceColor.RED)
+            entry = table.probe(key)
+            if entry is not None:
+                _, entry_depth, score, bound, entry_key, _ = entry
+                if ply > 0 and entry_depth >= depth:
+                    if bound == EXACT:
+                        return None, min(max(score, alpha), beta)
+                    if bound == LOWER and score >= beta:
+                        return None, beta
+                    if bound == UPPER and score <= alpha:
+                        return None, alpha
+                if entry_key is not None:
+                    move_key = entry_key
+
+        if self._ordering is not None:
+            moves = self._ordering.order(board, moves, ply, move_key)
+        elif table is not None:
+            moves = self._hash_move_first(moves, move_key)
+
+        best_move = None
+        if color == PieceColor.BLACK:
+            bound = UPPER
+            for i, move in enumerate(moves):
+                record = board.apply_move(move)
+                _, val = self._alphabeta(board, depth - 1, PieceColor.RED,
+                                         alpha, beta, ply + 1)
+                board.unmake_move(record)
+                if val > alpha:
+                    alpha = val
+                    best_move = move
+                    bound = EXACT
+                    if alpha >= beta:
+                        # red will not let the game reach this node
+                        alpha = beta
+                        bound = LOWER
+                        self._record_cutoff(move, i, ply, depth)
+                        break
+            value = alpha
+
+        else:
+            bound = LOWER
+            for i, move in enumerate(moves):
+                record = board.apply_move(move)
+                _, val = self._alphabeta(board, depth - 1, PieceColor.BLACK,
+                                         alpha, beta, ply + 1)
+                board.unmake_move(record)
+                if val < beta:
+                    beta = val
+                    best_move = move
+                    bound = EXACT
+                    if beta <= alpha:
+                        # black will not let the game reach this node
+                        beta = alpha
+                        bound = UPPER
+                        self._record_cutoff(move, i, ply, depth)
+                        break
+            value = beta
+
+        if table is not None:
+            table.store(key, depth, value, bound,
+                        None if best_move is None else best_move.get_key())
+        return best_move, value
+
+    def _quiescence(self, board, color, alpha, beta, depth):
+        """
+        Searches only the captures of a position until no capture is pending,
+        so the search does not stop in the middle of an exchange of pieces.
+        The evaluation of the position is only used once it is quiet (stand
+        pat) or the extension depth is used up: captures are compulsory, so
+        a player who has to capture cannot keep the current evaluation and
+        all of their captures are searched. Values are clamped to the window
+        like in _alphabeta.
+
+        Parameters:
+            board (Game obj): board that bot will play on
+            color (PieceColor obj): color of the player to move
+            alpha (float): lower bound of the values still of interest
+            beta (float): upper bound of the values still of interest
+            depth (int): number of captures that may still be played
+
+        Returns:
+            float: evaluation of the board once it is quiet
+        """
+        if depth == 0 or not board.must_capture(color):
+            return board.evaluate()
+        self._check_time()
+
+        if color == PieceColor.BLACK:
+            for move in board.generate_moves(color):
+                record = board.apply_move(move)
+                val = self._quiescence(board, PieceColor.RED, alpha, beta,
+                                       depth - 1)
+                board.unmake_move(record)
+                if val > alpha:
+                    alpha = val
+                    if alpha >= beta:
+                        return beta
+            return alpha
+
+        for move in board.generate_moves(color):
+            record = board.apply_move(move)
+            val = self._quiescence(board, PieceColor.BLACK, alpha, beta,
+                                   depth - 1)
+            board.unmake_move(record)
+            if val < beta:
+                beta = val
+                if beta <= alpha:
+                    return alpha
+        return beta
+
+    def _record_cutoff(self, move, index, ply, depth):
+        """
+        Counts a cutoff of the alphabeta search and tells the move ordering
+        about the move that caused it.
+
+        Parameters:
+            move (Move): move that caused the cutoff
+            index (int): position of the move in the searched order
+            ply (int): number of moves played since the root of the search
+            depth (int): depth the position was searched to
+
+        Returns:
+            None
+        """
+        self._cutoffs += 1
+        if index == 0:
+            self._first_move_cutoffs += 1
+        if self._ordering is not None:
+            self._ordering.record_cutoff(move, ply, depth)
+
+    def _hash_move_first(self, moves, move_key):
+        """
+        Returns the moves with the move of the given key first.
+
+        Parameters:
+            moves (list[Move]): moves of the position (not modified)
+            move_key (int or None): key of the move to search first
+
+        Returns:
+            list[Move]: the reordered moves
+        """
+        if move_key is None:
+            return moves
+        for i, move in enumerate(moves):
+            if move.get_key() == move_key:
+                return [move] + moves[:i] + moves[i + 1:]
+        return moves
 
 
 
@@ -146,7 +801,8 @@ class BotPlayer:
     """
     Class to store information about a bot player in a simulation.
     """
-    def __init__(self, board, color, depth):
+    def __init__(self, board, color, depth, search="minimax", tt_mb=0,
+                 move_time=None, ordering=None, quiescence_depth=0):
         """ 
             Constructor
         
@@ -155,13 +811,23 @@ class BotPlayer:
             depth (int): depth decides identity of bot player (depth = 0 
                 signifies bot player is randomBot, depth > 0 signifies bot
                 player is smartBot)
+            search (str): search algorithm of the smartBot (one of
+                SEARCH_MODES)
+            tt_mb (float): transposition table size of the smartBot in
+                megabytes (0 for no table)
+            move_time (float or None): time limit in seconds of each move of
+                the smartBot (None to search to depth)
+            ordering (MoveOrdering or None): move ordering of the smartBot
+            quiescence_depth (int): quiescence search depth of the smartBot
+                (0 for no quiescence search)
         """
         self.depth = depth
 
         if self.depth == 0:
             self.bot = randomBot(board, color)
         elif self.depth > 0:
-            self.bot = smartBot(board, color, depth)
+            self.bot = smartBot(board, color, depth, search, tt_mb,
+                                move_time, ordering, quiescence_depth)
         self.color = color
         self.wins = 0
 
@@ -189,10 +855,10 @@ def simulate(board, n, bots, playout_mode=False):
 
         # While the game doesn't recognize a winner, make a move
         while not board.get_winner():
-            start, end = current.bot.suggest_move()
+            move = current.bot.choose_move()
             if playout_mode:
-                print(f"{i} {start} {end}")
-            board.move(current.color, start, end)
+                print(f"{i} {move.get_start()} {move.get_end()}")
+            board.play(move)
             
             # Update the player
             if current.color == PieceColor.BLACK:
@@ -219,32 +885,125 @@ def simulate(board, n, bots, playout_mode=False):
                 if playout_mode:
                     print("Draw")
                     print()
-     
-@click.command()
+
+
+# PERFT
+
+def perft(board, color, depth):
+    """
+    Counts the positions reached after playing every sequence of depth moves
+    from the current position. A multi-jump counts as a single move, the same
+    way smartBot treats a whole path as one move. Comparing the counts against
+    known values checks that the move generator is correct, and timing them
+    measures how fast it is.
+
+    Parameters:
+        board (Game obj): position to count from (left unchanged)
+        color (PieceColor obj): color of the player to move
+        depth (int): number of moves to play
+
+    Returns:
+        int: number of positions at the given depth
+    """
+    if depth == 0:
+        return 1
+
+    if color == PieceColor.BLACK:
+        next_color = PieceColor.RED
+    else:
+        next_color = PieceColor.BLACK
+
+    nodes = 0
+    for start, paths in board.player_valid_moves(color).items():
+        for path in paths:
+            record = board.make_move(color, start, path)
+            nodes += perft(board, next_color, depth - 1)
+            board.unmake_move(record)
+    return nodes
+
+def perft_divide(board, color, depth):
+    """
+    Counts the positions at the given depth separately for each move of the
+    current position, which helps to find the move where two move generators
+    disagree.
+
+    Parameters:
+        board (Game obj): position to count from (left unchanged)
+        color (PieceColor obj): color of the player to move
+        depth (int): number of moves to play, including the first move
+
+    Returns:
+        dict: maps (start, path) of each first move to its number of positions,
+            where path is a tuple of the squares the piece moves to
+    """
+    if color == PieceColor.BLACK:
+        next_color = PieceColor.RED
+    else:
+        next_color = PieceColor.BLACK
+
+    counts = {}
+    for start, paths in board.player_valid_moves(color).items():
+        for path in paths:
+            record = board.make_move(color, start, path)
+            counts[(start, tuple(path))] = perft(board, next_color, depth - 1)
+            board.unmake_move(record)
+    return counts
+
+@click.group(invoke_without_command=True)
 @click.option('-n', '--n',  type=click.INT, default=10)
 @click.option('-d1', '--depth_1',  type=click.INT, default=0)
 @click.option('-d2', '--depth_2',  type=click.INT, default=0)
 @click.option('-r', '--row',  type=click.INT, default=3)
 @click.option('-p', '--playout_mode', type=click.BOOL, default=False)
-def cmd(n, row, depth_1, depth_2, playout_mode):
+@click.option('-s', '--search', type=click.Choice(SEARCH_MODES),
+              default="minimax")
+@click.option('--tt-mb', type=click.FLOAT, default=0)
+@click.option('--move-time', type=click.FLOAT, default=None)
+@click.option('--move-ordering', is_flag=True, default=False)
+@click.option('--quiescence-depth', type=click.INT, default=0)
+@click.option('--engine', type=click.Choice(list(ENGINES)), default="grid")
+@click.pass_context
+def cmd(ctx, n, row, depth_1, depth_2, playout_mode, search, tt_mb,
+        move_time, move_ordering, quiescence_depth, engine):
     """
         Shows win-rate between bot players and if playout_mode is 'True' shows 
         live game.
 
         Parameters:
+            ctx (click.Context): click context, used to skip the simulation
+                when a subcommand such as perft is run
             n (int): number of games
             row (int): row of pieces for board
             depth_1 (int): depth for smartBot (depth is 0 --> use randomBot)
             depth_2 (int): depth for smartBot (depth is 0 --> use randomBot)
             playout_mode (bool): 'True' shows live playout of game
+            search (str): search algorithm of the smartBots
+            tt_mb (float): transposition table size of each smartBot in
+                megabytes (0 for no table, needs alphabeta search)
+            move_time (float or None): seconds each smartBot may think about
+                a move, searching deeper until the time runs out (None to
+                search to the given depth)
+            move_ordering (bool): order the moves of each smartBot's search
+                with a MoveOrdering (needs alphabeta search)
+            quiescence_depth (int): number of forced captures each smartBot
+                may search past its depth (0 for none, needs alphabeta
+                search)
+            engine (str): game engine to play on (one of ENGINES)
 
         Returns:
             None
     """
-    board = CheckersGame(row)
+    if ctx.invoked_subcommand is not None:
+        return
+
+    board = ENGINES[engine](row)
 
-    bot1 = BotPlayer(board, PieceColor.BLACK, depth_1)
-    bot2 = BotPlayer(board, PieceColor.RED, depth_2)
+    bot1 = BotPlayer(board, PieceColor.BLACK, depth_1, search, tt_mb,
+                     move_time, MoveOrdering() if move_ordering else None,
+                     quiescence_depth)
+    bot2 = BotPlayer(board, PieceColor.RED, depth_2, search, tt_mb,
+                     move_time, MoveOrdering() if move_ordering else None,
+                     quiescence_depth)
 
     bots = {PieceColor.BLACK: bot1, PieceColor.RED: bot2}
 
@@ -258,6 +1017,59 @@ def cmd(n, row, depth_1, depth_2, playout_mode):
     print(f"Bot 2 wins (Depth = {depth_2}): {100 * bot2_wins / n:.2f}%")
     print(f"Ties: {100 * ties / n:.2f}%")
 
+@cmd.command(name="perft")
+@click.option('-r', '--row',  type=click.INT, default=3)
+@click.option('-d', '--depth',  type=click.INT, default=4)
+@click.option('--divide', is_flag=True, default=False)
+@click.option('--engine', type=click.Choice(list(ENGINES)), default="grid")
+@click.option('--fen', type=click.STRING, default=None)
+def perft_cmd(row, depth, divide, engine, fen):
+    """
+        Counts the positions reached from the initial position, or from the
+        given position, after depth moves and reports the number of positions
+        per second.
+
+        Parameters:
+            row (int): row of pieces for board (ignored with a position)
+            depth (int): number of moves to play
+            divide (bool): also show the count for each first move
+            engine (str): game engine to count the positions on (one of
+                ENGINES)
+            fen (str or None): position to count from, in the notation of
+                CheckersGame.to_fen, with the player to move taken from it
+                (needs the grid engine)
+
+        Returns:
+            None
+    """
+    if fen is None:
+        board = ENGINES[engine](row)
+        color = PieceColor.BLACK
+        name = f"Rows = {row}"
+    else:
+        if ENGINES[engine] is not CheckersGame:
+            raise click.BadParameter("positions need the grid engine",
+                                     param_hint="--fen")
+        try:
+            board = CheckersGame.from_fen(fen)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--fen") from None
+        color = board.position().get_turn()
+        name = f"Position = {fen}"
+
+    start_time = time.perf_counter()
+    if divide:
+        counts = perft_divide(board, color, depth)
+        for (start, path), count in counts.items():
+            print(f"{start} -> {list(path)}: {count}")
+        nodes = sum(counts.values())
+    else:
+        nodes = perft(board, color, depth)
+    elapsed = time.perf_counter() - start_time
+
+    print(f"Perft ({name}, Depth = {depth}): {nodes} positions")
+    print(f"Time: {elapsed:.3f}s ({nodes / max(elapsed, 1e-9):.0f} positions/s)")
+
 if __name__ == "__main__":
     cmd()
 
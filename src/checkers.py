@@ -23,964 +23,3340 @@ Examples:
 
         game.get_winner()
 """
-from typing import Optional, List, Tuple, Dict, Set
+from typing import Optional, List, Tuple, Dict, Set, Callable
 from enum import Enum
+import random
+import struct
 PieceColor = Enum("PieceColor", ["RED", "BLACK", "DRAW"])
 """
 Enum type for representing piece colors.
 """
 
-class Piece:
+# codes of the pieces stored on the board: the low two bits are the color of
+# the piece and the KING bit is set for kings
+EMPTY = 0
+BLACK_MAN = 1
+RED_MAN = 2
+KING = 4
+BLACK_KING = BLACK_MAN | KING
+RED_KING = RED_MAN | KING
+
+# color bits of each player and player of each color bits
+_COLOR_CODES = {PieceColor.BLACK: BLACK_MAN, PieceColor.RED: RED_MAN}
+_CODE_COLORS = {BLACK_MAN: PieceColor.BLACK, RED_MAN: PieceColor.RED}
+
+# character of each piece code in board_to_str
+_CODE_CHARS = (" ", "b", "r", " ", " ", "B", "R")
+
+# layout of the start of a pickled CheckersGame: number of rows of pieces,
+# winner, player to move, draw offered, hash checking, jumping square, moves
+# since capture counters and number of slots of each player's PieceIndex.
+# The piece codes of the board and the slots of each player follow it.
+_STATE_HEADER = struct.Struct("<BBBBBHHHHH")
+
+# jumping square stored in the state when no piece is jumping
+_NO_JUMPING = 0xFFFF
+
+# largest moves since capture counter that fits in the state
+_MAX_MOVES_SINCE_CAPTURE = 0xFFFF
+
+# smallest and largest board sizes: two rows of pieces each, up to the 200
+# dark squares that Move.SQUARE_BITS and PieceIndex.NO_SLOT can hold
+_MIN_SIZE = 6
+_MAX_SIZE = 20
+
+MoveRecord = Tuple[int, int, List[Tuple[int, int, int]], bool, Optional[int],
+                   int, int, Optional[PieceColor], PieceColor, int]
+"""
+Type for the undo record returned by CheckersGame.make_move: the start and end
+squares of the move, the captured pieces with their squares, codes and slots in
+their player's PieceIndex, whether the piece was promoted, and the previous
+jumping square, moves since capture counters, winner, player to move and
+position hash. Squares are indices of the dark squares of the board.
+"""
+
+def dark_squares(size: int) -> List[Tuple[int, int]]:
+    """
+    Returns the locations of the dark squares of a board in row-major order.
+    The position of a location in this list is its square index.
+
+    Parameters:
+        size (int): number of rows and columns of the board
+
+    Returns:
+        list[tuple(int, int)]: locations of the dark squares
+    """
+    return [(r, c) for r in range(size) for c in range(size)
+            if r % 2 != c % 2]
+
+class ZobristKeys:
     """
-    Class for representing a piece.
+    Class for storing the random keys used to hash the positions of a board
+    size. The keys are generated from a fixed seed, so the same position always
+    has the same hash.
     """
 
     #
-    # PRIVATE ATTRIBUTES
+    # PUBLIC ATTRIBUTES
     #
-        
-    # color of the piece        
-    _color: PieceColor
 
-    # if the piece is a king
-    _king: bool
+    # keys of each dark square for each piece code (0 for the empty code)
+    pieces: List[Tuple[int, ...]]
+
+    # keys of each dark square for the piece that is in the middle of a jump
+    jumping: List[int]
+
+    # key included when it is the red player's turn
+    red_turn: int
 
     #
     # PUBLIC METHODS
     #
-    
-    def __init__(self, color: PieceColor):
+
+    def __init__(self, size: int):
         """
         Constructor
-    
+
         Parameters:
-            color (PieceColor): color of the piece
-        """
-        self._color = color
-        self._king = False
+            size (int): number of rows and columns of the board
+        """
+        rng = random.Random(size)
+        self.pieces = []
+        self.jumping = []
+        for _ in dark_squares(size):
+            keys = [0] * len(_CODE_CHARS)
+            for code in (BLACK_MAN, BLACK_KING, RED_MAN, RED_KING):
+                keys[code] = rng.getrandbits(64)
+            self.pieces.append(tuple(keys))
+            self.jumping.append(rng.getrandbits(64))
+        self.red_turn = rng.getrandbits(64)
+
+# keys that have already been generated, keyed by board size
+_ZOBRIST_KEYS: Dict[int, ZobristKeys] = {}
+
+def get_zobrist_keys(size: int) -> ZobristKeys:
+    """
+    Returns the shared hash keys of the given board size, generating them the
+    first time they are needed.
 
-    def get_color(self) -> PieceColor:
+    Parameters:
+        size (int): number of rows and columns of the board
+
+    Returns:
+        ZobristKeys: hash keys of the board size
+    """
+    keys = _ZOBRIST_KEYS.get(size)
+    if keys is None:
+        keys = ZobristKeys(size)
+        _ZOBRIST_KEYS[size] = keys
+    return keys
+
+class MoveTables:
+    """
+    Class for storing the squares each kind of piece can step and jump to from
+    every dark square of a board size, so that move generation does not have
+    to compute and bounds check destinations. Squares are indices into the
+    list of dark squares, and the tables of each kind of piece are indexed by
+    its piece code.
+    """
+
+    #
+    # PUBLIC ATTRIBUTES
+    #
+
+    # locations of the dark squares and square index of each location
+    coords: List[Tuple[int, int]]
+    index: Dict[Tuple[int, int], int]
+
+    # squares each piece code can step to from each square (None for codes
+    # that are not pieces)
+    steps: List[Optional[List[Tuple[int, ...]]]]
+
+    # (jumped over, destination) pairs of each piece code from each square
+    jumps: List[Optional[List[Tuple[Tuple[int, int], ...]]]]
+
+    # square jumped over to get from a square to a destination two squares
+    # away
+    jumped_over: List[Dict[int, int]]
+
+    # if each piece code is promoted on each square
+    promotes: List[Optional[List[bool]]]
+
+    # each square and the squares one or two diagonal steps away from it,
+    # which are the squares whose pieces can gain or lose a capture when the
+    # square changes
+    nearby: List[Tuple[int, ...]]
+
+    #
+    # PUBLIC METHODS
+    #
+
+    def __init__(self, size: int):
         """
-        Gets the color of the piece.
-    
+        Constructor
+
         Parameters:
-            None
+            size (int): number of rows and columns of the board
+        """
+        self.coords = dark_squares(size)
+        self.index = {coord: i for i, coord in enumerate(self.coords)}
+
+        # directions in the order CheckersGame has always checked them in
+        black_dirs = [(1, 1), (1, -1)]
+        red_dirs = [(-1, 1), (-1, -1)]
+        code_dirs = {BLACK_MAN: black_dirs, RED_MAN: red_dirs,
+                     BLACK_KING: black_dirs + red_dirs,
+                     RED_KING: black_dirs + red_dirs}
+
+        self.steps = [None] * len(_CODE_CHARS)
+        self.jumps = [None] * len(_CODE_CHARS)
+        self.promotes = [None] * len(_CODE_CHARS)
+        self.jumped_over = [{} for _ in self.coords]
+
+        for code, dirs in code_dirs.items():
+            steps = []
+            jumps = []
+            for r, c in self.coords:
+                square_steps = []
+                square_jumps = []
+                for dr, dc in dirs:
+                    if 0 <= r + dr < size and 0 <= c + dc < size:
+                        square_steps.append(self.index[(r + dr, c + dc)])
+                    if 0 <= r + 2 * dr < size and 0 <= c + 2 * dc < size:
+                        square_jumps.append(
+                            (self.index[(r + dr, c + dc)],
+                             self.index[(r + 2 * dr, c + 2 * dc)]))
+                steps.append(tuple(square_steps))
+                jumps.append(tuple(square_jumps))
+            self.steps[code] = steps
+            self.jumps[code] = jumps
+
+        for start, square_jumps in enumerate(self.jumps[BLACK_KING]):
+            for over, dest in square_jumps:
+                self.jumped_over[start][dest] = over
+
+        self.promotes[BLACK_MAN] = [r == size - 1 for r, _ in self.coords]
+        self.promotes[RED_MAN] = [r == 0 for r, _ in self.coords]
+        self.promotes[BLACK_KING] = [False] * len(self.coords)
+        self.promotes[RED_KING] = [False] * len(self.coords)
+
+        self.nearby = []
+        for r, c in self.coords:
+            square_nearby = [self.index[(r, c)]]
+            for dr, dc in black_dirs + red_dirs:
+                for dist in (1, 2):
+                    coord = (r + dist * dr, c + dist * dc)
+                    if coord in self.index:
+                        square_nearby.append(self.index[coord])
+            self.nearby.append(tuple(square_nearby))
+
+# tables that have already been built, keyed by board size
+_MOVE_TABLES: Dict[int, MoveTables] = {}
+
+def get_move_tables(size: int) -> MoveTables:
+    """
+    Returns the shared move tables of the given board size, building them the
+    first time they are needed.
 
-        Returns:
-            PieceColor: color of the given piece
+    Parameters:
+        size (int): number of rows and columns of the board
+
+    Returns:
+        MoveTables: move tables of the board size
+    """
+    tables = _MOVE_TABLES.get(size)
+    if tables is None:
+        tables = MoveTables(size)
+        _MOVE_TABLES[size] = tables
+    return tables
+
+def single_jumps(squares: bytearray, tables: MoveTables, start: int, code: int,
+                 jumped: Set[int]) -> List[Tuple[int, int]]:
+    """
+    Returns the single jumps the piece with the given code can make from the
+    given square of a board, without jumping over a square that has already
+    been jumped over.
+
+    Parameters:
+        squares (bytearray): piece code of each dark square
+        tables (MoveTables): move tables of the board size
+        start (int): starting square on the board
+        code (int): piece code of the jumping piece
+        jumped (set(int)): squares that have already been jumped over
+
+    Returns:
+        list[tuple(int, int)]: the possible end squares and the squares being
+        jumped over
+    """
+    opponent = (code & 3) ^ 3
+    valid = []
+    for jump_over, dest in tables.jumps[code][start]:
+        if (squares[jump_over] & opponent and not squares[dest] and
+                jump_over not in jumped):
+            valid.append((dest, jump_over))
+
+    return valid
+
+def iter_jump_paths(squares: bytearray, tables: MoveTables, start: int,
+                    code: int, jumped: Set[int]):
+    """
+    Yields the complete jump paths the piece with the given code can make from
+    the given square of a board one at a time. The jump tree is walked with an
+    explicit stack, and a single set of jumped squares and a single path are
+    updated in place as the walk goes down and back up the tree.
+
+    Parameters:
+        squares (bytearray): piece code of each dark square
+        tables (MoveTables): move tables of the board size
+        start (int): starting square on the board
+        code (int): piece code of the jumping piece
+        jumped (set(int)): squares that have already been jumped over (not
+        modified)
+
+    Returns:
+        generator of list[int]: complete moves, each one a new list of the
+        squares the piece jumps to
+    """
+    jumped = set(jumped)
+    path = []
+    jumped_path = []
+    stack = [iter(single_jumps(squares, tables, start, code, jumped))]
+
+    while stack:
+        for pos, jumped_over in stack[-1]:
+            jumped.add(jumped_over)
+            jumped_path.append(jumped_over)
+            path.append(pos)
+
+            next_jumps = single_jumps(squares, tables, pos, code, jumped)
+            if next_jumps:
+                stack.append(iter(next_jumps))
+            else:
+                yield list(path)
+                jumped.discard(jumped_path.pop())
+                path.pop()
+            break
+
+        else:   # no more jumps from this square, go back up the tree
+            stack.pop()
+            if path:
+                jumped.discard(jumped_path.pop())
+                path.pop()
+
+def path_captures(tables: MoveTables, start: int,
+                  path: List[int]) -> Tuple[int, ...]:
+    """
+    Returns the squares captured by the move from the given square along the
+    given path.
+
+    Parameters:
+        tables (MoveTables): move tables of the board size
+        start (int): starting square of the move
+        path (list[int]): squares the piece moves to
+
+    Returns:
+        tuple(int, ...): captured squares, empty for a non-jump move
+    """
+    jumped_over = tables.jumped_over
+    if path[0] not in jumped_over[start]:
+        return ()
+    captures = []
+    current = start
+    for step in path:
+        captures.append(jumped_over[current][step])
+        current = step
+    return tuple(captures)
+
+class PieceIndex:
+    """
+    Class for storing the squares of one player's pieces with constant time
+    adding, removing and moving of pieces. Each piece keeps a slot for the
+    whole game, so pieces are always iterated over in the order they were
+    added in, and a captured piece leaves an empty slot that it can be put
+    back into when the capture is taken back. Slots and squares are stored
+    one per byte, so copying the index copies two small buffers.
+    """
+
+    #
+    # PRIVATE ATTRIBUTES
+    #
+
+    # square of the piece in each slot, or NO_SLOT for an empty slot
+    _slots: bytearray
+
+    # slot of the piece on each square, or NO_SLOT if there is no piece of
+    # the player on the square
+    _slot_of: bytearray
+
+    # number of pieces
+    _count: int
+
+    # value of an empty slot and of a square without a piece (boards have at
+    # most 200 dark squares and pieces)
+    NO_SLOT = 255
+
+    #
+    # PUBLIC METHODS
+    #
+
+    def __init__(self, nsquares: int):
         """
-        return self._color
+        Constructor
 
-    def is_king(self) -> bool:
+        Parameters:
+            nsquares (int): number of squares of the board
         """
-        Returns if the piece is a king or not.
-    
+        self._slots = bytearray()
+        self._slot_of = bytearray([PieceIndex.NO_SLOT]) * nsquares
+        self._count = 0
+
+    def __len__(self) -> int:
+        """
+        Returns the number of pieces.
+
         Parameters:
             None
-    
+
         Returns:
-            bool: returns True if the piece is a king, otherwise, returns False
+            int: number of pieces
         """
-        return self._king
-    
-    def promote(self) -> None:
+        return self._count
+
+    def __iter__(self):
         """
-        Promotes the piece to a king.
-    
+        Iterates over the squares of the pieces in slot order.
+
         Parameters:
             None
-    
+
         Returns:
-            None
+            iterator of int: squares of the pieces
         """
-        self._king = True
+        return (square for square in self._slots
+                if square != PieceIndex.NO_SLOT)
 
-class Board:
-    """
-    Class for representing a rectangular board.
-    """
+    def __contains__(self, square: int) -> bool:
+        """
+        Returns if there is a piece on the given square.
 
-    #
-    # PRIVATE ATTRIBUTES
-    #
-        
-    # the board itself
-    _grid: List[List[Optional[Piece]]]
+        Parameters:
+            square (int): square of the board
 
-    # number of rows and columns
-    _nrows: int
-    _ncols: int
-        
-    #
-    # PUBLIC METHODS
-    #
+        Returns:
+            bool: True if one of the pieces is on the square
+        """
+        return self._slot_of[square] != PieceIndex.NO_SLOT
 
-    def __init__(self, nrows: int, ncols: int):
+    def add(self, square: int) -> None:
         """
-        Constructor
+        Adds a piece on the given square in a new last slot.
 
         Parameters:
-            nrows (int): number of rows
-            ncols (int): number of columns
+            square (int): square of the piece
+
+        Returns:
+            None
         """
-        self._grid = [[None] * ncols for _ in range(nrows)]
-        self._nrows = nrows
-        self._ncols = ncols
+        self._slot_of[square] = len(self._slots)
+        self._slots.append(square)
+        self._count += 1
 
-    def get(self, coord: Tuple[int, int]) -> Optional[Piece]:
+    def remove(self, square: int) -> int:
         """
-        Gets the piece at the given location if there is one.
-    
+        Removes the piece on the given square, leaving its slot empty.
+
         Parameters:
-            coord (tuple(int, int)): location on the board
-        
+            square (int): square of the piece
+
         Raises:
-            ValueError: If the given location is not valid
-        
+            ValueError: If there is no piece on the square
+
         Returns:
-            Optional[Piece]: the piece at the location if there is one
+            int: slot the piece was in
         """
-        row, col = coord
-        if not 0 <= row < self._nrows or not 0 <= col < self._ncols:
-            raise ValueError("Invalid coordinates")
-        
-        return self._grid[row][col]
+        slot = self._slot_of[square]
+        if slot == PieceIndex.NO_SLOT:
+            raise ValueError("No piece on this square")
+        self._slots[slot] = PieceIndex.NO_SLOT
+        self._slot_of[square] = PieceIndex.NO_SLOT
+        self._count -= 1
+        return slot
 
-    def set(self, coord: Tuple[int, int], piece: Optional[Piece]) -> None:
+    def restore(self, square: int, slot: int) -> None:
         """
-        Sets the location on the board to the given piece.
+        Puts a removed piece back into its slot on the given square.
 
         Parameters:
-            coord (tuple (int, int)): location on the board
-            piece (Piece): given piece to be set
+            square (int): square of the piece
+            slot (int): slot returned when the piece was removed
 
-        Raises:
-            ValueError: If the given location is invalid
-    
         Returns:
             None
         """
-        row, col = coord
-        if not 0 <= row < self._nrows or not 0 <= col < self._ncols:
-            raise ValueError("Invalid coordinates")
+        self._slots[slot] = square
+        self._slot_of[square] = slot
+        self._count += 1
 
-        self._grid[row][col] = piece
-    
-    def remove(self, coord: Tuple[int, int]) -> None:
+    def move(self, start: int, end: int) -> None:
         """
-        Removes the piece at the given location.
+        Moves the piece on the start square to the end square, keeping its
+        slot.
+
+        Parameters:
+            start (int): square of the piece
+            end (int): square the piece moves to
 
-        Paramters:
-            coord (tuple (int, int)): location on the board
-    
-        Raises:
-            ValueError: If the given location is invalid or if there is not a
-            piece at the given location
-    
         Returns:
             None
         """
-        if self.get(coord) is None:
-            raise ValueError("No piece to remove at this coordinate")
-        
-        self.set(coord, None)
+        slot = self._slot_of[start]
+        self._slot_of[start] = PieceIndex.NO_SLOT
+        self._slot_of[end] = slot
+        self._slots[slot] = end
 
-    def move(self, start: Tuple[int, int], end: Tuple[int, int]) -> None:
+    def slot(self, square: int) -> int:
         """
-        Moves the pieces at the start location to the end location.
-    
+        Returns the slot of the piece on the given square.
+
         Parameters:
-            start (tuple (int, int)): initial location of piece to be moved
-            end (tuple (int, int)): final location of the piece
+            square (int): square of the piece
 
-        Raises:
-            ValueError: If there is no piece at the starting location or there
-            is already a piece at the final location
-    
         Returns:
-            None
+            int: slot of the piece, or -1 if there is no piece on the square
         """
-        if self.get(start) is None:
-            raise ValueError("No piece at the starting position")
-        
-        piece = self.get(start)
-        self.remove(start)
-        self.set(end, piece)
+        slot = self._slot_of[square]
+        if slot == PieceIndex.NO_SLOT:
+            return -1
+        return slot
 
-    def board_to_str(self) -> List[List[str]]:
+    def copy(self) -> "PieceIndex":
         """
-        Returns the board as a list of list of strings.
+        Returns an independent copy of the index.
 
         Parameters:
             None
-        
+
         Returns:
-            list[list[str]]: a list of list of strings with the same dimensions
-            as the board. In each row, the values in the list will be " " 
-            (no piece), "B" (black king piece), "b" (black non-king piece), "R"
-            (red king piece), "r" (red non-king piece).
+            PieceIndex: the copy
         """
-        str_grid = []
-        for row in self._grid:
-            new_row = []
-            for square in row:
-                if square is None:
-                    new_row.append(" ")
-                elif (square.get_color() == PieceColor.BLACK and
-                      square.is_king()):
-                    new_row.append("B")
-                elif (square.get_color() == PieceColor.BLACK and
-                      not square.is_king()):
-                    new_row.append("b")
-                elif (square.get_color() == PieceColor.RED and
-                      square.is_king()):
-                    new_row.append("R")
-                elif (square.get_color() == PieceColor.RED and
-                      not square.is_king()):
-                    new_row.append("r")
-            str_grid.append(new_row)
-        return str_grid
+        other = PieceIndex.__new__(PieceIndex)
+        other._slots = self._slots[:]
+        other._slot_of = self._slot_of[:]
+        other._count = self._count
+        return other
 
-    def get_num_rows(self) -> int:
+    def to_bytes(self) -> bytes:
         """
-        Returns the number of rows in the board.
+        Returns the slots of the index, one byte per slot.
 
         Parameters:
             None
-        
+
         Returns:
-            int: number of rows
+            bytes: square of the piece in each slot, or NO_SLOT
         """
-        return self._nrows
+        return bytes(self._slots)
 
-    def get_num_cols(self) -> int:
+    @classmethod
+    def from_bytes(cls, nsquares: int, data: bytes) -> "PieceIndex":
         """
-        Returns the number of columns in the board.
+        Builds an index from slots returned by to_bytes.
 
         Parameters:
-            None
-        
+            nsquares (int): number of squares of the board
+            data (bytes): square of the piece in each slot, or NO_SLOT
+
         Returns:
-            int: number of cols
+            PieceIndex: the index
         """
-        return self._ncols
+        pieces = cls(nsquares)
+        pieces._slots = bytearray(data)
+        for slot, square in enumerate(pieces._slots):
+            if square != cls.NO_SLOT:
+                pieces._slot_of[square] = slot
+                pieces._count += 1
+        return pieces
 
-class CheckersGame:
+class Move:
     """
-    Class for representing a game of checkers.    
+    Class for representing a complete move (a non-jump move or a whole jump
+    path) generated by CheckersGame.generate_moves. The starting square and
+    the squares the piece moves to are packed into a single integer key,
+    which moves are hashed and compared by, and the captured squares are kept
+    alongside it. Squares are indices of the dark squares of the board.
     """
 
+    __slots__ = ("_key", "_color", "_captures", "_coords", "_position_hash")
+
     #
     # PRIVATE ATTRIBUTES
     #
-    
-    # board of the game
-    _board: Board
 
-    # number of rows of pieces
-    _rows: int
+    # number of squares of the path, starting square and path squares, each
+    # in its own SQUARE_BITS bits from the lowest bits up
+    _key: int
 
-    # list of locations of pieces on the board
-    _black_piece_coords: List[Tuple[int, int]]
-    _red_piece_coords: List[Tuple[int, int]]
+    # color of the player making the move
+    _color: PieceColor
 
-    # location of piece that is in the middle of a jump
-    _jumping: Optional[Tuple[int, int]]
+    # squares of the captured pieces in the order they are captured
+    _captures: Tuple[int, ...]
 
-    # winner of the game if there is one
-    _winner: Optional[PieceColor]
+    # locations of the dark squares of the board, shared by all moves
+    _coords: List[Tuple[int, int]]
 
-    # True if a draw has been offered, otherwise False
-    _draw_offered: bool
+    # position hash of the game the move was generated in, or None if it is
+    # not known
+    _position_hash: Optional[int]
 
-    # number of moves since the last capture
-    _black_moves_since_capture: int
-    _red_moves_since_capture: int
+    # number of bits of each field of the key (enough for the 200 dark
+    # squares of a 20x20 board)
+    SQUARE_BITS = 8
 
     #
     # PUBLIC METHODS
     #
-    
-    def __init__(self, nrows: int):
+
+    def __init__(self, color: PieceColor, start: int, path: List[int],
+                 captures: Tuple[int, ...], coords: List[Tuple[int, int]],
+                 position_hash: Optional[int] = None):
         """
         Constructor
 
         Parameters:
-            nrows (int): number of rows of pieces each player begins the game
-            with
+            color (PieceColor): color of the player making the move
+            start (int): square of the piece to be moved
+            path (list[int]): squares the piece moves to
+            captures (tuple(int, ...)): squares of the captured pieces
+            coords (list[tuple(int, int)]): locations of the dark squares
+            position_hash (Optional[int]): position hash of the game the move
+            was generated in, if it is known
+        """
+        bits = Move.SQUARE_BITS
+        key = len(path) | start << bits
+        shift = 2 * bits
+        for square in path:
+            key |= square << shift
+            shift += bits
+        self._key = key
+        self._color = color
+        self._captures = captures
+        self._coords = coords
+        self._position_hash = position_hash
+
+    def __eq__(self, other: object) -> bool:
         """
-        self._board = Board(2 * nrows + 2, 2 * nrows + 2)
-        self._rows = nrows
-        self._black_piece_coords = []
-        self._red_piece_coords = []
-        self._jumping = None
-        self._winner = None
-        self._draw_offered = False
-        self._black_moves_since_capture = 0
-        self._red_moves_since_capture = 0
+        Returns if the other object is the same move of the same player.
 
-        self.setup()
+        Parameters:
+            other (object): object to compare with
 
-    def __str__(self) -> str:
+        Returns:
+            bool: True if the moves are equal
         """
-        Returns a basic string representation of the Game object's board.
+        return (isinstance(other, Move) and self._key == other._key and
+                self._color == other._color)
+
+    def __hash__(self) -> int:
+        """
+        Returns the hash of the move.
 
         Parameters:
             None
 
         Returns:
-            str: basic string representation fo the Game object's board
+            int: hash of the move
         """
-        board_string = ""
-        for row in self.board_to_str():
-            for cell in row:
-                board_string += cell
-            board_string += "\n"
-        return board_string
+        return self._key
 
-    def board_to_str(self) -> List[List[str]]:
+    def __repr__(self) -> str:
         """
-        Returns the game's board as a list of list of strings.
+        Returns a string representation of the move.
 
         Parameters:
             None
 
         Returns:
-            list[list(str)]: A list of lists with the same dimensions as the
-            board. In each row, the values in the list will be " " (no piece),
-            "B" (black king piece), "b" (black non-king piece), "R" (red kings
-            piece), "r" (red non-king piece).
+            str: the color, starting position and path of the move
         """
-        return self._board.board_to_str()
+        return f"Move({self._color.name}, {self.get_start()}, " \
+               f"{self.get_path()})"
 
-    def setup(self) -> None:
+    def get_key(self) -> int:
         """
-        Creates the board of the correct size and places the pieces on the
-        correct squares of the board. Black pieces will be placed on the first n
-        rows of the board and red pieces will be placed on the last n rows of
-        the board.
+        Returns the packed starting square and path of the move.
 
         Parameters:
             None
+
+        Returns:
+            int: key of the move
+        """
+        return self._key
+
+    def get_color(self) -> PieceColor:
+        """
+        Returns the color of the player making the move.
+
+        Parameters:
+            None
+
+        Returns:
+            PieceColor: player color
+        """
+        return self._color
+
+    def get_start_square(self) -> int:
+        """
+        Returns the square of the piece to be moved.
+
+        Parameters:
+            None
+
+        Returns:
+            int: starting square
+        """
+        return (self._key >> Move.SQUARE_BITS) & ((1 << Move.SQUARE_BITS) - 1)
+
+    def get_path_squares(self) -> List[int]:
+        """
+        Returns the squares the piece moves to.
+
+        Parameters:
+            None
+
+        Returns:
+            list[int]: squares of the path
+        """
+        bits = Move.SQUARE_BITS
+        mask = (1 << bits) - 1
+        key = self._key
+        return [(key >> (bits * i)) & mask for i in range(2, (key & mask) + 2)]
+
+    def get_captures(self) -> Tuple[int, ...]:
+        """
+        Returns the squares of the pieces captured by the move.
+
+        Parameters:
+            None
+
+        Returns:
+            tuple(int, ...): captured squares, empty for a non-jump move
+        """
+        return self._captures
+
+    def get_start(self) -> Tuple[int, int]:
+        """
+        Returns the position of the piece to be moved.
+
+        Parameters:
+            None
+
+        Returns:
+            tuple(int, int): starting position
+        """
+        return self._coords[self.get_start_square()]
+
+    def get_end(self) -> Tuple[int, int]:
+        """
+        Returns the position the piece ends the move on.
+
+        Parameters:
+            None
+
+        Returns:
+            tuple(int, int): final position
+        """
+        return self._coords[self.get_path_squares()[-1]]
+
+    def get_path(self) -> List[Tuple[int, int]]:
+        """
+        Returns the positions the piece moves to.
+
+        Parameters:
+            None
+
+        Returns:
+            list[tuple(int, int)]: positions of the path
+        """
+        return [self._coords[square] for square in self.get_path_squares()]
+
+    def get_position_hash(self) -> Optional[int]:
+        """
+        Returns the position hash of the game the move was generated in.
+
+        Parameters:
+            None
+
+        Returns:
+            Optional[int]: position hash, or None if it is not known
+        """
+        return self._position_hash
+
+class MoveEvent:
+    """
+    Class describing what a move played with CheckersGame.move or
+    CheckersGame.play changed, passed to the game's listeners.
+    """
+
+    #
+    # PUBLIC ATTRIBUTES
+    #
+
+    # color of the player who moved
+    color: PieceColor
+
+    # positions the moving piece left and arrived on
+    vacated: List[Tuple[int, int]]
+    occupied: List[Tuple[int, int]]
+
+    # positions of the pieces captured by the move, which are now empty
+    captured: List[Tuple[int, int]]
+
+    # position of the piece if it was promoted to a king, otherwise None
+    promoted: Optional[Tuple[int, int]]
+
+    # True if the player's turn is over (no jump left to continue)
+    turn_complete: bool
+
+    # winner of the game if the move ended it, otherwise None
+    winner: Optional[PieceColor]
+
+    #
+    # PUBLIC METHODS
+    #
+
+    def __init__(self, color: PieceColor, vacated: List[Tuple[int, int]],
+                 occupied: List[Tuple[int, int]],
+                 captured: List[Tuple[int, int]],
+                 promoted: Optional[Tuple[int, int]], turn_complete: bool,
+                 winner: Optional[PieceColor]):
+        """
+        Constructor
+
+        Parameters:
+            color (PieceColor): color of the player who moved
+            vacated (list[tuple(int, int)]): positions the piece left
+            occupied (list[tuple(int, int)]): positions the piece arrived on
+            captured (list[tuple(int, int)]): positions of captured pieces
+            promoted (Optional[tuple(int, int)]): position of the promoted
+            piece, if there is one
+            turn_complete (bool): if the player's turn is over
+            winner (Optional[PieceColor]): winner of the game, if it is over
+        """
+        self.color = color
+        self.vacated = vacated
+        self.occupied = occupied
+        self.captured = captured
+        self.promoted = promoted
+        self.turn_complete = turn_complete
+        self.winner = winner
+
+    def changed_squares(self) -> List[Tuple[int, int]]:
+        """
+        Returns all the positions whose contents changed.
+
+        Parameters:
+            None
+
+        Returns:
+            list[tuple(int, int)]: vacated, captured and occupied positions
+        """
+        return self.vacated + self.captured + self.occupied
+
+class Piece:
+    """
+    Class for representing a piece. The board stores pieces as piece codes,
+    so a Piece is a snapshot of the piece on a square for code that wants an
+    object, and changing it does not change the board.
+    """
+
+    #
+    # PRIVATE ATTRIBUTES
+    #
+
+    # color of the piece
+    _color: PieceColor
+
+    # if the piece is a king
+    _king: bool
+
+    #
+    # PUBLIC METHODS
+    #
+
+    def __init__(self, color: PieceColor):
+        """
+        Constructor
+
+        Parameters:
+            color (PieceColor): color of the piece
+        """
+        self._color = color
+        self._king = False
+
+    def get_color(self) -> PieceColor:
+        """
+        Gets the color of the piece.
+
+        Parameters:
+            None
+
+        Returns:
+            PieceColor: color of the given piece
+        """
+        return self._color
+
+    def is_king(self) -> bool:
+        """
+        Returns if the piece is a king or not.
+
+        Parameters:
+            None
+
+        Returns:
+            bool: returns True if the piece is a king, otherwise, returns False
+        """
+        return self._king
+
+    def promote(self) -> None:
+        """
+        Promotes the piece to a king.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        self._king = True
+
+    def get_code(self) -> int:
+        """
+        Returns the piece code of the piece, as stored on the board.
+
+        Parameters:
+            None
+
+        Returns:
+            int: piece code
+        """
+        code = _COLOR_CODES[self._color]
+        if self._king:
+            code |= KING
+        return code
+
+    @classmethod
+    def from_code(cls, code: int) -> Optional["Piece"]:
+        """
+        Returns a new piece for the given piece code.
+
+        Parameters:
+            code (int): piece code
+
+        Returns:
+            Optional[Piece]: the piece, or None for the empty code
+        """
+        if code == EMPTY:
+            return None
+        piece = cls(_CODE_COLORS[code & 3])
+        if code & KING:
+            piece.promote()
+        return piece
+
+class Board:
+    """
+    Class for representing a rectangular board. Only the dark squares can hold
+    pieces, and they are stored as one byte per square holding its piece code.
+    """
+
+    #
+    # PRIVATE ATTRIBUTES
+    #
+
+    # piece codes of the dark squares in row-major order
+    _squares: bytearray
+
+    # square index of each dark square location
+    _index: Dict[Tuple[int, int], int]
+
+    # number of rows and columns
+    _nrows: int
+    _ncols: int
+
+    #
+    # PUBLIC METHODS
+    #
+
+    def __init__(self, nrows: int, ncols: int):
+        """
+        Constructor
+
+        Parameters:
+            nrows (int): number of rows
+            ncols (int): number of columns
+        """
+        self._index = {}
+        for r in range(nrows):
+            for c in range(ncols):
+                if r % 2 != c % 2:
+                    self._index[(r, c)] = len(self._index)
+        self._squares = bytearray(len(self._index))
+        self._nrows = nrows
+        self._ncols = ncols
+
+    def get(self, coord: Tuple[int, int]) -> Optional[Piece]:
+        """
+        Gets the piece at the given location if there is one.
+
+        Parameters:
+            coord (tuple(int, int)): location on the board
+
+        Raises:
+            ValueError: If the given location is not valid
+
+        Returns:
+            Optional[Piece]: a copy of the piece at the location if there is
+            one
+        """
+        row, col = coord
+        if not 0 <= row < self._nrows or not 0 <= col < self._ncols:
+            raise ValueError("Invalid coordinates")
+
+        index = self._index.get(coord)
+        if index is None:
+            return None
+        return Piece.from_code(self._squares[index])
+
+    def set(self, coord: Tuple[int, int], piece: Optional[Piece]) -> None:
+        """
+        Sets the location on the board to the given piece.
+
+        Parameters:
+            coord (tuple (int, int)): location on the board
+            piece (Piece): given piece to be set
+
+        Raises:
+            ValueError: If the given location is invalid or a piece is placed
+            on a light square
+
+        Returns:
+            None
+        """
+        row, col = coord
+        if not 0 <= row < self._nrows or not 0 <= col < self._ncols:
+            raise ValueError("Invalid coordinates")
+
+        index = self._index.get(coord)
+        if index is None:
+            if piece is not None:
+                raise ValueError("Pieces can only be placed on dark squares")
+            return
+        self._squares[index] = EMPTY if piece is None else piece.get_code()
+
+    def remove(self, coord: Tuple[int, int]) -> None:
+        """
+        Removes the piece at the given location.
+
+        Paramters:
+            coord (tuple (int, int)): location on the board
+
+        Raises:
+            ValueError: If the given location is invalid or if there is not a
+            piece at the given location
+
+        Returns:
+            None
+        """
+        if self.get(coord) is None:
+            raise ValueError("No piece to remove at this coordinate")
+
+        self.set(coord, None)
+
+    def move(self, start: Tuple[int, int], end: Tuple[int, int]) -> None:
+        """
+        Moves the pieces at the start location to the end location.
+
+        Parameters:
+            start (tuple (int, int)): initial location of piece to be moved
+            end (tuple (int, int)): final location of the piece
+
+        Raises:
+            ValueError: If there is no piece at the starting location or there
+            is already a piece at the final location
+
+        Returns:
+            None
+        """
+        if self.get(start) is None:
+            raise ValueError("No piece at the starting position")
+
+        piece = self.get(start)
+        self.remove(start)
+        self.set(end, piece)
+
+    def board_to_str(self) -> List[List[str]]:
+        """
+        Returns the board as a list of list of strings.
+
+        Parameters:
+            None
+
+        Returns:
+            list[list[str]]: a list of list of strings with the same dimensions
+            as the board. In each row, the values in the list will be " "
+            (no piece), "B" (black king piece), "b" (black non-king piece), "R"
+            (red king piece), "r" (red non-king piece).
+        """
+        str_grid = [[" "] * self._ncols for _ in range(self._nrows)]
+        squares = self._squares
+        for (r, c), index in self._index.items():
+            str_grid[r][c] = _CODE_CHARS[squares[index]]
+        return str_grid
+
+    def get_num_rows(self) -> int:
+        """
+        Returns the number of rows in the board.
+
+        Parameters:
+            None
+
+        Returns:
+            int: number of rows
+        """
+        return self._nrows
+
+    def get_num_cols(self) -> int:
+        """
+        Returns the number of columns in the board.
+
+        Parameters:
+            None
+
+        Returns:
+            int: number of cols
+        """
+        return self._ncols
+
+    def copy(self) -> "Board":
+        """
+        Returns an independent copy of the board.
+
+        Parameters:
+            None
+
+        Returns:
+            Board: the copy
+        """
+        board = Board.__new__(Board)
+        board._squares = self._squares[:]
+        board._index = self._index
+        board._nrows = self._nrows
+        board._ncols = self._ncols
+        return board
+
+    def get_squares(self) -> bytearray:
+        """
+        Returns the piece codes of the dark squares in row-major order. The
+        buffer is the board's own storage, so changes to it change the board.
+
+        Parameters:
+            None
+
+        Returns:
+            bytearray: piece code of each dark square
+        """
+        return self._squares
+
+class CheckersGame:
+    """
+    Class for representing a game of checkers.
+    """
+
+    #
+    # PRIVATE ATTRIBUTES
+    #
+
+    # board of the game
+    _board: Board
+
+    # piece codes of the dark squares, shared with the board
+    _squares: bytearray
+
+    # number of rows of pieces
+    _rows: int
+
+    # squares of the pieces of each player
+    _black_pieces: PieceIndex
+    _red_pieces: PieceIndex
+
+    # squares of the pieces of each player that can capture
+    _black_captures: Set[int]
+    _red_captures: Set[int]
+
+    # squares that changed since the capture sets were last updated
+    _capture_dirty: List[int]
+
+    # square of piece that is in the middle of a jump
+    _jumping: Optional[int]
+
+    # winner of the game if there is one
+    _winner: Optional[PieceColor]
+
+    # True if a draw has been offered, otherwise False
+    _draw_offered: bool
+
+    # number of moves since the last capture
+    _black_moves_since_capture: int
+    _red_moves_since_capture: int
+
+    # player whose turn it is
+    _turn: PieceColor
+
+    # hash keys of the board size and hash of the current position
+    _keys: ZobristKeys
+    _hash: int
+
+    # step and jump destinations of the board size
+    _tables: MoveTables
+
+    # True if the hash should be checked against a full recomputation after
+    # every move
+    _check_hash: bool
+
+    # number of pieces on the board of each piece code
+    _counts: List[int]
+
+    # version of the position, increased every time the pieces or the jumping
+    # piece change
+    _version: int
+
+    # valid moves of each player in the position with the version below:
+    # the moves are found once as starting squares and paths of squares, and
+    # the Move values of generate_moves and the dictionary of
+    # player_valid_moves are built from them
+    _square_moves_cache: Dict[PieceColor, List[Tuple[int, List[int]]]]
+    _move_list_cache: Dict[PieceColor, List[Move]]
+    _moves_cache: Dict[PieceColor, Dict[Tuple[int, int],
+                                        List[List[Tuple[int, int]]]]]
+    _legal_keys: Dict[PieceColor, Set[int]]
+    _moves_cache_version: int
+
+    # number of valid move queries answered from and missing the cache
+    _moves_cache_hits: int
+    _moves_cache_misses: int
+
+    # functions called with a MoveEvent after every move or play
+    _listeners: List[Callable[[MoveEvent], None]]
+
+    # last board_to_str snapshot, the board it was made from, a mutable copy
+    # of its rows and the version of the position it was made for
+    _str_snapshot: Tuple[Tuple[str, ...], ...]
+    _str_squares: bytes
+    _str_rows: List[List[str]]
+    _str_version: int
+
+    # squares changed by move and play since the last board_to_str snapshot,
+    # valid only while the version below is the version of the position
+    _str_changed: List[int]
+    _str_changed_version: int
+
+    # last snapshot returned by snapshot, reused while the game is unchanged
+    _snapshot: Optional["GameSnapshot"]
+
+    #
+    # PUBLIC METHODS
+    #
+
+    def __init__(self, nrows: int, check_hash: bool = False):
+        """
+        Constructor
+
+        Parameters:
+            nrows (int): number of rows of pieces each player begins the game
+            with
+            check_hash (bool): if True, the position hash is checked against a
+            full recomputation after every move (for debugging)
+        """
+        self._board = Board(2 * nrows + 2, 2 * nrows + 2)
+        self._squares = self._board.get_squares()
+        self._keys = get_zobrist_keys(2 * nrows + 2)
+        self._tables = get_move_tables(2 * nrows + 2)
+        self._check_hash = check_hash
+        self._rows = nrows
+        self._black_pieces = PieceIndex(len(self._tables.coords))
+        self._red_pieces = PieceIndex(len(self._tables.coords))
+        self._black_captures = set()
+        self._red_captures = set()
+        self._capture_dirty = []
+        self._jumping = None
+        self._winner = None
+        self._draw_offered = False
+        self._black_moves_since_capture = 0
+        self._red_moves_since_capture = 0
+        self._version = 0
+        self._moves_cache = {}
+        self._square_moves_cache = {}
+        self._move_list_cache = {}
+        self._legal_keys = {}
+        self._moves_cache_version = -1
+        self._moves_cache_hits = 0
+        self._moves_cache_misses = 0
+        size = 2 * nrows + 2
+        self._str_rows = [[" "] * size for _ in range(size)]
+        self._str_snapshot = tuple(tuple(row) for row in self._str_rows)
+        self._str_squares = bytes(len(self._squares))
+        self._str_version = -1
+        self._str_changed = []
+        self._str_changed_version = -1
+        self._listeners = []
+        self._snapshot = None
+
+        self.setup()
+
+    def __getstate__(self) -> bytes:
+        """
+        Returns the game as a compact bytes value for pickling: the pieces,
+        the order of each player's pieces, the jumping piece, the moves since
+        capture counters, the winner and the player to move.
+
+        Parameters:
+            None
+
+        Returns:
+            bytes: the state of the game
+        """
+        black = self._black_pieces.to_bytes()
+        red = self._red_pieces.to_bytes()
+        winner = 0 if self._winner is None else self._winner.value
+        jumping = _NO_JUMPING if self._jumping is None else self._jumping
+        header = _STATE_HEADER.pack(self._rows, winner, self._turn.value,
+                                    self._draw_offered, self._check_hash,
+                                    jumping, self._black_moves_since_capture,
+                                    self._red_moves_since_capture, len(black),
+                                    len(red))
+        return header + bytes(self._squares) + black + red
+
+    def __setstate__(self, state: bytes) -> None:
+        """
+        Restores a game from a value returned by __getstate__.
+
+        Parameters:
+            state (bytes): the state of the game
+
+        Returns:
+            None
+        """
+        (rows, winner, turn, draw_offered, check_hash, jumping,
+         black_moves_since_capture, red_moves_since_capture, black_len,
+         red_len) = _STATE_HEADER.unpack_from(state)
+        self.__init__(rows, bool(check_hash))
+
+        nsquares = len(self._squares)
+        offset = _STATE_HEADER.size
+        self._squares[:] = state[offset: offset + nsquares]
+        offset += nsquares
+        self._black_pieces = PieceIndex.from_bytes(
+            nsquares, state[offset: offset + black_len])
+        offset += black_len
+        self._red_pieces = PieceIndex.from_bytes(
+            nsquares, state[offset: offset + red_len])
+
+        self._winner = None if winner == 0 else PieceColor(winner)
+        self._turn = PieceColor(turn)
+        self._draw_offered = bool(draw_offered)
+        self._jumping = None if jumping == _NO_JUMPING else jumping
+        self._black_moves_since_capture = black_moves_since_capture
+        self._red_moves_since_capture = red_moves_since_capture
+        self._rebuild_derived_state()
+
+    def to_fen(self) -> str:
+        """
+        Returns the position in a compact text notation that from_fen reads
+        back. The fields, separated by colons, are the player to move ("B" or
+        "R"), "B" followed by the black pieces, "R" followed by the red
+        pieces, the board size, the jumping piece ("-" if there is none) and
+        the black and red moves since capture counters. Pieces are given by
+        square number (1 is the first dark square of the first row, counting
+        along the rows) with "K" in front of kings, for example
+        "B:B1,2,K3:R21,22:8:-:0:0". Pieces are listed in square order, so the
+        same position always gives the same string.
+
+        Parameters:
+            None
+
+        Returns:
+            str: the position
+        """
+        black = []
+        red = []
+        for square, code in enumerate(self._squares):
+            if code:
+                name = str(square + 1)
+                if code & KING:
+                    name = "K" + name
+                if code & BLACK_MAN:
+                    black.append(name)
+                else:
+                    red.append(name)
+
+        turn = "B" if self._turn == PieceColor.BLACK else "R"
+        jumping = "-" if self._jumping is None else str(self._jumping + 1)
+        return ":".join([turn, "B" + ",".join(black), "R" + ",".join(red),
+                         str(self._board.get_num_rows()), jumping,
+                         str(self._black_moves_since_capture),
+                         str(self._red_moves_since_capture)])
+
+    @classmethod
+    def from_fen(cls, fen: str, check_hash: bool = False) -> "CheckersGame":
+        """
+        Creates a game in the position given in the notation of to_fen. The
+        pieces are written straight into the board, in the order they are
+        listed in. If the player to move cannot move the game is won by the
+        other player.
+
+        Parameters:
+            fen (str): the position
+            check_hash (bool): if True, the position hash is checked against a
+            full recomputation after every move (for debugging)
+
+        Raises:
+            ValueError: If the string is not a valid position
+
+        Returns:
+            CheckersGame: the game
+        """
+        fields = fen.strip().split(":")
+        if (len(fields) != 7 or fields[0] not in ("B", "R") or
+                not fields[1].startswith("B") or
+                not fields[2].startswith("R")):
+            raise ValueError("Invalid FEN")
+
+        try:
+            size = int(fields[3])
+            jumping = None if fields[4] == "-" else int(fields[4]) - 1
+            black_moves_since_capture = int(fields[5])
+            red_moves_since_capture = int(fields[6])
+        except ValueError:
+            raise ValueError("Invalid FEN") from None
+        if not _MIN_SIZE <= size <= _MAX_SIZE or size % 2 != 0:
+            raise ValueError("Invalid FEN")
+        if not (0 <= black_moves_since_capture <= _MAX_MOVES_SINCE_CAPTURE and
+                0 <= red_moves_since_capture <= _MAX_MOVES_SINCE_CAPTURE):
+            raise ValueError("Invalid FEN")
+
+        game = cls((size - 2) // 2, check_hash)
+        squares = game._squares
+        nsquares = len(squares)
+        squares[:] = bytes(nsquares)
+        game._black_pieces = PieceIndex(nsquares)
+        game._red_pieces = PieceIndex(nsquares)
+
+        for names, pieces, man in ((fields[1][1:], game._black_pieces,
+                                    BLACK_MAN),
+                                   (fields[2][1:], game._red_pieces,
+                                    RED_MAN)):
+            if not names:
+                continue
+            for name in names.split(","):
+                code = man
+                if name.startswith("K"):
+                    code |= KING
+                    name = name[1:]
+                if not name.isdigit():
+                    raise ValueError("Invalid FEN")
+                square = int(name) - 1
+                if not 0 <= square < nsquares or squares[square]:
+                    raise ValueError("Invalid FEN")
+                squares[square] = code
+                pieces.add(square)
+
+        turn = PieceColor.BLACK if fields[0] == "B" else PieceColor.RED
+        # the jumping piece has to be a piece of the player to move
+        if jumping is not None and not (
+                0 <= jumping < nsquares and
+                squares[jumping] & _COLOR_CODES[turn]):
+            raise ValueError("Invalid FEN")
+
+        game._turn = turn
+        game._jumping = jumping
+        game._black_moves_since_capture = black_moves_since_capture
+        game._red_moves_since_capture = red_moves_since_capture
+        game._rebuild_derived_state()
+        if jumping is None:
+            game._update_winner(game._opponent(game._turn))
+        return game
+
+    def position(self) -> "Position":
+        """
+        Returns the current position as an immutable Position value.
+
+        Parameters:
+            None
+
+        Returns:
+            Position: the position
+        """
+        return Position.from_game(self)
+
+    def snapshot(self) -> "GameSnapshot":
+        """
+        Returns a read-only snapshot of the game that can be handed to other
+        threads while this game keeps being played. The snapshot only holds
+        immutable copies of the piece codes and of the slots of each player's
+        PieceIndex, which are copied as whole buffers without looking at the
+        pieces, and its position is only hashed if it is used as a key. The
+        same snapshot is returned until the position or the winner changes.
+
+        Parameters:
+            None
+
+        Returns:
+            GameSnapshot: snapshot of the current game
+        """
+        snapshot = self._snapshot
+        if (snapshot is None or snapshot._version != self._version or
+                snapshot._winner != self._winner):
+            snapshot = GameSnapshot(self.position(), self._winner,
+                                    self._version,
+                                    self._black_pieces.to_bytes(),
+                                    self._red_pieces.to_bytes())
+            self._snapshot = snapshot
+        return snapshot
+
+    def clone(self) -> "CheckersGame":
+        """
+        Returns an independent copy of the game. The board and the piece
+        indices are copied as buffers and the tables and hash keys of the
+        board size are shared, so this is much cheaper than a deep copy.
+
+        Parameters:
+            None
+
+        Returns:
+            CheckersGame: the copy
+        """
+        game = CheckersGame.__new__(CheckersGame)
+        game.__dict__.update(self.__dict__)
+        game._board = self._board.copy()
+        game._squares = game._board.get_squares()
+        game._black_pieces = self._black_pieces.copy()
+        game._red_pieces = self._red_pieces.copy()
+        game._black_captures = set(self._black_captures)
+        game._red_captures = set(self._red_captures)
+        game._capture_dirty = list(self._capture_dirty)
+        game._counts = list(self._counts)
+        game._moves_cache = {}
+        game._square_moves_cache = {}
+        game._move_list_cache = {}
+        game._legal_keys = {}
+        game._moves_cache_version = -1
+        game._moves_cache_hits = 0
+        game._moves_cache_misses = 0
+        game._str_rows = [list(row) for row in self._str_rows]
+        game._str_changed = list(self._str_changed)
+        game._listeners = []
+        return game
+
+    def __str__(self) -> str:
+        """
+        Returns a basic string representation of the Game object's board.
+
+        Parameters:
+            None
+
+        Returns:
+            str: basic string representation fo the Game object's board
+        """
+        board_string = ""
+        for row in self.board_to_str():
+            for cell in row:
+                board_string += cell
+            board_string += "\n"
+        return board_string
+
+    def board_to_str(self) -> Tuple[Tuple[str, ...], ...]:
+        """
+        Returns the game's board as a tuple of tuples of strings. The snapshot
+        is kept until the position changes, and then only the squares that
+        changed since the last snapshot are updated, so calling this on every
+        redraw is cheap. Rows that did not change are shared between
+        snapshots. After moves played with move or play, the changed squares
+        are the ones the moves recorded; after any other change they are
+        found by comparing the boards as integers, so no Python loop runs
+        over the unchanged squares.
+
+        Parameters:
+            None
+
+        Returns:
+            tuple(tuple(str)): A tuple of rows with the same dimensions as the
+            board. In each row, the values will be " " (no piece), "B" (black
+            king piece), "b" (black non-king piece), "R" (red kings piece), "r"
+            (red non-king piece).
+        """
+        if self._str_version != self._version:
+            squares = self._squares
+            if self._str_changed_version == self._version:
+                changed = self._str_changed
+            else:
+                changed = self._changed_squares(self._str_squares, squares)
+
+            coords = self._tables.coords
+            rows = self._str_rows
+            changed_rows = set()
+            for square in changed:
+                row, col = coords[square]
+                rows[row][col] = _CODE_CHARS[squares[square]]
+                changed_rows.add(row)
+
+            if changed_rows:
+                snapshot = list(self._str_snapshot)
+                for row in changed_rows:
+                    snapshot[row] = tuple(rows[row])
+                self._str_snapshot = tuple(snapshot)
+            self._str_squares = bytes(squares)
+            self._str_version = self._version
+            self._str_changed = []
+            self._str_changed_version = self._version
+        return self._str_snapshot
+
+    def setup(self) -> None:
+        """
+        Creates the board of the correct size and places the pieces on the
+        correct squares of the board. Black pieces will be placed on the first n
+        rows of the board and red pieces will be placed on the last n rows of
+        the board.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        height = self._board.get_num_rows()
+
+        # reset instance variables
+        self._black_pieces = PieceIndex(len(self._tables.coords))
+        self._red_pieces = PieceIndex(len(self._tables.coords))
+        self._winner = None
+        self._jumping = None
+        self._black_moves_since_capture = 0
+        self._red_moves_since_capture = 0
+        self._turn = PieceColor.BLACK
+        self._version += 1
+        self._counts = [0] * len(_CODE_CHARS)
+
+        for square, (r, _) in enumerate(self._tables.coords):
+            if r < self._rows:
+                self._black_pieces.add(square)
+                self._squares[square] = BLACK_MAN
+            elif r >= height - self._rows:
+                self._red_pieces.add(square)
+                self._squares[square] = RED_MAN
+            else:
+                self._squares[square] = EMPTY
+
+        self._counts[BLACK_MAN] = len(self._black_pieces)
+        self._counts[RED_MAN] = len(self._red_pieces)
+        self._hash = self._compute_hash()
+        self._black_captures = set()
+        self._red_captures = set()
+        self._capture_dirty = list(range(len(self._tables.coords)))
+
+    def move(self, color: PieceColor, start: Tuple[int, int],
+            end: Tuple[int, int]) -> None:
+        """
+        Player of the given color inputs a position of a piece and a location to
+        move the piece to. If the given move is valid, the move will be
+        executed. Otherwise, the player wll be prompted to input a different
+        move.
+
+        Parameters:
+            color (PieceColor): player color
+            start: the position of piece to be moved
+            end (tuple(int, int)): destination position
+
+        Raises:
+            Value if index is not on the board or the selected move is invalid
+
+        Returns:
+            None
+        """
+        if not self.is_valid_move(color, start, end):
+            raise ValueError("Invalid move")
+
+        paths = self.player_valid_moves(color)[start]
+        index = self._tables.index
+        start_square = index[start]
+        end_square = index[end]
+        code = self._squares[start_square]
+        steps = [end_square]
+        version = self._version
+        self._version += 1
+
+        if abs(paths[0][0][0] - start[0]) == 2:   # jump move
+            for move in paths:
+                if end in move:
+                    if end == move[-1]: # complete jump move
+                        self._set_jumping(None)
+                    else:   # incomplete jump move
+                        self._set_jumping(end_square)
+
+                    steps = [index[step] for step in
+                             move[: move.index(end) + 1]]
+                    current = start_square
+                    for step in steps:
+                        self._piece_jump_to(current, step)
+                        current = step
+                    break
+
+            # reset moves since last capture counter
+            if color == PieceColor.BLACK:
+                self._black_moves_since_capture = 0
+            elif color == PieceColor.RED:
+                self._red_moves_since_capture = 0
+
+        else:   # non-jump move
+            self._piece_move_to(start_square, end_square)
+            self._set_jumping(None)
+
+            # increment moves since last capture counter by 1
+            if color == PieceColor.BLACK:
+                self._black_moves_since_capture += 1
+            elif color == PieceColor.RED:
+                self._red_moves_since_capture += 1
+
+        # check for promotion
+        self._check_promote(end_square)
+
+        # update winner after complete player turn
+        if not self.turn_incomplete():
+            self._set_turn(self._opponent(color))
+            self._update_winner(color)
+        else:
+            self._set_turn(color)
+
+        if self._check_hash:
+            self._verify_hash()
+
+        captures = path_captures(self._tables, start_square, steps)
+        self._note_changed(version, start_square, end_square, captures)
+        if self._listeners:
+            self._emit_move(color, start_square, end_square, captures,
+                            self._squares[end_square] != code)
+
+    def make_move(self, color: PieceColor, start: Tuple[int, int],
+                  path: List[Tuple[int, int]]) -> MoveRecord:
+        """
+        Plays a complete move (a non-jump move or a whole jump path) without
+        checking that it is valid and returns a record that can be passed to
+        unmake_move to take it back. This is meant for searching through
+        moves returned by player_valid_moves on a single game object.
+
+        Parameters:
+            color (PieceColor): player color
+            start (tuple(int, int)): position of the piece to be moved
+            path (list[tuple(int, int)]): squares the piece moves to
+
+        Returns:
+            MoveRecord: record needed to undo the move
+        """
+        index = self._tables.index
+        return self._make_move(color, index[start],
+                               [index[step] for step in path])
+
+    def apply_move(self, move: Move) -> MoveRecord:
+        """
+        Plays a move returned by generate_moves without checking that it is
+        still valid and returns a record that can be passed to unmake_move to
+        take it back. This is the fastest way to play moves during a search.
+
+        Parameters:
+            move (Move): move to be played
+
+        Returns:
+            MoveRecord: record needed to undo the move
+        """
+        return self._make_move(move.get_color(), move.get_start_square(),
+                               move.get_path_squares())
+
+    def play(self, move: Move) -> None:
+        """
+        Plays a complete move returned by generate_moves. Moves generated in
+        a position with the current position hash (such as the move a bot
+        chose after searching on this game) are trusted without being
+        validated again, and any other move is checked against the valid
+        moves of the position.
+
+        Parameters:
+            move (Move): move to be played
+
+        Raises:
+            ValueError: If the move is not valid in the current position
+
+        Returns:
+            None
+        """
+        color = move.get_color()
+        if move.get_position_hash() != self._hash:
+            self._sync_moves_cache()
+            legal = self._legal_keys.get(color)
+            if legal is None:
+                legal = {valid.get_key()
+                         for valid in self.generate_moves(color)}
+                self._legal_keys[color] = legal
+            if move.get_key() not in legal:
+                raise ValueError("Invalid move")
+
+        start = move.get_start_square()
+        path = move.get_path_squares()
+        code = self._squares[start]
+        version = self._version
+        self._make_move(color, start, path)
+
+        self._note_changed(version, start, path[-1], move.get_captures())
+        if self._listeners:
+            self._emit_move(color, start, path[-1], move.get_captures(),
+                            self._squares[path[-1]] != code)
+
+    def unmake_move(self, record: MoveRecord) -> None:
+        """
+        Takes back a move played with make_move or apply_move. Moves must be
+        taken back in the reverse order they were made in.
+
+        Parameters:
+            record (MoveRecord): record returned by make_move or apply_move
+
+        Returns:
+            None
+        """
+        (start, end, captured, promoted, self._jumping,
+         self._black_moves_since_capture, self._red_moves_since_capture,
+         self._winner, self._turn, self._hash) = record
+        self._version += 1
+
+        squares = self._squares
+        code = squares[end]
+        if code & BLACK_MAN:
+            own, other = self._black_pieces, self._red_pieces
+        else:
+            own, other = self._red_pieces, self._black_pieces
+
+        if promoted:
+            self._counts[code] -= 1
+            code &= ~KING
+            self._counts[code] += 1
+        squares[end] = EMPTY
+        squares[start] = code
+        own.move(end, start)
+        self._capture_dirty += (start, end)
+
+        for square, captured_code, slot in reversed(captured):
+            squares[square] = captured_code
+            self._counts[captured_code] += 1
+            other.restore(square, slot)
+            self._capture_dirty.append(square)
+
+        if self._check_hash:
+            self._verify_hash()
+
+    def player_valid_moves(self,
+                           color: PieceColor) -> Dict[Optional[Tuple[int, int]],
+                                                   List[List[Tuple[int, int]]]]:
+        """
+        Returns all the complete valid moves (jumps or non-jump moves) for all
+        the available specified colored pieces.
+
+        Pieces are listed in the order of their slots in the player's
+        PieceIndex: the order they were set up in, with a moved piece keeping
+        its place. (Before PieceIndex, a moved piece went to the end of the
+        order.) The order decides which of several equally good moves the
+        bots choose, and which piece randomBot picks for a given seed.
+
+        Parameters:
+            color (PieceColor): player's color
+
+        Returns:
+            dict{tuple(int, int): list[list[tuple(int, int)]]}: dictionary of
+            all the complete valid moves the player of the given color can make
+            where the keys are the coordinates of a piece that can be moved and
+            the values are the list of complete valid moves the player can make
+            with each piece. The dictionary is shared with later calls for the
+            same position and must not be modified.
+        """
+        self._sync_moves_cache()
+
+        moves = self._moves_cache.get(color)
+        if moves is not None:
+            self._moves_cache_hits += 1
+            return moves
+
+        moves = {}
+        coords = self._tables.coords
+        for start, path in self._square_moves(color):
+            start = coords[start]
+            path = [coords[step] for step in path]
+            paths = moves.get(start)
+            if paths is None:
+                moves[start] = [path]
+            else:
+                paths.append(path)
+        self._moves_cache[color] = moves
+        return moves
+
+    def iter_moves(self, color: PieceColor):
+        """
+        Yields the complete valid moves of the player of the given color one
+        at a time, in the same order as player_valid_moves lists them. Since
+        captures are mandatory, only captures are yielded when the player has
+        one. Moves are found as they are asked for, so a caller that stops
+        early does not pay for the rest. The game must not be changed while
+        iterating.
+
+        Parameters:
+            color (PieceColor): player's color
+
+        Returns:
+            generator of tuple(tuple(int, int), list[tuple(int, int)]): the
+            position of the piece to be moved and the squares it moves to
+        """
+        coords = self._tables.coords
+        for start, path in self._iter_square_moves(color):
+            yield coords[start], [coords[step] for step in path]
+
+    def generate_moves(self, color: PieceColor) -> List[Move]:
+        """
+        Returns all the complete valid moves of the player of the given color
+        as Move values, in the same order as iter_moves yields them: pieces in
+        the slot order described in player_valid_moves (the order they were
+        set up in, a moved piece keeping its place), and the moves of each
+        piece in the order they are found. The moves can be played with play
+        or apply_move.
+
+        Parameters:
+            color (PieceColor): player's color
+
+        Returns:
+            list[Move]: valid moves of the player. The list is shared with
+            later calls for the same position and must not be modified.
+        """
+        self._sync_moves_cache()
+        moves = self._move_list_cache.get(color)
+        if moves is not None:
+            self._moves_cache_hits += 1
+            return moves
+
+        tables = self._tables
+        moves = [Move(color, start, path, path_captures(tables, start, path),
+                      tables.coords, self._hash)
+                 for start, path in self._square_moves(color)]
+        self._move_list_cache[color] = moves
+        return moves
+
+    def piece_valid_moves(self, coord: Tuple[int, int]) -> List[List
+                                                            [Tuple[int, int]]]:
+        """
+        Returns all the complete valid moves for the given piece. The moves of
+        a piece its player can move are taken from player_valid_moves, so
+        they are not found a second time. Only a piece that cannot move
+        because another piece has to jump has its own moves worked out.
+
+        Parameters:
+            coord (tuple(int, int)): position of the given piece
+
+        Raises:
+            ValueError: if there is no piece at the given position
+
+        Returns:
+            list[list[tuple(int, int)]]: list of all the possible moves the
+            given piece can move to. The list is shared with later calls for
+            the same position and must not be modified.
+        """
+        code = self._squares[self._piece_square(coord)]
+        moves = self.player_valid_moves(_CODE_COLORS[code & ~KING]).get(coord)
+        if moves is not None:
+            return moves
+
+        moves = self._get_all_jumps(coord)
+        if not moves:
+            moves = self._get_all_non_jumps(coord)
+        return moves
+
+    def subscribe(self, listener: Callable[[MoveEvent], None]) -> None:
+        """
+        Registers a function to be called with a MoveEvent after every move
+        played with move or play. Moves made with make_move and apply_move
+        (for searching) do not send events.
+
+        Parameters:
+            listener (callable): function taking a MoveEvent
+
+        Returns:
+            None
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[MoveEvent], None]) -> None:
+        """
+        Stops calling a function registered with subscribe.
+
+        Parameters:
+            listener (callable): function taking a MoveEvent
+
+        Raises:
+            ValueError: If the function is not registered
+
+        Returns:
+            None
+        """
+        self._listeners.remove(listener)
+
+    def must_capture(self, color: PieceColor) -> bool:
+        """
+        Returns if the player of the given color has to make a jump with their
+        next move.
+
+        Parameters:
+            color (PieceColor): player color
+
+        Returns:
+            bool: True if one of the player's pieces can jump
+        """
+        return self._require_jump(color)
+
+    def move_promotes(self, move: Move) -> bool:
+        """
+        Returns if playing the given complete move of the current position
+        would promote the moving piece to a king.
+
+        Parameters:
+            move (Move): a move returned by generate_moves
+
+        Returns:
+            bool: True if the piece ends the move on the far row as a
+            non-king piece
+        """
+        code = self._squares[move.get_start_square()]
+        return self._tables.promotes[code][move.get_path_squares()[-1]]
+
+    def has_legal_move(self, color: PieceColor) -> bool:
+        """
+        Returns if the player of the given color has at least one valid move.
+        This stops at the first capture or step it finds instead of building
+        all the valid moves.
+
+        Parameters:
+            color (PieceColor): player's color
+
+        Returns:
+            bool: True if the player can move, otherwise False
+        """
+        if self._moves_cache_version == self._version:
+            moves = self._square_moves_cache.get(color)
+            if moves is not None:
+                return bool(moves)
+
+        if self._require_jump(color):
+            return True
+
+        if color == PieceColor.BLACK:
+            pieces = self._black_pieces
+        else:
+            pieces = self._red_pieces
+
+        squares = self._squares
+        steps = self._tables.steps
+        for square in pieces:
+            for dest in steps[squares[square]][square]:
+                if not squares[dest]:
+                    return True
+        return False
+
+    def get_move_cache_stats(self) -> Tuple[int, int]:
+        """
+        Returns how many valid move queries were answered from the cache of the
+        current position and how many had to compute the moves.
+
+        Parameters:
+            None
+
+        Returns:
+            tuple(int, int): number of cache hits and number of cache misses
+        """
+        return self._moves_cache_hits, self._moves_cache_misses
+
+    def is_valid_move(self, color: PieceColor, start: Tuple[int, int],
+            end: Tuple[int, int]) -> bool:
+        """
+        Determines if the move is a possible move at the given color's player's
+        current turn. 
+
+        Parameters:
+            color: color of the player
+            start: coordinates of the piece to be moved
+            end: coordinates of the destination location of the move
+
+        Returns:
+            bool: returns True if the given move is valid, otherwise, returns
+            False
+        """
+        paths = self.player_valid_moves(color).get(start)
+        if paths is None:
+            return False
+        for moves in paths:
+            if end in moves:
+                return True
+        return False
+
+    def is_valid_dest(self, start: Tuple[int, int],
+                      end: Tuple[int, int]) -> bool:
+        """
+        Given a location of a piece on the board and a location to move the
+        piece to, determines if the move is valid or not, regardless of other
+        pieces.
+
+        Parameters:
+            start (tuple(int, int)): position of the piece
+            end (tuple(int, int)): destination position
+
+        Returns:
+            bool: returns True if the move is valid, otherwise, returns False
+        """
+        for moves in self.piece_valid_moves(start):
+            if moves[-1] == end:
+                return True
+        return False
+
+    def turn_incomplete(self) -> bool:
+        """
+        Boolean value for if the turn is incomplete, meaning the player has not
+        completed all possible successive jumps.
+
+        Parameters:
+            None
+
+        Returns:
+            bool: True if the turn is incomplete, otherwise returns False
+        """
+        return self._jumping is not None
+    
+    def is_draw_offered(self) -> bool:
+        """
+        Returns true if a draw has been offered. Otherwise, returns false/
+
+        Parameters:
+            None
+
+        Returns:
+            bool: True if a draw has been offered, otherwise returns False
+        """
+        return self._draw_offered
+
+    def end_turn(self, color: PieceColor, cmd: str) -> None:
+        """
+        Method for ending a player's turn. The player can choose to resign,
+        offer a draw, or simply end their current turn.
+
+        Parameters:
+            color (PieceColor): current player's color
+            cmd (str): the player's command to end turn, resign, or offer draw
+
+        Returns:
+            None
+        """
+        if cmd == "End Turn":   
+            pass
+        elif cmd == "Resign":
+            if color == PieceColor.BLACK:
+                self._winner = PieceColor.RED
+            elif color == PieceColor.RED:
+                self._winner = PieceColor.BLACK
+        elif cmd == "Offer Draw":
+            self._draw_offered = True
+    
+    def accept_draw(self, cmd: str) -> None:
+        """
+        Method for player to either accept or decline a draw offered by the
+        other player.
+
+        Parameters:
+            cmd (str): command for accepting or declining a draw
         
         Returns:
             None
         """
-        height = self._board.get_num_rows()
-        width = self._board.get_num_cols()
+        if cmd == "Accept":
+            self._winner = PieceColor.DRAW
+        else:
+            self._draw_offered = False
+
+    def get_winner(self) -> Optional[PieceColor]:
+        """
+        Find the winner of the game and the color won, if it exists.
+
+        Parameters:
+            None
+
+        Returns:
+            PieceColor or None: If there is a winner, return the color. If it is
+            a tie, returns PieceColor.DRAW. Otherwise, return None.
+        """
+        return self._winner
+
+    def position_hash(self) -> int:
+        """
+        Returns a 64-bit hash of the current position: the pieces on the
+        board, the player whose turn it is and the piece in the middle of a
+        jump. The hash is updated with every move rather than recomputed.
+
+        Parameters:
+            None
+
+        Returns:
+            int: hash of the position
+        """
+        return self._hash
+    
+    def evaluate(self) -> float:
+        """
+        Evaluates the value of the current position. The more positive the value
+        the more favorable the position is for player with the black pieces. The
+        more negative the value, the more favorable the position is for player 
+        with the red pieces. 
+
+        Parameters:
+            None
+
+        Returns:
+            value (float): value of current position
+        """
+        black_king, black_nonking, red_king, red_nonking = self._composition()
+        value = ((black_nonking - red_nonking) +
+                 (0.5 * black_king - 0.5 * red_king))
+        return value
+
+    #
+    # PRIVATE METHODS
+    #
+
+    def _make_move(self, color: PieceColor, start: int,
+                   path: List[int]) -> MoveRecord:
+        """
+        Plays a complete move given by squares without checking that it is
+        valid, completing the player's turn.
+
+        Parameters:
+            color (PieceColor): player color
+            start (int): square of the piece to be moved
+            path (list[int]): squares the piece moves to
+
+        Returns:
+            MoveRecord: record needed to undo the move
+        """
+        if color == PieceColor.BLACK:
+            other = self._red_pieces
+        else:
+            other = self._black_pieces
+
+        state = (self._jumping, self._black_moves_since_capture,
+                 self._red_moves_since_capture, self._winner, self._turn,
+                 self._hash)
+        self._version += 1
+        squares = self._squares
+        jumped_over = self._tables.jumped_over
+        code = squares[start]
+        captured = []
+
+        if path[0] in jumped_over[start]:   # jump move
+            current = start
+            for step in path:
+                over = jumped_over[current][step]
+                captured.append((over, squares[over], other.slot(over)))
+                self._piece_jump_to(current, step)
+                current = step
+
+            if color == PieceColor.BLACK:
+                self._black_moves_since_capture = 0
+            elif color == PieceColor.RED:
+                self._red_moves_since_capture = 0
+
+        else:   # non-jump move
+            self._piece_move_to(start, path[0])
+
+            if color == PieceColor.BLACK:
+                self._black_moves_since_capture += 1
+            elif color == PieceColor.RED:
+                self._red_moves_since_capture += 1
+
+        end = path[-1]
+        self._set_jumping(None)
+        self._set_turn(self._opponent(color))
+        self._check_promote(end)
+        self._update_winner(color)
+
+        if self._check_hash:
+            self._verify_hash()
+
+        return (start, end, captured, squares[end] != code) + state
+
+    def _note_changed(self, version: int, start: int, end: int,
+                      captures: Tuple[int, ...]) -> None:
+        """
+        Records the squares changed by a move played with move or play for
+        board_to_str, if the squares changed before the move are known.
+
+        Parameters:
+            version (int): version of the position before the move
+            start (int): square the piece left
+            end (int): square the piece arrived on
+            captures (tuple(int, ...)): squares of the captured pieces
+
+        Returns:
+            None
+        """
+        if self._str_changed_version == version:
+            self._str_changed.append(start)
+            self._str_changed.append(end)
+            self._str_changed.extend(captures)
+            self._str_changed_version = self._version
+
+    def _changed_squares(self, old: bytes, new: bytearray) -> List[int]:
+        """
+        Returns the squares whose piece codes differ between two boards. The
+        boards are compared as integers, so only the differing squares are
+        visited.
+
+        Parameters:
+            old (bytes): piece codes of the first board
+            new (bytearray): piece codes of the second board
+
+        Returns:
+            list[int]: squares that differ
+        """
+        diff = (int.from_bytes(old, "little") ^
+                int.from_bytes(new, "little"))
+        changed = []
+        while diff:
+            square = ((diff & -diff).bit_length() - 1) // 8
+            changed.append(square)
+            diff &= ~(0xFF << (8 * square))
+        return changed
+
+    def _emit_move(self, color: PieceColor, start: int, end: int,
+                   captures: Tuple[int, ...], promoted: bool) -> None:
+        """
+        Sends a MoveEvent for a move that was just played to the listeners.
+
+        Parameters:
+            color (PieceColor): color of the player who moved
+            start (int): square the piece left
+            end (int): square the piece arrived on
+            captures (tuple(int, ...)): squares of the captured pieces
+            promoted (bool): if the piece was promoted
+
+        Returns:
+            None
+        """
+        coords = self._tables.coords
+        event = MoveEvent(color, [coords[start]], [coords[end]],
+                          [coords[square] for square in captures],
+                          coords[end] if promoted else None,
+                          not self.turn_incomplete(), self._winner)
+        for listener in list(self._listeners):
+            listener(event)
+
+    def _rebuild_derived_state(self) -> None:
+        """
+        Recomputes the piece counts, the position hash and the capture sets
+        from the board after the pieces were replaced all at once.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        self._counts = [self._squares.count(code)
+                        for code in range(len(_CODE_CHARS))]
+        self._counts[EMPTY] = 0
+        self._hash = self._compute_hash()
+        self._black_captures = set()
+        self._red_captures = set()
+        self._capture_dirty = list(range(len(self._squares)))
+        self._version += 1
+
+    def _sync_moves_cache(self) -> None:
+        """
+        Empties the valid move caches if the position has changed since they
+        were filled.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        if self._moves_cache_version != self._version:
+            self._moves_cache = {}
+            self._square_moves_cache = {}
+            self._move_list_cache = {}
+            self._legal_keys = {}
+            self._moves_cache_version = self._version
+
+    def _square_moves(self, color: PieceColor) -> List[Tuple[int, List[int]]]:
+        """
+        Returns the complete valid moves of the player of the given color with
+        squares instead of positions, finding them only once per position.
+        player_valid_moves, generate_moves and piece_valid_moves are all built
+        from this list.
+
+        Parameters:
+            color (PieceColor): player's color
+
+        Returns:
+            list[tuple(int, list[int])]: the square of each piece to be moved
+            and the squares it moves to. The list is shared with later calls
+            for the same position and must not be modified.
+        """
+        self._sync_moves_cache()
+        moves = self._square_moves_cache.get(color)
+        if moves is not None:
+            self._moves_cache_hits += 1
+            return moves
+
+        self._moves_cache_misses += 1
+        moves = list(self._iter_square_moves(color))
+        self._square_moves_cache[color] = moves
+        return moves
+
+    def _iter_square_moves(self, color: PieceColor):
+        """
+        Yields the complete valid moves of the player of the given color with
+        squares instead of positions, for iter_moves and _square_moves.
+
+        Parameters:
+            color (PieceColor): player's color
+
+        Returns:
+            generator of tuple(int, list[int]): the square of the piece to be
+            moved and the squares it moves to
+        """
+        squares = self._squares
+
+        if (self._jumping is not None and
+                squares[self._jumping] & _COLOR_CODES[color]):
+            start = self._jumping
+            for path in self._iter_complete_jumps(start, squares[start],
+                                                  set()):
+                yield start, path
+            return
+
+        if color == PieceColor.BLACK:
+            pieces = self._black_pieces
+        else:
+            pieces = self._red_pieces
+
+        if self._require_jump(color):
+            captures = self._player_captures(color)
+            for start in pieces:
+                if start in captures:
+                    for path in self._iter_complete_jumps(
+                            start, squares[start], set()):
+                        yield start, path
+
+        else:
+            steps = self._tables.steps
+            for start in pieces:
+                for dest in steps[squares[start]][start]:
+                    if not squares[dest]:
+                        yield start, [dest]
+
+    def _piece_move_to(self, start: int, end: int) -> None:
+        """
+        Moves the piece on the given square and updates the piece's positon on
+        the board.
+
+        Parameters:
+            start (int): the square of the piece to be moved
+            end (int): square the peice is moving to
+
+        Returns:
+            None
+        """
+        squares = self._squares
+        keys = self._keys.pieces
+        code = squares[start]
+        self._hash ^= keys[start][code] ^ keys[end][code]
+        squares[start] = EMPTY
+        squares[end] = code
 
-        # reset instance variables
-        self._black_piece_coords = []
-        self._red_piece_coords = []
-        self._winner = None
-        self._jumping = None
-        self._black_moves_since_capture = 0
-        self._red_moves_since_capture = 0
+        if code & BLACK_MAN:
+            pieces = self._black_pieces
+        else:
+            pieces = self._red_pieces
+        pieces.move(start, end)
+        self._capture_dirty += (start, end)
 
-        for r in range(height):
-            for c in range(width):
-                if r < self._rows and r % 2 != c % 2:
-                    self._black_piece_coords.append((r, c))
-                    self._board.set((r, c), Piece(PieceColor.BLACK))
-                elif r >= height - self._rows and r % 2 != c % 2:
-                    self._red_piece_coords.append((r, c))
-                    self._board.set((r, c), Piece(PieceColor.RED))
-                else:
-                    self._board.set((r, c), None)
-    
-    def move(self, color: PieceColor, start: Tuple[int, int], 
-            end: Tuple[int, int]) -> None:
+    def _piece_jump_to(self, start: int, end: int) -> None:
         """
-        Player of the given color inputs a position of a piece and a location to
-        move the piece to. If the given move is valid, the move will be
-        executed. Otherwise, the player wll be prompted to input a different
-        move.
+        Jumps with the piece on the given square and updates the piece's
+        positon on the board.
+
+        Parameters:
+            start (int): the square of the piece to be moved
+            end (int): square the peice is moving to, two squares away
+
+        Returns:
+            None
+        """
+        squares = self._squares
+        keys = self._keys.pieces
+        jump_over = self._tables.jumped_over[start][end]
+        code = squares[start]
+        captured = squares[jump_over]
+        self._counts[captured] -= 1
+        self._hash ^= (keys[start][code] ^ keys[end][code] ^
+                       keys[jump_over][captured])
+        squares[start] = EMPTY
+        squares[jump_over] = EMPTY
+        squares[end] = code
+
+        if code & BLACK_MAN:
+            own, other = self._black_pieces, self._red_pieces
+        else:
+            own, other = self._red_pieces, self._black_pieces
+        own.move(start, end)
+        other.remove(jump_over)
+        self._capture_dirty += (start, jump_over, end)
+
+    def _remove_piece(self, coord: Tuple[int, int]) -> None:
+        """
+        Removes the piece at the given location from the board and from the
+        list of squares of its player's pieces.
+
+        Parameters:
+            coord (tuple(int, int)): location on the board
+
+        Raises:
+            ValueError: If the given location is invalid or if there is not a
+            piece at the given location
+
+        Returns:
+            None
+        """
+        if self._board.get(coord) is None:
+            raise ValueError("No piece to remove at this coordinate")
+
+        square = self._tables.index[coord]
+        code = self._squares[square]
+        self._squares[square] = EMPTY
+        self._version += 1
+        self._counts[code] -= 1
+        self._hash ^= self._keys.pieces[square][code]
+        if code & BLACK_MAN:
+            self._black_pieces.remove(square)
+        else:
+            self._red_pieces.remove(square)
+        self._capture_dirty.append(square)
+
+    def _piece_square(self, coord: Tuple[int, int]) -> int:
+        """
+        Returns the square index of the piece at the given location.
+
+        Parameters:
+            coord (tuple(int, int)): location on the board
+
+        Raises:
+            ValueError: if the location is invalid or there is no piece at it
+
+        Returns:
+            int: square of the piece
+        """
+        if self._board.get(coord) is None:
+            raise ValueError("No piece at starting position")
+        return self._tables.index[coord]
+
+    def _get_all_jumps(self,
+                        start: Tuple[int, int]) -> List[List[Tuple[int, int]]]:
+        """"
+        Given a location on the board, returns a list of all the possible
+        complete jumps the piece at that location can make where the coordinates
+        of each sqaure the piece jumps to during the path is stored in a list.
+
+        Parameters:
+            start_position: position of the peice
+
+        Raises:
+            ValueError: if there is no piece at the given starting position
+
+        Returns:
+            list(list(tuple(int, int))): list of moves the piece can make
+        """
+        return self._square_jumps(self._piece_square(start))
+
+    def _get_all_non_jumps(self,
+                        start: Tuple[int, int]) -> List[List[Tuple[int, int]]]:
+        """
+        Given a piece on the board, returns a list of positions the piece can
+        non-jump move to. This does not include places the piece can move to
+        with a jump since that is in the _piece_valid_jump method. It will also
+        take into consideration if the piece is a king or not.
+
+        Parameters:
+            start (tuple(int, int)): location of the piece
+
+        Raises:
+            ValueError: if there is no piece at the given starting position
+
+        Returns:
+            list[list[tuple(int, int)]]: all possible places the given piece can
+            non-jump move to
+        """
+        square = self._piece_square(start)
+        squares = self._squares
+        coords = self._tables.coords
+
+        valid_moves = []
+        for dest in self._tables.steps[squares[square]][square]:
+            if not squares[dest]:
+                valid_moves.append([coords[dest]])
+
+        return valid_moves
+
+    def _square_jumps(self, square: int) -> List[List[Tuple[int, int]]]:
+        """
+        Returns all the complete jumps the piece on the given square can make,
+        with each path given as the locations the piece jumps to.
+
+        Parameters:
+            square (int): square of the piece
+
+        Returns:
+            list[list[tuple(int, int)]]: list of moves the piece can make
+        """
+        coords = self._tables.coords
+        return [[coords[step] for step in path] for path in
+                self._iter_complete_jumps(square, self._squares[square],
+                                          set())]
+
+    def _iter_complete_jumps(self, start: int, code: int, jumped: Set[int]):
+        """
+        Yields the complete moves that can be made from the given starting
+        square one at a time, trying the jump directions in the order of the
+        move tables. The jump tree is walked with an explicit stack, and a
+        single set of jumped squares and a single path are updated in place
+        as the walk goes down and back up the tree.
+
+        Parameters:
+            start (int): starting square on the board
+            code (int): piece code of the jumping piece
+            jumped (set(int)): set of squares that have already been jumped
+            over (not modified)
+
+        Returns:
+            generator of list[int]: complete moves, each one a new list of the
+            squares the piece jumps to
+        """
+        return iter_jump_paths(self._squares, self._tables, start, code,
+                               jumped)
+
+    def _get_single_jumps(self, start: int, code: int,
+                          jumped: Set[int]) -> List[Tuple[int, int]]:
+        """
+        Given a starting square on the board, a piece code, and a set of
+        squares that have already been jumped over, returns the possible single
+        jumps a piece with the given details can make as pairs of the square
+        that can be jumped to and the square that is jumped over to reach it.
+
+        Parameters:
+            start (int): starting square on the board
+            code (int): piece code of the jumping piece
+            jumped (set(int)): set of squares that have already been jumped
+            over
+
+        Returns:
+            list[tuple(int, int)]: the possible end squares and the squares
+            being jumped over
+        """
+        return single_jumps(self._squares, self._tables, start, code, jumped)
+
+    def _require_jump(self, color: PieceColor) -> bool:
+        """
+        Given a player color returns a boolean if the player must make a jump
+        with his or her turn.
 
         Parameters:
             color (PieceColor): player color
-            start: the position of piece to be moved
-            end (tuple(int, int)): destination position
+
+        Returns:
+            bool: if the player must make a jump with his or her turn
+        """
+        if (self._jumping is not None and
+                self._squares[self._jumping] & _COLOR_CODES[color]):
+            return True
+
+        return bool(self._player_captures(color))
+
+    def _player_captures(self, color: PieceColor) -> Set[int]:
+        """
+        Returns the squares of the given player's pieces that can capture.
+        Only the pieces near the squares that changed since the last call are
+        checked again.
+
+        Parameters:
+            color (PieceColor): player color
+
+        Returns:
+            set(int): squares of the pieces that can capture (must not be
+            modified)
+        """
+        if self._capture_dirty:
+            squares = self._squares
+            nearby = self._tables.nearby
+            black = self._black_captures
+            red = self._red_captures
+
+            checked = set()
+            for square in self._capture_dirty:
+                checked.update(nearby[square])
+            self._capture_dirty = []
+
+            for square in checked:
+                black.discard(square)
+                red.discard(square)
+                code = squares[square]
+                if code and self._get_single_jumps(square, code, ()):
+                    if code & BLACK_MAN:
+                        black.add(square)
+                    else:
+                        red.add(square)
+
+        if color == PieceColor.BLACK:
+            return self._black_captures
+        return self._red_captures
+
+    def _composition(self) -> Tuple[int, int, int, int]:
+        """
+        Returns the number of kings and nonking pieces each player currently has
+        on the board. The counts are kept up to date as pieces are captured and
+        promoted, so this does not need to look at the board.
+
+        Parameters:
+            None
+
+        Returns:
+            tuple (int, int, int, int): tuple of four integers; the first
+            integer is the number of black king pieces on the board, the second
+            integer is the number of black nonking pieces on the board, the
+            third integer is the number of red king pieces on the board, and the
+            fourth integer is the number of red nonking pieces on the board.
+        """
+        counts = self._counts
+        return (counts[BLACK_KING], counts[BLACK_MAN], counts[RED_KING],
+                counts[RED_MAN])
+
+    def _check_promote(self, square: int) -> None:
+        """
+        Checks if the piece on the given square should be promoted to a king.
+
+        Parameters:
+            square (int): square of the given piece
+
+        Returns:
+            None
+        """
+        code = self._squares[square]
+        if self._tables.promotes[code][square]:
+            keys = self._keys.pieces[square]
+            self._counts[code] -= 1
+            self._hash ^= keys[code] ^ keys[code | KING]
+            self._squares[square] = code | KING
+            self._counts[code | KING] += 1
+            self._capture_dirty.append(square)
+
+    def _set_jumping(self, square: Optional[int]) -> None:
+        """
+        Sets the square of the piece in the middle of a jump and updates the
+        position hash.
+
+        Parameters:
+            square (Optional[int]): square of the jumping piece or None if no
+            piece is in the middle of a jump
+
+        Returns:
+            None
+        """
+        if self._jumping is not None:
+            self._hash ^= self._keys.jumping[self._jumping]
+        if square is not None:
+            self._hash ^= self._keys.jumping[square]
+        self._jumping = square
+
+    def _set_turn(self, color: PieceColor) -> None:
+        """
+        Sets the player whose turn it is and updates the position hash.
+
+        Parameters:
+            color (PieceColor): player color
+
+        Returns:
+            None
+        """
+        if color != self._turn:
+            self._hash ^= self._keys.red_turn
+            self._turn = color
+
+    def _opponent(self, color: PieceColor) -> PieceColor:
+        """
+        Returns the color of the given player's opponent.
+
+        Parameters:
+            color (PieceColor): player color
+
+        Returns:
+            PieceColor: opponent's color
+        """
+        if color == PieceColor.BLACK:
+            return PieceColor.RED
+        return PieceColor.BLACK
+
+    def _compute_hash(self) -> int:
+        """
+        Computes the hash of the current position from scratch.
+
+        Parameters:
+            None
+
+        Returns:
+            int: hash of the position
+        """
+        value = 0
+        for square in list(self._black_pieces) + list(self._red_pieces):
+            value ^= self._keys.pieces[square][self._squares[square]]
+        if self._jumping is not None:
+            value ^= self._keys.jumping[self._jumping]
+        if self._turn == PieceColor.RED:
+            value ^= self._keys.red_turn
+        return value
+
+    def _verify_hash(self) -> None:
+        """
+        Checks that the incrementally updated hash matches a full
+        recomputation.
+
+        Parameters:
+            None
 
         Raises:
-            Value if index is not on the board or the selected move is invalid
+            RuntimeError: If the hashes do not match
 
         Returns:
-            None 
+            None
         """
-        if not self.is_valid_move(color, start, end):
-            raise ValueError("Invalid move")
-        
-        if self._require_jump(color):   # jump move
-            for move in self.piece_valid_moves(start):
-                if end in move:
-                    if end == move[-1]: # complete jump move
-                        self._jumping = None
-                    else:   # incomplete jump move
-                        self._jumping = end
-                    
-                    current = start
-                    for step in move[: move.index(end) + 1]:
-                        self._piece_jump_to(color, current, step)
-                        current = step
-                    break
+        if self._hash != self._compute_hash():
+            raise RuntimeError("Position hash does not match the position")
 
-            # reset moves since last capture counter
-            if color == PieceColor.BLACK:
-                self._black_moves_since_capture = 0
-            elif color == PieceColor.RED:
-                self._red_moves_since_capture = 0
+    def _update_winner(self, color: PieceColor) -> None:
+        """
+        Checks if the given player has won the game or the game has reached a
+        draw.
 
-        else:   # non-jump move
-            self._piece_move_to(color, start, end)
-            self._jumping = None
+        Parameters:
+            color (PieceColor): player color
+
+        Returns:
+            None
+        """
+        if (color == PieceColor.BLACK and
+                not self.has_legal_move(PieceColor.RED)):
+            self._winner = PieceColor.BLACK
+        elif (color == PieceColor.RED and
+                not self.has_legal_move(PieceColor.BLACK)):
+            self._winner = PieceColor.RED
+        # check for draw
+        elif (self._black_moves_since_capture >= 40 or
+                self._red_moves_since_capture >= 40):
+            self._winner = PieceColor.DRAW
+
+class Position:
+    """
+    Class for representing an immutable checkers position: the pieces on the
+    board, the player to move, the piece in the middle of a jump and the moves
+    since capture counters. Positions can be hashed and compared, so they can
+    be used as dictionary keys and shared between threads, and playing a move
+    returns a new position instead of changing this one.
+    """
+
+    __slots__ = ("_size", "_squares", "_turn", "_jumping",
+                 "_black_moves_since_capture", "_red_moves_since_capture",
+                 "_tables", "_hash")
+
+    #
+    # PRIVATE ATTRIBUTES
+    #
+
+    # number of rows and columns of the board
+    _size: int
+
+    # piece code of each dark square
+    _squares: bytes
+
+    # player whose turn it is
+    _turn: PieceColor
+
+    # square of the piece that is in the middle of a jump
+    _jumping: Optional[int]
+
+    # number of moves since the last capture
+    _black_moves_since_capture: int
+    _red_moves_since_capture: int
 
-            # increment moves since last capture counter by 1
-            if color == PieceColor.BLACK:
-                self._black_moves_since_capture += 1
-            elif color == PieceColor.RED:
-                self._red_moves_since_capture += 1
+    # step and jump destinations of the board size
+    _tables: MoveTables
 
-        # check for promotion
-        self._check_promote(color, end)
+    # hash of the position, computed the first time it is needed (None
+    # until then)
+    _hash: Optional[int]
 
-        # update winner after complete player turn
-        if not self.turn_incomplete():
-            self._update_winner(color)
+    #
+    # PUBLIC METHODS
+    #
 
-    def player_valid_moves(self,
-                           color: PieceColor) -> Dict[Optional[Tuple[int, int]],
-                                                   List[List[Tuple[int, int]]]]:
+    def __init__(self, size: int, squares: bytes, turn: PieceColor,
+                 jumping: Optional[int] = None,
+                 black_moves_since_capture: int = 0,
+                 red_moves_since_capture: int = 0):
         """
-        Returns all the complete valid moves (jumps or non-jump moves) for all
-        the available specified colored pieces.
+        Constructor
 
         Parameters:
-            color (PieceColor): player's color
+            size (int): number of rows and columns of the board
+            squares (bytes): piece code of each dark square
+            turn (PieceColor): player whose turn it is
+            jumping (Optional[int]): square of the piece in the middle of a
+            jump, if there is one
+            black_moves_since_capture (int): black moves since last capture
+            red_moves_since_capture (int): red moves since last capture
+        """
+        squares = bytes(squares)
+        setattr_ = object.__setattr__
+        setattr_(self, "_size", size)
+        setattr_(self, "_squares", squares)
+        setattr_(self, "_turn", turn)
+        setattr_(self, "_jumping", jumping)
+        setattr_(self, "_black_moves_since_capture",
+                 black_moves_since_capture)
+        setattr_(self, "_red_moves_since_capture", red_moves_since_capture)
+        setattr_(self, "_tables", get_move_tables(size))
+        setattr_(self, "_hash", None)
+
+    @classmethod
+    def from_game(cls, game: CheckersGame) -> "Position":
+        """
+        Returns the current position of the given game.
+
+        Parameters:
+            game (CheckersGame): the game
 
         Returns:
-            dict{tuple(int, int): list[list[tuple(int, int)]]}: dictionary of
-            all the complete valid moves the player of the given color can make
-            where the keys are the coordinates of a piece that can be moved and
-            the values are the list of complete valid moves the player can make
-            with each piece.
+            Position: the position
         """
-        moves = {}
-        
-        if (self.turn_incomplete() and
-                self._board.get(self._jumping).get_color() == color):
-            moves[self._jumping] = self._get_all_jumps(self._jumping)
-            return moves
+        return cls(game._board.get_num_rows(), game._squares, game._turn,
+                   game._jumping, game._black_moves_since_capture,
+                   game._red_moves_since_capture)
 
-        piece_coords = []
-        if color == PieceColor.BLACK:
-            piece_coords = self._black_piece_coords
-        elif color == PieceColor.RED:
-            piece_coords = self._red_piece_coords
+    def __setattr__(self, name: str, value: object) -> None:
+        """
+        Positions cannot be changed.
 
-        if self._require_jump(color):
-            for coord in piece_coords:
-                if self._get_all_jumps(coord):
-                    moves[coord] = self._get_all_jumps(coord)
+        Raises:
+            AttributeError: Always
+        """
+        raise AttributeError("Position is immutable")
 
-        else:
-            for coord in piece_coords:
-                if self._get_all_non_jumps(coord):
-                    moves[coord] = self._get_all_non_jumps(coord)
+    def __delattr__(self, name: str) -> None:
+        """
+        Positions cannot be changed.
 
-        return moves
+        Raises:
+            AttributeError: Always
+        """
+        raise AttributeError("Position is immutable")
 
-    def piece_valid_moves(self, coord: Tuple[int, int]) -> List[List
-                                                            [Tuple[int, int]]]:
+    def __eq__(self, other: object) -> bool:
         """
-        Returns all the complete valid moves for the given piece.
+        Returns if the other object is the same position.
 
         Parameters:
-            coord (tuple(int, int)): position of the given piece
+            other (object): object to compare with
 
         Returns:
-            list[list[tuple(int, int)]]: list of all the possible moves the
-            given piece can move to
+            bool: True if the positions are equal
         """
-        if self._get_all_jumps(coord):
-            return self._get_all_jumps(coord)
-        else:
-            return self._get_all_non_jumps(coord)
+        if not isinstance(other, Position):
+            return NotImplemented
+        return (hash(self) == hash(other) and
+                self._squares == other._squares and
+                self._size == other._size and self._turn == other._turn and
+                self._jumping == other._jumping and
+                self._black_moves_since_capture ==
+                other._black_moves_since_capture and
+                self._red_moves_since_capture ==
+                other._red_moves_since_capture)
 
-    def is_valid_move(self, color: PieceColor, start: Tuple[int, int],
-            end: Tuple[int, int]) -> bool:
+    def __hash__(self) -> int:
         """
-        Determines if the move is a possible move at the given color's player's
-        current turn. 
+        Returns the hash of the position.
 
         Parameters:
-            color: color of the player
-            start: coordinates of the piece to be moved
-            end: coordinates of the destination location of the move
+            None
 
         Returns:
-            bool: returns True if the given move is valid, otherwise, returns
-            False
+            int: hash of the position
         """
-        if start not in self.player_valid_moves(color):
-            return False
-        else:
-            for moves in self.piece_valid_moves(start):
-                if end in moves:
-                    return True
-            return False
+        if self._hash is None:
+            object.__setattr__(self, "_hash", hash((
+                self._size, self._squares, self._turn, self._jumping,
+                self._black_moves_since_capture,
+                self._red_moves_since_capture)))
+        return self._hash
 
-    def is_valid_dest(self, start: Tuple[int, int],
-                      end: Tuple[int, int]) -> bool:
+    def __reduce__(self):
         """
-        Given a location of a piece on the board and a location to move the
-        piece to, determines if the move is valid or not, regardless of other
-        pieces.
+        Returns how to pickle the position.
 
         Parameters:
-            start (tuple(int, int)): position of the piece
-            end (tuple(int, int)): destination position
+            None
 
         Returns:
-            bool: returns True if the move is valid, otherwise, returns False
+            tuple: the class and the constructor arguments
         """
-        for moves in self.piece_valid_moves(start):
-            if moves[-1] == end:
-                return True
-        return False
+        return (Position, (self._size, self._squares, self._turn,
+                           self._jumping, self._black_moves_since_capture,
+                           self._red_moves_since_capture))
 
-    def turn_incomplete(self) -> bool:
+    def get_turn(self) -> PieceColor:
         """
-        Boolean value for if the turn is incomplete, meaning the player has not
-        completed all possible successive jumps.
+        Returns the player whose turn it is.
 
         Parameters:
             None
 
         Returns:
-            bool: True if the turn is incomplete, otherwise returns False
+            PieceColor: player to move
         """
-        return self._jumping is not None
-    
-    def is_draw_offered(self) -> bool:
+        return self._turn
+
+    def get_squares(self) -> bytes:
         """
-        Returns true if a draw has been offered. Otherwise, returns false/
+        Returns the piece code of each dark square.
 
         Parameters:
             None
 
         Returns:
-            bool: True if a draw has been offered, otherwise returns False
+            bytes: piece codes in square order
         """
-        return self._draw_offered
+        return self._squares
 
-    def end_turn(self, color: PieceColor, cmd: str) -> None:
+    def board_to_str(self) -> Tuple[Tuple[str, ...], ...]:
         """
-        Method for ending a player's turn. The player can choose to resign,
-        offer a draw, or simply end their current turn.
+        Returns the board as a tuple of tuples of strings, in the same format
+        as CheckersGame.board_to_str.
 
         Parameters:
-            color (PieceColor): current player's color
-            cmd (str): the player's command to end turn, resign, or offer draw
+            None
 
         Returns:
-            None
+            tuple(tuple(str)): the board
         """
-        if cmd == "End Turn":   
-            pass
-        elif cmd == "Resign":
-            if color == PieceColor.BLACK:
-                self._winner = PieceColor.RED
-            elif color == PieceColor.RED:
-                self._winner = PieceColor.BLACK
-        elif cmd == "Offer Draw":
-            self._draw_offered = True
-    
-    def accept_draw(self, cmd: str) -> None:
+        grid = [[" "] * self._size for _ in range(self._size)]
+        for (r, c), code in zip(self._tables.coords, self._squares):
+            grid[r][c] = _CODE_CHARS[code]
+        return tuple(tuple(row) for row in grid)
+
+    def generate_moves(self) -> List[Move]:
         """
-        Method for player to either accept or decline a draw offered by the
-        other player.
+        Returns all the complete valid moves of the player to move. Pieces are
+        considered in square order.
 
         Parameters:
-            cmd (str): command for accepting or declining a draw
-        
-        Returns:
             None
+
+        Returns:
+            list[Move]: valid moves
         """
-        if cmd == "Accept":
-            self._winner = PieceColor.DRAW
+        return self._color_moves(self._turn)
+
+    def apply(self, move: Move) -> "Position":
+        """
+        Returns the position after the given complete move, which must be one
+        of the moves returned by generate_moves. The move is not checked.
+
+        Parameters:
+            move (Move): move to be played
+
+        Returns:
+            Position: the new position
+        """
+        squares = bytearray(self._squares)
+        start = move.get_start_square()
+        end = move.get_path_squares()[-1]
+        code = squares[start]
+        squares[start] = EMPTY
+        for captured in move.get_captures():
+            squares[captured] = EMPTY
+        if self._tables.promotes[code][end]:
+            code |= KING
+        squares[end] = code
+
+        black_moves = self._black_moves_since_capture
+        red_moves = self._red_moves_since_capture
+        if self._turn == PieceColor.BLACK:
+            black_moves = 0 if move.get_captures() else black_moves + 1
+            turn = PieceColor.RED
         else:
-            self._draw_offered = False
+            red_moves = 0 if move.get_captures() else red_moves + 1
+            turn = PieceColor.BLACK
+        return Position(self._size, squares, turn, None, black_moves,
+                        red_moves)
 
     def get_winner(self) -> Optional[PieceColor]:
         """
-        Find the winner of the game and the color won, if it exists.
+        Returns the winner of the position: the other player if the player to
+        move cannot move, a draw if a player has gone 40 moves without a
+        capture, and otherwise None.
 
         Parameters:
             None
 
         Returns:
-            PieceColor or None: If there is a winner, return the color. If it is
-            a tie, returns PieceColor.DRAW. Otherwise, return None.
+            Optional[PieceColor]: winner of the position
         """
-        return self._winner
-    
+        if not self.generate_moves():
+            if self._turn == PieceColor.BLACK:
+                return PieceColor.RED
+            return PieceColor.BLACK
+        if (self._black_moves_since_capture >= 40 or
+                self._red_moves_since_capture >= 40):
+            return PieceColor.DRAW
+        return None
+
     def evaluate(self) -> float:
         """
-        Evaluates the value of the current position. The more positive the value
-        the more favorable the position is for player with the black pieces. The
-        more negative the value, the more favorable the position is for player 
-        with the red pieces. 
+        Evaluates the position in the same way as CheckersGame.evaluate.
 
         Parameters:
             None
 
         Returns:
-            value (float): value of current position
+            float: value of the position
         """
-        black_king, black_nonking, red_king, red_nonking = self._composition()
-        value = ((black_nonking - red_nonking) +
-                 (0.5 * black_king - 0.5 * red_king))
-        return value
+        squares = self._squares
+        return ((squares.count(BLACK_MAN) - squares.count(RED_MAN)) +
+                0.5 * (squares.count(BLACK_KING) - squares.count(RED_KING)))
 
     #
     # PRIVATE METHODS
     #
-    
-    def _piece_move_to(self, color: PieceColor, start: Tuple[int, int],
-                       end: Tuple[int, int]) -> None:
+
+    def _color_moves(self, color: PieceColor,
+                     pieces: Optional[bytes] = None) -> List[Move]:
         """
-        Moves the piece at the given location and updates the piece's positon on
-        the board.
+        Returns all the complete valid moves of the given player.
 
         Parameters:
-            color (PieceColor): color of the piece being moved
-            start (tuple(int, int)): the location of the piece to be moved
-            end(tuple(int, int)): position the peice is moving to
+            color (PieceColor): player color
+            pieces (Optional[bytes]): squares of the player's pieces in the
+            order they should be considered (square order if None)
 
         Returns:
-            None
-        """
-        self._board.move(start, end)
-        if color == PieceColor.BLACK:
-            self._black_piece_coords.remove(start)
-            self._black_piece_coords.append(end)
-        elif color == PieceColor.RED:
-            self._red_piece_coords.remove(start)
-            self._red_piece_coords.append(end)
-    
-    
-    def _piece_jump_to(self, color: PieceColor, start: Tuple[int, int],
-                       end: Tuple[int, int]) -> None:
+            list[Move]: valid moves
         """
-        Jumps with the piece at the given location and updates the piece's
-        positon on the board.
+        squares = self._squares
+        tables = self._tables
+        color_bits = _COLOR_CODES[color]
+        if pieces is None:
+            pieces = [square for square, code in enumerate(squares)
+                      if code & color_bits]
 
-        Parameters:
-            color (PieceColor): color of the piece being moved
-            start (tuple (int, int)): the lcoation of the piece to be moved
-            end(tuple(int, int)): position the peice is moving to
+        if self._jumping is not None and squares[self._jumping] & color_bits:
+            starts = [self._jumping]
+        else:
+            starts = [square for square in pieces
+                      if single_jumps(squares, tables, square, squares[square],
+                                      ())]
+
+        moves = []
+        if starts:
+            for start in starts:
+                for path in iter_jump_paths(squares, tables, start,
+                                            squares[start], set()):
+                    moves.append(Move(color, start, path,
+                                      path_captures(tables, start, path),
+                                      tables.coords))
+            return moves
 
-        Raises:
-            ValueError: Jump is invalid
+        steps = tables.steps
+        for start in pieces:
+            for dest in steps[squares[start]][start]:
+                if not squares[dest]:
+                    moves.append(Move(color, start, [dest], (),
+                                      tables.coords))
+        return moves
 
-        Returns:
-            None
-        """
-        start_row, start_col = start
-        end_row, end_col = end
-        jump_over = (int((start_row + end_row) / 2), 
-                int((start_col  + end_col) / 2))
-        
-        self._board.move(start, end)
-        self._board.remove(jump_over)
+class GameSnapshot:
+    """
+    Class for a read-only snapshot of a CheckersGame, returned by
+    CheckersGame.snapshot. It answers the same queries as the game it was
+    taken from at the time it was taken, and since nothing in it can change
+    it can be used from other threads while the game keeps being played.
+    """
 
-        if color == PieceColor.BLACK:
-            self._black_piece_coords.remove(start)
-            self._black_piece_coords.append(end)
-            self._red_piece_coords.remove(jump_over)
-        elif color == PieceColor.RED:
-            self._red_piece_coords.remove(start)
-            self._red_piece_coords.append(end)
-            self._black_piece_coords.remove(jump_over)
+    __slots__ = ("_position", "_winner", "_version", "_black_pieces",
+                 "_red_pieces")
 
-    def _get_all_jumps(self,
-                        start: Tuple[int, int]) -> List[List[Tuple[int, int]]]:
-        """"
-        Given a location on the board, returns a list of all the possible
-        complete jumps the piece at that location can make where the coordinates
-        of each sqaure the piece jumps to during the path is stored in a list. 
+    #
+    # PRIVATE ATTRIBUTES
+    #
 
-        Parameters:
-            start_position: position of the peice
+    # position of the game
+    _position: Position
 
-        Raises:
-            ValueError: if there is no piece at the given starting position
+    # winner of the game if there was one
+    _winner: Optional[PieceColor]
 
-        Returns:
-            list(list(tuple(int, int))): list of moves the piece can make
-        """
-        piece = self._board.get(start)
-        if piece is None:
-            raise ValueError("No piece at starting position")
-        return self._get_complete_jumps(start, piece.get_color(),
-                                        piece.is_king(), set())
-    
-    def _get_all_non_jumps(self,
-                        start: Tuple[int, int]) -> List[List[Tuple[int, int]]]:
+    # version of the game's position the snapshot was taken at
+    _version: int
+
+    # slots of each player's PieceIndex (squares of the pieces in the game's
+    # order, NO_SLOT for an empty slot), so moves are listed in the same order
+    # as by the game
+    _black_pieces: bytes
+    _red_pieces: bytes
+
+    #
+    # PUBLIC METHODS
+    #
+
+    def __init__(self, position: Position, winner: Optional[PieceColor],
+                 version: int, black_pieces: bytes, red_pieces: bytes):
         """
-        Given a piece on the board, returns a list of positions the piece can
-        non-jump move to. This does not include places the piece can move to
-        with a jump since that is in the _piece_valid_jump method. It will also
-        take into consideration if the piece is a king or not.
+        Constructor
 
         Parameters:
-            start (tuple(int, int)): location of the piece
+            position (Position): position of the game
+            winner (Optional[PieceColor]): winner of the game, if it is over
+            version (int): version of the game's position
+            black_pieces (bytes): slots of black's PieceIndex
+            red_pieces (bytes): slots of red's PieceIndex
+        """
+        setattr_ = object.__setattr__
+        setattr_(self, "_position", position)
+        setattr_(self, "_winner", winner)
+        setattr_(self, "_version", version)
+        setattr_(self, "_black_pieces", bytes(black_pieces))
+        setattr_(self, "_red_pieces", bytes(red_pieces))
 
-        Raises:
-            ValueError: if there is no piece at the given starting position
+    def __setattr__(self, name: str, value: object) -> None:
+        """
+        Snapshots cannot be changed.
 
-        Returns:
-            list[list[tuple(int, int)]]: all possible places the given piece can
-            non-jump move to
+        Raises:
+            AttributeError: Always
         """
-        valid_moves = []
-        row, col = start
-        piece = self._board.get(start)
-        if piece is None:
-            raise ValueError("No piece at starting position")
+        raise AttributeError("GameSnapshot is read-only")
 
-        if piece.get_color() == PieceColor.BLACK or piece.is_king():
-            try:
-                dest = (row + 1, col + 1)
-                if self._board.get(dest) is None:
-                    valid_moves.append([dest])
-            except ValueError:
-                pass
-
-            try:
-                dest = (row + 1, col - 1)
-                if self._board.get(dest) is None:
-                    valid_moves.append([dest])
-            except ValueError:
-                pass
-
-        if piece.get_color() == PieceColor.RED or piece.is_king():
-            try:
-                dest = (row - 1, col + 1)
-                if self._board.get(dest) is None:
-                    valid_moves.append([dest])
-            except ValueError:
-                pass
-
-            try:
-                dest = (row - 1, col - 1)
-                if self._board.get(dest) is None:
-                    valid_moves.append([dest])
-            except ValueError:
-                pass
+    def __delattr__(self, name: str) -> None:
+        """
+        Snapshots cannot be changed.
 
-        return valid_moves
+        Raises:
+            AttributeError: Always
+        """
+        raise AttributeError("GameSnapshot is read-only")
 
-    def _get_complete_jumps(self, start: Tuple[int, int], color: PieceColor,
-            king: bool,
-            jumped: Set[Tuple[int, int]]) -> List[List[Tuple[int, int]]]:
+    def position(self) -> Position:
         """
-        Given a position on the board, a color, king status, and a set of
-        locations that have already been jumped over, returns a list of all the
-        possible complete moves that can be made from the given starting
-        position.
+        Returns the position of the snapshot.
 
         Parameters:
-            start (tuple(int, int)): row and column information of the starting
-            position on the board
-            color (PieceColor): given color
-            king (bool): if the piece is a king (can move in both directions)
-            jumped (set(tuple(int, int))): set of locations that have already
-            been jumped over.
+            None
 
         Returns:
-            list[list[tuple(int, int)]]: list of moves a piece with the given
-            details can make
+            Position: the position
         """
-        if self._get_single_jumps(start, color, king, jumped) == {}:
-            return []
-        else:
-            paths = []
-            for pos, jumped_over in self._get_single_jumps(start, color, king,
-                                                           jumped).items():
-                sub_paths = self._get_complete_jumps(pos, color, king,
-                                                     jumped | {jumped_over})
-                if sub_paths == []:
-                    paths.append([pos])
-                else:
-                    for sub_path in sub_paths:
-                        paths.append([pos] + sub_path)
-            return paths
-
-    def _get_single_jumps(self, start: Tuple[int, int], color: PieceColor,
-            king: bool, jumped: Set[Tuple[int, int]]) -> Dict[Tuple[int, int],
-                                                              Tuple[int, int]]:
-        """
-        Given a starting position on the board, a color, king status, and a set
-        of locations that have already been jumped over, returns a dictionary of
-        the possible single jumps a move with the given details can make. The
-        keys of the dictionary are the possible locations that can be jumped to
-        and the values of the dictionary are sets of locations that must be
-        jumped over to reach each destination.
-
-        Parameters:
-            start (tuple(int, int)): starting location on the board
-            color (PieceColor): given piece color
-            king (bool): king status of the given piece
-            jumped (set(tuple(int, int))): set of locations that have already
-            been jumped over
-
-        Returns:
-            dict{tuple(int, int): tuple(int, int)}: dictionary storing the
-            possible end locations and the locations being jumped over
-        """
-        row, col = start
-        valid = {}
-
-        if color == PieceColor.BLACK or king:
-            try:
-                dest = (row + 2, col + 2)
-                jump_over = (row + 1, col + 1)
-                if (self._board.get(dest) is None and
-                        self._board.get(jump_over) is not None and
-                        self._board.get(jump_over).get_color() != color and
-                        jump_over not in jumped):
-                    valid[dest] = jump_over
-            except ValueError:
-                pass
-
-            try:
-                dest = (row + 2, col - 2)
-                jump_over = (row + 1, col - 1)
-                if (self._board.get(dest) is None and
-                        self._board.get(jump_over) is not None and
-                        self._board.get(jump_over).get_color() != color and
-                        jump_over not in jumped):
-                    valid[dest] = jump_over
-            except ValueError:
-                pass
-            
-        if color == PieceColor.RED or king:
-            try:
-                dest = (row - 2, col + 2)
-                jump_over = (row - 1, col + 1)
-                if (self._board.get(dest) is None and
-                        self._board.get(jump_over) is not None and
-                        self._board.get(jump_over).get_color() != color and
-                        jump_over not in jumped):
-                    valid[dest] = jump_over
-            except ValueError:
-                pass
-                
-            try:
-                dest = (row - 2, col - 2)
-                jump_over = (row - 1, col - 1)
-                if (self._board.get(dest) is None and
-                        self._board.get(jump_over) is not None and
-                        self._board.get(jump_over).get_color() != color and
-                        jump_over not in jumped):
-                    valid[dest] = jump_over
-            except ValueError:
-                pass
-
-        return valid
+        return self._position
 
-    def _require_jump(self, color: PieceColor) -> bool:
+    def board_to_str(self) -> Tuple[Tuple[str, ...], ...]:
         """
-        Given a player color returns a boolean if the player must make a jump
-        with his or her turn. 
+        Returns the board in the same format as CheckersGame.board_to_str.
 
         Parameters:
-            color (PieceColor): player color
+            None
 
         Returns:
-            bool: if the player must make a jump with his or her turn
+            tuple(tuple(str)): the board
         """
-        if (self.turn_incomplete() and
-                self._board.get(self._jumping).get_color() == color):
-            return True
-
-        if color == PieceColor.BLACK:
-            pieces = self._black_piece_coords
-        else:
-            pieces = self._red_piece_coords
-
-        for coord in pieces:
-            if self._get_all_jumps(coord):
-                return True
-        return False
+        return self._position.board_to_str()
 
-    def _composition(self) -> Tuple[int, int, int, int]:
+    def get_turn(self) -> PieceColor:
         """
-        Returns the number of kings and nonking pieces each player currently has
-        on the board.
+        Returns the player whose turn it was.
 
         Parameters:
             None
 
         Returns:
-            tuple (int, int, int, int): tuple of four integers; the first
-            integer is the number of black king pieces on the board, the second
-            integer is the number of black nonking pieces on the board, the
-            third integer is the number of red king pieces on the board, and the
-            fourth integer is the number of red nonking pieces on the board. 
-        """
-        black_king, black_nonking = 0, 0
-        red_king, red_nonking = 0, 0
-
-        for row in self._board.board_to_str():
-            for piece in row:
-                if piece == "B":
-                    black_king += 1
-                elif piece == "b":
-                    black_nonking += 1
-                elif piece == "R":
-                    red_king += 1
-                elif piece == "r":
-                    red_nonking +=1 
-
-        return black_king, black_nonking, red_king, red_nonking
-    
-    def _check_promote(self, color: PieceColor, coord: Tuple[int, int]) -> None:
+            PieceColor: player to move
+        """
+        return self._position.get_turn()
+
+    def player_valid_moves(self, color: PieceColor) -> Dict[
+            Tuple[int, int], List[List[Tuple[int, int]]]]:
         """
-        Checks if the piece at the given position should be promoted to a king.
+        Returns the complete valid moves of all the pieces of the given color,
+        in the same format and order as CheckersGame.player_valid_moves.
 
         Parameters:
-            color (PieceColor): color of the given piece
-            coord (Tuple[int, int]): position of the given piece
+            color (PieceColor): player's color
 
         Returns:
-            None
+            dict{tuple(int, int): list[list[tuple(int, int)]]}: dictionary of
+            the complete valid moves of each piece that can be moved
         """
-        row, _ = coord
-        if ((color == PieceColor.BLACK and
-                row == self._board.get_num_rows() - 1) or
-                (color == PieceColor.RED and row == 0)):
-            self._board.get(coord).promote()
+        moves = {}
+        if color == PieceColor.BLACK:
+            pieces = self._black_pieces
+        else:
+            pieces = self._red_pieces
+        pieces = [square for square in pieces if square != PieceIndex.NO_SLOT]
+        for move in self._position._color_moves(color, pieces):
+            moves.setdefault(move.get_start(), []).append(move.get_path())
+        return moves
 
-    def _update_winner(self, color: PieceColor) -> None:
+    def get_winner(self) -> Optional[PieceColor]:
         """
-        Checks if the given player has won the game or the game has reached a
-        draw.
+        Returns the winner of the game when the snapshot was taken.
 
         Parameters:
-            color (PieceColor): player color
+            None
 
         Returns:
+            PieceColor or None: If there is a winner, return the color. If it is
+            a tie, returns PieceColor.DRAW. Otherwise, return None.
+        """
+        return self._winner
+
+    def evaluate(self) -> float:
+        """
+        Evaluates the position in the same way as CheckersGame.evaluate.
+
+        Parameters:
             None
+
+        Returns:
+            float: value of the position
         """
-        if (color == PieceColor.BLACK and
-                self.player_valid_moves(PieceColor.RED) == {}):
-            self._winner = PieceColor.BLACK
-        elif (color == PieceColor.RED and
-                self.player_valid_moves(PieceColor.BLACK)  == {}):
-            self._winner = PieceColor.RED
-        # check for draw
-        elif (self._black_moves_since_capture >= 40 or
-                self._red_moves_since_capture >= 40):
-            self._winner = PieceColor.DRAW
\ No newline at end of file
+        return self._position.evaluate()
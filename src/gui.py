@@ -9,8 +9,8 @@ from typing import Union, Dict
 import pygame
 import click
 
-from checkers import CheckersGame, Board, PieceColor
-from bot import randomBot, smartBot
+from checkers import Board, PieceColor
+from bot import randomBot, smartBot, SEARCH_MODES, ENGINES
 
 WIDTH = 800
 HEIGHT = 800
@@ -33,13 +33,18 @@ class GUIPlayer:
     board: Board
     color: PieceColor
 
-    def __init__(self, n, player, board, color, depth=3):
+    def __init__(self, n, player, board, color, depth=3, search="minimax",
+                 move_time=None):
         """
         Args:
             n: The player's number (1 or 2)
             player: "human", "random bot", or "smart bot"
             board: The checkers board
             player_color: The player's color
+            depth: Search depth of the smart bot
+            search: Search algorithm of the smart bot (one of SEARCH_MODES)
+            move_time: Seconds the smart bot may think about each move
+                instead of searching to depth (None to search to depth)
         """
         if player == "human":
             self.name = f"Player {n}"
@@ -49,7 +54,8 @@ class GUIPlayer:
             self.bot = randomBot(board, color)
         elif player == "smart-bot":
             self.name = f"Smart Bot {n}"
-            self.bot = smartBot(board, color, depth)
+            self.bot = smartBot(board, color, depth, search,
+                                move_time=move_time)
         self.board = board
         self.color = color
 
@@ -98,6 +104,62 @@ def create_board(surface: pygame.surface.Surface, board):
             radius = rh // 2 - 8
             pygame.draw.circle(surface, color, center, radius)
 
+def draw_square(surface: pygame.surface.Surface, board_grid, coord):
+    """
+    Redraws a single square of the board and the piece on it.
+
+    Args:
+        surface: Pygame surface that the board is drawn on
+        board_grid: The board as returned by board_to_str()
+        coord (tuple (int, int)): The coordinate of the square
+
+    Returns: None
+    """
+    rows = len(board_grid)
+    cols = len(board_grid[0])
+
+    rh = HEIGHT // rows
+    cw = WIDTH // cols
+
+    i, j = coord
+    if i % 2 == j % 2:
+        background = LIGHT_BROWN
+    else:
+        background = DARK_BROWN
+    pygame.draw.rect(surface, background, rect=(j * cw, i * rh, cw, rh))
+
+    piececolor = board_grid[i][j]
+    if piececolor == "R":
+        color = MAROON
+    elif piececolor == "r":
+        color = RED
+    elif piececolor == "B":
+        color = GRAY
+    elif piececolor == "b":
+        color = BLACK
+    else:
+        return
+
+    center = ((j * cw) + (cw // 2), (i * rh) + (rh // 2))
+    radius = rh // 2 - 8
+    pygame.draw.circle(surface, color, center, radius)
+
+def update_board(surface: pygame.surface.Surface, board, move_event):
+    """
+    Redraws only the squares changed by a move. Subscribed to the board so it
+    is called after every move.
+
+    Args:
+        surface: Pygame surface that the board is drawn on
+        board: The checkers board
+        move_event: MoveEvent describing the move
+
+    Returns: None
+    """
+    board_grid = board.board_to_str()
+    for coord in move_event.changed_squares():
+        draw_square(surface, board_grid, coord)
+
 def highlight_moves(start_color, board, surface, start_coord):
     """
     Highlights all valid moves of a piece. 
@@ -146,11 +208,6 @@ def remove_highlight(start_color, board, surface, start_coord):
     rh = HEIGHT // rows
     cw = WIDTH // cols
 
-    x, y = pygame.mouse.get_pos()
-    row = x // rh
-    col = y // cw
-    start_coord = col, row
-
     if start_coord in board.player_valid_moves(start_color).keys():
         for moves in board.player_valid_moves(start_color)[start_coord]:
             for coord in moves:
@@ -203,6 +260,8 @@ def play_checkers(board, players: Dict[PieceColor, GUIPlayer], bot_delay):
 
     surface = pygame.display.set_mode((WIDTH, HEIGHT))
     create_board(surface, board)
+    board.subscribe(lambda move_event: update_board(surface, board,
+                                                    move_event))
     clock = pygame.time.Clock()
 
     # Initialize pieces
@@ -253,7 +312,6 @@ def play_checkers(board, players: Dict[PieceColor, GUIPlayer], bot_delay):
                         remove_highlight(current_player.color, board,
                                          surface, piece1)
                         board.move(current_player.color, piece1, piece2)
-                        create_board(surface, board)
 
                         if not board.turn_incomplete():
                             board.end_turn(current_player.color, "End turn")
@@ -268,9 +326,7 @@ def play_checkers(board, players: Dict[PieceColor, GUIPlayer], bot_delay):
                             
         if current_player.bot is not None:
             pygame.time.wait(int(bot_delay * 1000))
-            start, end = current_player.bot.suggest_move()
-            board.move(current_player.color, start, end)
-            create_board(surface, board)
+            board.play(current_player.bot.choose_move())
 
             if current_player.color == PieceColor.BLACK:
                 current_player = players[PieceColor.RED]
@@ -295,27 +351,33 @@ def play_checkers(board, players: Dict[PieceColor, GUIPlayer], bot_delay):
 @click.option('--rows', required=True, prompt=True,
               type = click.Choice(["2", "3", "4", "5", "6", "7", "8", "9"]))
 @click.option('--bot-delay', type=click.FLOAT, default=0.5)
+@click.option('--search', type=click.Choice(SEARCH_MODES), default="minimax")
+@click.option('--move-time', type=click.FLOAT, default=None)
+@click.option('--engine', type=click.Choice(list(ENGINES)), default="grid")
 
-def command(rows, player1, player2, bot_delay):
+def command(rows, player1, player2, bot_delay, search, move_time, engine):
+    game_cls = ENGINES[engine]
     if rows == "2":
-        board = CheckersGame(2)
+        board = game_cls(2)
     elif rows == "3":
-        board = CheckersGame(3)
+        board = game_cls(3)
     elif rows == "4":
-        board = CheckersGame(4)
+        board = game_cls(4)
     elif rows == "5":
-        board = CheckersGame(5)
+        board = game_cls(5)
     elif rows == "6":
-        board = CheckersGame(6)
+        board = game_cls(6)
     elif rows == "7":
-        board = CheckersGame(7)
+        board = game_cls(7)
     elif rows == "8":
-        board = CheckersGame(8)
+        board = game_cls(8)
     elif rows == "9":
-        board = CheckersGame(9)
+        board = game_cls(9)
 
-    player1 = GUIPlayer(1, player1, board, PieceColor.BLACK)
-    player2 = GUIPlayer(2, player2, board, PieceColor.RED)
+    player1 = GUIPlayer(1, player1, board, PieceColor.BLACK, search=search,
+                        move_time=move_time)
+    player2 = GUIPlayer(2, player2, board, PieceColor.RED, search=search,
+                        move_time=move_time)
     players = {PieceColor.BLACK: player1, PieceColor.RED: player2}
 
     play_checkers(board, players, bot_delay)
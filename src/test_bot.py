@@ -1,6 +1,20 @@
 from checkers import CheckersGame, PieceColor
-from bot import randomBot, smartBot
+from bitboard import BitboardCheckersGame
+from bot import (randomBot, smartBot, BotPlayer, TranspositionTable,
+                 MoveOrdering, perft, perft_divide, EXACT, LOWER)
+import itertools
 import random
+import pytest
+
+# Number of positions after 1, 2, 3, ... moves from the initial position of
+# each number of rows of pieces
+PERFT_REFERENCE = {
+    2: [5, 25, 106, 369, 1271],
+    3: [7, 49, 302, 1469, 7361],
+    4: [9, 81, 658, 4265],
+    5: [11, 121, 1222],
+    9: [19, 361, 6518],
+}
 
 def test_random_1():
     """
@@ -76,6 +90,299 @@ def test_smart_2():
         move = bot.suggest_move()
         assert move == best_move_black
 
+def random_position(rows, plies, seed, game_cls=CheckersGame):
+    """
+    Returns a game after the given number of random complete moves (fewer if
+    the game ends first) and the color of the player to move.
+    """
+    board = game_cls(rows)
+    rng = random.Random(seed)
+    color = PieceColor.BLACK
+    for _ in range(plies):
+        moves = board.generate_moves(color)
+        if not moves or board.get_winner() is not None:
+            break
+        board.play(rng.choice(moves))
+        color = board._turn
+    return board, color
+
+@pytest.mark.parametrize("seed", range(12))
+def test_alphabeta_matches_minimax(seed):
+    """
+    Checks that alpha-beta search returns the same move and value as minimax
+    and leaves the board unchanged.
+    """
+    board, color = random_position(3 + seed % 2, 4 + 3 * seed, seed)
+    before = board.to_fen()
+    for depth in range(1, 5):
+        bot = smartBot(board, color, depth, "alphabeta")
+        expected = bot._minimax(board, depth, color)
+        assert bot._alphabeta(board, depth, color, -float('inf'),
+                              float('inf')) == expected
+        assert board.to_fen() == before
+
+def test_smart_alphabeta():
+    """
+    Checks that the alpha-beta search mode finds the same move as minimax in
+    the puzzle of test_smart_2, and that unknown modes are rejected.
+    """
+    board = CheckersGame(3)
+    board.move(PieceColor.BLACK, (2, 1), (3, 0))
+    board.move(PieceColor.BLACK, (2, 3), (3, 4))
+    board.move(PieceColor.BLACK, (1, 2), (2, 1))
+    board.move(PieceColor.RED, (5, 2), (4, 3))
+    board.move(PieceColor.RED, (6, 1), (5, 2))
+    board.move(PieceColor.RED, (5, 0), (4, 1))
+    board.move(PieceColor.RED, (4, 1), (3, 2))
+
+    player = BotPlayer(board, PieceColor.BLACK, 5, "alphabeta")
+    assert player.bot.suggest_move() == ((2, 5), (3, 6))
+    with pytest.raises(ValueError):
+        smartBot(board, PieceColor.BLACK, 5, "negamax")
+
+def test_transposition_table():
+    """
+    Checks the size limit and the replacement policy of the transposition
+    table.
+    """
+    assert len(TranspositionTable(1)) * TranspositionTable.ENTRY_BYTES <= 2 ** 20
+    with pytest.raises(ValueError):
+        TranspositionTable(0)
+
+    table = TranspositionTable(0.0001)  # a single bucket
+    assert len(table) == 2
+    table.store(1, 5, 1.0, EXACT, None)
+    table.store(2, 3, 2.0, LOWER, 7)    # shallower, goes to the second entry
+    assert table.probe(1)[1:4] == (5, 1.0, EXACT)
+    assert table.probe(2)[1:5] == (3, 2.0, LOWER, 7)
+
+    table.store(3, 1, 3.0, EXACT, None) # replaces the second entry
+    assert table.probe(2) is None and table.probe(1) is not None
+    table.new_search()
+    table.store(4, 1, 4.0, EXACT, None) # first entry is from an old search
+    assert table.probe(1) is None and table.probe(4) is not None
+    assert table.get_stats() == (4, 2, 4, 2)
+
+def test_smart_transposition_table():
+    """
+    Checks that the alpha-beta search with a transposition table finds the
+    same values as minimax and uses the table.
+    """
+    for seed in range(6):
+        board, color = random_position(3, 2 + 2 * seed, seed)
+        before = board.to_fen()
+        bot = smartBot(board, color, 4, "alphabeta", tt_mb=1)
+        for _ in range(2):
+            move = bot.choose_move()
+            assert board.to_fen() == before
+            assert move in board.generate_moves(color)
+            record = board.apply_move(move)
+            _, expected = bot._minimax(board, 3, board._turn)
+            board.unmake_move(record)
+            assert bot._minimax(board, 4, color)[1] == expected
+        hits, _, stores, _ = bot.get_tt_stats()
+        assert hits > 0 and stores > 0
+
+    with pytest.raises(ValueError):
+        smartBot(board, color, 4, tt_mb=1)
+
+@pytest.mark.parametrize("game_cls", [CheckersGame, BitboardCheckersGame])
+@pytest.mark.parametrize("seed", range(4))
+def test_bots_on_engines(game_cls, seed):
+    """
+    Checks that the bots choose valid moves on both engines, that alpha-beta
+    search agrees with minimax and that searching leaves the board and its
+    hash unchanged.
+    """
+    board, color = random_position(3, 2 + 3 * seed, seed, game_cls)
+    before = (board.board_to_str(), board.position_hash())
+    moves = board.generate_moves(color)
+
+    random.seed(seed)
+    assert randomBot(board, color).choose_move() in moves
+    for depth in range(1, 4):
+        bot = smartBot(board, color, depth, "alphabeta")
+        expected = bot._minimax(board, depth, color)
+        assert bot._alphabeta(board, depth, color, -float('inf'),
+                              float('inf')) == expected
+    bot = smartBot(board, color, 3, "alphabeta", tt_mb=1, quiescence_depth=2)
+    move = bot.choose_move()
+    assert move in moves
+    assert (board.board_to_str(), board.position_hash()) == before
+
+    board.play(move)
+    assert board._turn != color
+    with pytest.raises(ValueError):
+        board.play(move)
+
+@pytest.mark.parametrize("search", ["minimax", "alphabeta"])
+def test_play_after_search(search, monkeypatch):
+    """
+    Checks that playing the move a bot chose by searching on the live board
+    does not generate the valid moves again, and that a move from another
+    position is still checked.
+    """
+    board, color = random_position(3, 4, 2)
+    move = smartBot(board, color, 3, search).choose_move()
+
+    calls = []
+    generate_moves = board.generate_moves
+    def spy(color):
+        calls.append(color)
+        return generate_moves(color)
+    monkeypatch.setattr(board, "generate_moves", spy)
+
+    board.play(move)
+    assert calls == []
+    with pytest.raises(ValueError):
+        board.play(move)
+    assert calls == [color]
+
+@pytest.mark.parametrize("search", ["minimax", "alphabeta"])
+def test_smart_time_limit(search):
+    """
+    Checks that a timed search returns the move of the deepest completed
+    search and leaves the board unchanged. The bot's clock advances one
+    second every time it is read, so the time limit is a budget of searched
+    positions and the test does not depend on the speed of the machine.
+    """
+    board, color = random_position(3, 6, 1)
+    before = board.to_fen()
+    ticks = itertools.count()
+    bot = smartBot(board, color, 2, search, clock=lambda: next(ticks))
+
+    move = bot.choose_move(time_limit=0)
+    assert bot.get_last_depth() == 1
+    assert move == bot._minimax(board, 1, color)[0]
+
+    depths = []
+    for time_limit in (10, 100, 1000):
+        move = bot.choose_move(time_limit=time_limit)
+        depth = bot.get_last_depth()
+        assert move == bot._search_to_depth(board, depth)[0]
+        assert board.to_fen() == before
+        depths.append(depth)
+    assert depths == sorted(depths) and depths[-1] >= 2
+
+    # with the real clock, the move can be played on the board it was
+    # chosen for
+    bot = smartBot(board, color, 2, search)
+    start, end = bot.suggest_move(time_limit=0.05)
+    assert board.is_valid_move(color, start, end)
+
+def test_move_ordering():
+    """
+    Checks the order of captures, killer moves and history moves.
+    """
+    board = CheckersGame.from_fen("B:B13,14:R17,18,27,29:8:-:0:0")
+    moves = board.generate_moves(PieceColor.BLACK)
+    ordering = MoveOrdering()
+    ordered = ordering.order(board, moves, 0, None)
+    assert len(ordered[0].get_captures()) == 2
+    assert ordered[1:] == [move for move in moves if move != ordered[0]]
+    assert ordering.order(board, moves, 0, moves[-1].get_key())[0] == moves[-1]
+
+    board = CheckersGame(3)
+    moves = board.generate_moves(PieceColor.BLACK)
+    ordering.record_cutoff(moves[3], 2, 4)
+    ordering.record_cutoff(moves[5], 1, 1)
+    assert ordering.order(board, moves, 2, None)[0] == moves[3]
+    ordered = ordering.order(board, moves, 0, None)
+    assert ordered[:2] == [moves[3], moves[5]]
+
+    ordering.new_search()
+    assert ordering.order(board, moves, 2, None)[0] == moves[3]
+    ordering.record_cutoff(moves[6], 2, 3)
+    assert ordering.order(board, moves, 2, None)[:2] == [moves[6], moves[3]]
+
+def test_smart_move_ordering():
+    """
+    Checks that move ordering changes neither the value found nor the
+    quality of the move chosen, and that the cutoff counters are kept.
+    """
+    for seed in range(6):
+        board, color = random_position(3, 3 * seed, seed)
+        bot = smartBot(board, color, 4, "alphabeta", ordering=MoveOrdering())
+        _, expected = bot._minimax(board, 4, color)
+        move, value = bot._alphabeta(board, 4, color, -float('inf'),
+                                     float('inf'))
+        assert value == expected
+        if move is not None:
+            record = board.apply_move(move)
+            assert bot._minimax(board, 3, board._turn)[1] == expected
+            board.unmake_move(record)
+
+        cutoffs, first_move_cutoffs = bot.get_cutoff_stats()
+        assert 0 < first_move_cutoffs <= cutoffs
+
+    with pytest.raises(ValueError):
+        smartBot(board, color, 4, ordering=MoveOrdering())
 
+def test_quiescence():
+    """
+    Checks that pending captures are played out before evaluating, that a
+    player who has to capture cannot stand pat and that the extension depth
+    is respected.
+    """
+    board = CheckersGame.from_fen("R:B1,14:R18:8:-:0:0")
+    before = board.to_fen()
+    bot = smartBot(board, PieceColor.RED, 1, "alphabeta", quiescence_depth=4)
+    inf = float('inf')
+    assert bot._quiescence(board, PieceColor.RED, -inf, inf, 4) == 0
+    assert bot._quiescence(board, PieceColor.RED, -inf, inf, 0) == 1
+    assert board.to_fen() == before
 
+    # black has to capture and then loses two pieces for one; the
+    # evaluation before the exchange (-1) must not be kept
+    board = CheckersGame.from_fen("B:B1,14,15:R18,22,26,30:8:-:0:0")
+    bot = smartBot(board, PieceColor.BLACK, 1, "alphabeta",
+                   quiescence_depth=8)
+    assert bot._quiescence(board, PieceColor.BLACK, -inf, inf, 8) == -2
+    # nor used to cut the search off
+    assert bot._quiescence(board, PieceColor.BLACK, -inf, -1.5, 8) == -2
+
+    # moving to (4, 3) loses the piece, which a depth 1 search only sees
+    # with quiescence search
+    board = CheckersGame.from_fen("B:B14:R23,29:8:-:0:0")
+    plain = smartBot(board, PieceColor.BLACK, 1, "alphabeta")
+    assert plain.suggest_move() == ((3, 2), (4, 3))
+    quiet = smartBot(board, PieceColor.BLACK, 1, "alphabeta",
+                     quiescence_depth=2)
+    assert quiet.suggest_move() == ((3, 2), (4, 1))
+
+    with pytest.raises(ValueError):
+        smartBot(board, PieceColor.BLACK, 1, quiescence_depth=2)
+
+@pytest.mark.parametrize("game_cls", [CheckersGame, BitboardCheckersGame])
+@pytest.mark.parametrize("rows", sorted(PERFT_REFERENCE))
+def test_perft(game_cls, rows):
+    """
+    Checks the move generators against the reference position counts.
+    """
+    board = game_cls(rows)
+    before = board.board_to_str()
+    for depth, expected in enumerate(PERFT_REFERENCE[rows], 1):
+        assert perft(board, PieceColor.BLACK, depth) == expected
+    assert board.board_to_str() == before
+
+def test_perft_fen():
+    """
+    Checks that counting from a position written with to_fen gives the same
+    count as counting from the game it was written from.
+    """
+    for seed in range(4):
+        board, color = random_position(3, 3 + 2 * seed, seed)
+        copy = CheckersGame.from_fen(board.to_fen())
+        assert copy.position().get_turn() == color
+        assert perft(copy, color, 3) == perft(board, color, 3)
+
+def test_perft_divide():
+    """
+    Checks that the divide counts add up to the perft count and that each
+    first move is listed once.
+    """
+    board = CheckersGame(3)
+    counts = perft_divide(board, PieceColor.BLACK, 3)
 
+    assert len(counts) == PERFT_REFERENCE[3][0]
+    assert sum(counts.values()) == PERFT_REFERENCE[3][2]
@@ -1,19 +1,33 @@
-from checkers import CheckersGame, PieceColor
+import pickle
+import random
 
-def test_create_board():
-    g = CheckersGame(2)
-    assert len(g._black_piece_coords) == len(g._red_piece_coords) == 6
+import pytest
 
-def test_valid_move_1():
-    g = CheckersGame(3)
+from checkers import (CheckersGame, PieceColor, PieceIndex, get_move_tables,
+                      BLACK_MAN, RED_MAN, BLACK_KING, RED_KING)
+from bitboard import BitboardCheckersGame
+
+@pytest.fixture(params=[CheckersGame, BitboardCheckersGame])
+def game_cls(request):
+    return request.param
+
+def count_pieces(game, piece):
+    return sum(row.count(piece) for row in game.board_to_str())
+
+def test_create_board(game_cls):
+    g = game_cls(2)
+    assert count_pieces(g, "b") == count_pieces(g, "r") == 6
+
+def test_valid_move_1(game_cls):
+    g = game_cls(3)
     assert g.is_valid_dest((5, 0), (4, 1))
 
-def test_valid_moves_2():
-    g = CheckersGame(3)
+def test_valid_moves_2(game_cls):
+    g = game_cls(3)
     assert g.is_valid_dest((5, 0), (10, 1)) is False
 
-def test_no_pieces():
-    game = CheckersGame(2)
+def test_no_pieces(game_cls):
+    game = game_cls(2)
     game.move(PieceColor.RED, (4, 1), (3, 2))
     game.move(PieceColor.RED, (3, 2), (2, 1))
     game.move(PieceColor.BLACK, (1, 2), (3, 0))
@@ -33,8 +47,8 @@ def test_no_pieces():
 
     assert game.get_winner() == PieceColor.BLACK
 
-def test_block_win():
-    g = CheckersGame(2)
+def test_block_win(game_cls):
+    g = game_cls(2)
     g.move(PieceColor.RED, (4, 1), (3, 0))
     g.move(PieceColor.RED, (3, 0), (2, 1))
     g.move(PieceColor.RED, (4, 3), (3, 2))
@@ -50,40 +64,664 @@ def test_block_win():
 
     assert g.get_winner() == PieceColor.RED
 
-def test_move():
-    g = CheckersGame(5)
+def test_move(game_cls):
+    g = game_cls(5)
     g.move(PieceColor.BLACK, (4, 1), (5, 0))
 
-    assert (g._board.get((5, 0)) is not None and
-            g._board.get((5, 0)).get_color() == PieceColor.BLACK)
+    assert g.board_to_str()[5][0] == "b"
 
-def test_single_jump():
-    g = CheckersGame(5)
+def test_single_jump(game_cls):
+    g = game_cls(5)
     g.move(PieceColor.BLACK, (4, 1), (5, 0))
     g.move(PieceColor.RED, (7, 2), (6, 1))
     g.move(PieceColor.BLACK, (5, 0), (7, 2))
 
-    assert (g._board.get((7, 2)) is not None and
-            g._board.get((7, 2)).get_color() == PieceColor.BLACK)
+    assert g.board_to_str()[7][2] == "b"
 
-def test_multijump():
-    g = CheckersGame(5)
+def test_multijump(game_cls):
+    g = game_cls(5)
     g.move(PieceColor.BLACK, (4, 1), (5, 0))
     g.move(PieceColor.RED, (7, 2), (6, 1))
-    g._board.remove((9, 0))
-    g._red_piece_coords.remove((9, 0))
-    g._board.remove((11, 2))
-    g._red_piece_coords.remove((11, 2))
+    g._remove_piece((9, 0))
+    g._remove_piece((11, 2))
     g.move(PieceColor.BLACK, (5, 0), (9, 0))
-    
-    assert (g._board.get((9, 0)) is not None and
-            g._board.get((9, 0)).get_color() == PieceColor.BLACK)
 
-def test_promote():
+    assert g.board_to_str()[9][0] == "b"
+
+def test_promote(game_cls):
+    g = game_cls(2)
+    g.move(PieceColor.BLACK, (1, 0), (2, 1))
+    g.move(PieceColor.BLACK, (2, 1), (3, 2))
+    g._remove_piece((0, 3))
+    g.move(PieceColor.RED, (4, 3), (0, 3))
+
+    assert g.board_to_str()[0][3] == "R"
+
+@pytest.mark.parametrize("nrows", [2, 3, 5, 9])
+def test_bitboard_matches_grid(nrows):
+    """
+    Plays random games on both backends and checks that they agree on the
+    valid moves, the board, the winner and the move events after every move.
+    """
+    rng = random.Random(nrows)
+    grid = CheckersGame(nrows)
+    bits = BitboardCheckersGame(nrows)
+    grid_events, bits_events = [], []
+    grid.subscribe(grid_events.append)
+    bits.subscribe(bits_events.append)
+    color = PieceColor.BLACK
+
+    for _ in range(150):
+        if grid.get_winner() is not None:
+            break
+        grid_moves = grid.player_valid_moves(color)
+        bits_moves = bits.player_valid_moves(color)
+        assert sorted(grid_moves.items()) == sorted(bits_moves.items())
+        assert grid.evaluate() == bits.evaluate()
+        assert ({(move, move.get_captures())
+                 for move in grid.generate_moves(color)} ==
+                {(move, move.get_captures())
+                 for move in bits.generate_moves(color)})
+        for move in bits.generate_moves(color):
+            assert bits.move_promotes(move) == grid.move_promotes(move)
+
+        if rng.random() < 0.5:
+            start = rng.choice(sorted(grid_moves))
+            end = rng.choice(grid_moves[start])[-1]
+            grid.move(color, start, end)
+            bits.move(color, start, end)
+        else:
+            move = rng.choice(grid.generate_moves(color))
+            grid.play(move)
+            bits.play(move)
+        assert grid.board_to_str() == bits.board_to_str()
+        assert grid.get_winner() == bits.get_winner()
+        assert grid._turn == bits._turn
+        assert ([vars(event) for event in grid_events] ==
+                [vars(event) for event in bits_events])
+
+        if not grid.turn_incomplete():
+            if color == PieceColor.BLACK:
+                color = PieceColor.RED
+            else:
+                color = PieceColor.BLACK
+
+def game_state(game):
+    return (game.board_to_str(), game._jumping, game.get_winner(),
+            game._black_moves_since_capture, game._red_moves_since_capture,
+            list(game.player_valid_moves(PieceColor.BLACK).items()),
+            list(game.player_valid_moves(PieceColor.RED).items()))
+
+@pytest.mark.parametrize("nrows", [2, 3, 6])
+def test_make_unmake_restores(game_cls, nrows):
+    """
+    Makes and takes back every valid move along a random game and checks that
+    the game is exactly restored each time.
+    """
+    rng = random.Random(nrows)
+    g = game_cls(nrows)
+    color = PieceColor.BLACK
+
+    for _ in range(80):
+        moves = g.player_valid_moves(color)
+        if not moves:
+            break
+        before = game_state(g)
+        for start, paths in moves.items():
+            for path in paths:
+                record = g.make_move(color, start, path)
+                assert g.board_to_str()[path[-1][0]][path[-1][1]] != " "
+                g.unmake_move(record)
+                assert game_state(g) == before
+
+        start = rng.choice(sorted(moves))
+        g.make_move(color, start, rng.choice(moves[start]))
+        if color == PieceColor.BLACK:
+            color = PieceColor.RED
+        else:
+            color = PieceColor.BLACK
+
+def test_move_cache():
+    """
+    Checks that queries between two moves compute the valid moves of each
+    player only once.
+    """
+    g = CheckersGame(3)
+    g.player_valid_moves(PieceColor.BLACK)
+    hits, misses = g.get_move_cache_stats()
+
+    g.player_valid_moves(PieceColor.BLACK)
+    assert g.is_valid_move(PieceColor.BLACK, (2, 1), (3, 0))
+    assert not g.is_valid_move(PieceColor.BLACK, (2, 1), (4, 3))
+    assert g.get_move_cache_stats() == (hits + 3, misses)
+
+    # the piece and Move views are built from the same valid moves
+    assert g.piece_valid_moves((2, 1)) is \
+        g.player_valid_moves(PieceColor.BLACK)[(2, 1)]
+    assert g.is_valid_dest((2, 1), (3, 0))
+    moves = g.generate_moves(PieceColor.BLACK)
+    assert [(move.get_start(), move.get_path()) for move in moves] == \
+        list(g.iter_moves(PieceColor.BLACK))
+    assert g.generate_moves(PieceColor.BLACK) is moves
+    assert g.get_move_cache_stats()[1] == misses
+
+    g.move(PieceColor.BLACK, (2, 1), (3, 0))
+    assert (3, 0) in g.player_valid_moves(PieceColor.BLACK)
+    assert (2, 1) not in g.player_valid_moves(PieceColor.BLACK)
+    assert g.get_move_cache_stats()[1] == misses + 1
+
+    # a piece that cannot move because another piece has to jump
+    g = CheckersGame.from_fen("B:B1,14:R18:8:-:0:0")
+    assert list(g.player_valid_moves(PieceColor.BLACK)) == [(3, 2)]
+    assert sorted(g.piece_valid_moves((0, 1))) == [[(1, 0)], [(1, 2)]]
+
+def test_composition_counts():
+    """
+    Checks that the piece counts kept by the game match the board after moves,
+    captures, promotions and undone moves.
+    """
+    rng = random.Random(4)
+    g = CheckersGame(3)
+    color = PieceColor.BLACK
+
+    for _ in range(120):
+        moves = g.player_valid_moves(color)
+        if not moves:
+            break
+        start = rng.choice(sorted(moves))
+        path = rng.choice(moves[start])
+        g.unmake_move(g.make_move(color, start, path))
+        g.make_move(color, start, path)
+        assert g._composition() == (count_pieces(g, "B"), count_pieces(g, "b"),
+                                    count_pieces(g, "R"), count_pieces(g, "r"))
+        if color == PieceColor.BLACK:
+            color = PieceColor.RED
+        else:
+            color = PieceColor.BLACK
+
+def test_position_hash_incremental():
+    """
+    Plays a random game with hash checking on, which raises if the
+    incremental hash ever differs from a full recomputation.
+    """
+    rng = random.Random(5)
+    g = CheckersGame(4, check_hash=True)
+    color = PieceColor.BLACK
+
+    for _ in range(150):
+        moves = g.player_valid_moves(color)
+        if not moves or g.get_winner() is not None:
+            break
+        start = rng.choice(sorted(moves))
+        path = rng.choice(moves[start])
+        before = g.position_hash()
+        g.unmake_move(g.make_move(color, start, path))
+        assert g.position_hash() == before
+        g.move(color, start, path[0])
+        if not g.turn_incomplete():
+            if color == PieceColor.BLACK:
+                color = PieceColor.RED
+            else:
+                color = PieceColor.BLACK
+
+def test_position_hash_transposition():
+    """
+    Checks that the same position reached by different move orders has the
+    same hash and that the player to move changes the hash.
+    """
+    g1 = CheckersGame(3)
+    g1.move(PieceColor.BLACK, (2, 1), (3, 0))
+    g1.move(PieceColor.RED, (5, 6), (4, 7))
+    g1.move(PieceColor.BLACK, (2, 3), (3, 2))
+    g1.move(PieceColor.RED, (5, 4), (4, 5))
+
+    g2 = CheckersGame(3)
+    g2.move(PieceColor.BLACK, (2, 3), (3, 2))
+    g2.move(PieceColor.RED, (5, 4), (4, 5))
+    g2.move(PieceColor.BLACK, (2, 1), (3, 0))
+    g2.move(PieceColor.RED, (5, 6), (4, 7))
+
+    assert g1.position_hash() == g2.position_hash()
+    assert g1.position_hash() == g1._compute_hash()
+
+    g2._set_turn(PieceColor.RED)
+    assert g1.position_hash() != g2.position_hash()
+
+def test_iter_complete_jumps():
+    """
+    Checks that the jump paths can be produced lazily and in the same order
+    as the full list.
+    """
+    g = CheckersGame(5)
+    g.move(PieceColor.BLACK, (4, 1), (5, 0))
+    g.move(PieceColor.RED, (7, 2), (6, 1))
+    g._remove_piece((9, 0))
+    g._remove_piece((11, 2))
+
+    jumps = g._get_all_jumps((5, 0))
+    assert jumps == [[(7, 2), (9, 0), (11, 2)]]
+    index = g._tables.index
+    lazy = g._iter_complete_jumps(index[(5, 0)], BLACK_MAN, set())
+    assert next(lazy) == [index[coord] for coord in jumps[0]]
+    assert next(lazy, None) is None
+
+def test_move_tables():
+    """
+    Checks that the move tables are shared by games of the same size and only
+    contain squares on the board.
+    """
+    assert CheckersGame(2)._tables is CheckersGame(2)._tables
+    assert CheckersGame(2)._tables is not CheckersGame(3)._tables
+
+    tables = get_move_tables(6)
+    index = tables.index
+    assert len(tables.coords) == 18
+    assert tables.steps[BLACK_MAN][index[(0, 1)]] == (index[(1, 2)],
+                                                      index[(1, 0)])
+    assert tables.steps[RED_MAN][index[(0, 1)]] == ()
+    assert tables.jumps[BLACK_KING][index[(5, 0)]] == ((index[(4, 1)],
+                                                        index[(3, 2)]),)
+    assert tables.jumped_over[index[(5, 0)]] == {index[(3, 2)]: index[(4, 1)]}
+    assert tables.promotes[RED_MAN][index[(0, 1)]]
+    assert not tables.promotes[BLACK_MAN][index[(0, 1)]]
+
+def test_board_storage():
+    """
+    Checks that the board stores one piece code per dark square and that
+    Board.get returns pieces matching the codes.
+    """
     g = CheckersGame(2)
     g.move(PieceColor.BLACK, (1, 0), (2, 1))
     g.move(PieceColor.BLACK, (2, 1), (3, 2))
-    g._board.remove((0, 3))
+    g._remove_piece((0, 3))
     g.move(PieceColor.RED, (4, 3), (0, 3))
 
-    assert g._board.get((0, 3)).is_king()
\ No newline at end of file
+    squares = g._board.get_squares()
+    assert len(squares) == 18
+    assert squares[g._tables.index[(0, 3)]] == RED_KING
+    piece = g._board.get((0, 3))
+    assert piece.get_color() == PieceColor.RED and piece.is_king()
+    assert g._board.get((0, 0)) is None
+    with pytest.raises(ValueError):
+        g._board.set((0, 0), piece)
+
+def test_piece_index():
+    """
+    Checks that pieces keep their slot when moved and can be put back into
+    their slot after being removed.
+    """
+    pieces = PieceIndex(10)
+    for square in (4, 1, 7):
+        pieces.add(square)
+
+    pieces.move(4, 5)
+    assert list(pieces) == [5, 1, 7]
+    slot = pieces.remove(1)
+    assert list(pieces) == [5, 7] and len(pieces) == 2
+    assert 1 not in pieces and 7 in pieces
+    pieces.restore(1, slot)
+    assert list(pieces) == [5, 1, 7] and pieces.slot(1) == slot
+    with pytest.raises(ValueError):
+        pieces.remove(4)
+
+def test_capture_sets():
+    """
+    Checks that the incrementally updated sets of pieces that can capture
+    match a full scan of the board during a random game with undone moves.
+    """
+    rng = random.Random(6)
+    g = CheckersGame(4)
+    color = PieceColor.BLACK
+
+    for _ in range(150):
+        moves = g.player_valid_moves(color)
+        if not moves:
+            break
+        start = rng.choice(sorted(moves))
+        path = rng.choice(moves[start])
+        g.unmake_move(g.make_move(color, start, path))
+        g.make_move(color, start, path)
+
+        for player in (PieceColor.BLACK, PieceColor.RED):
+            coords = g._tables.coords
+            expected = set()
+            for row in range(g._board.get_num_rows()):
+                for col in range(g._board.get_num_cols()):
+                    piece = g._board.get((row, col))
+                    if (piece is not None and piece.get_color() == player and
+                            g._get_all_jumps((row, col))):
+                        expected.add((row, col))
+            assert {coords[square] for square in
+                    g._player_captures(player)} == expected
+        if color == PieceColor.BLACK:
+            color = PieceColor.RED
+        else:
+            color = PieceColor.BLACK
+
+def test_has_legal_move():
+    """
+    Checks that has_legal_move agrees with player_valid_moves, including
+    for a player whose pieces are all blocked.
+    """
+    g = CheckersGame(2)
+    g.move(PieceColor.RED, (4, 1), (3, 0))
+    g.move(PieceColor.RED, (3, 0), (2, 1))
+    g.move(PieceColor.RED, (4, 3), (3, 2))
+    g.move(PieceColor.RED, (3, 2), (2, 3))
+    g.move(PieceColor.RED, (4, 5), (3, 4))
+    assert g.has_legal_move(PieceColor.BLACK)
+    g.move(PieceColor.RED, (3, 4), (2, 5))
+    g.move(PieceColor.RED, (5, 0), (4, 1))
+    g.move(PieceColor.RED, (4, 1), (3, 0))
+    g.move(PieceColor.RED, (5, 2), (4, 3))
+    g.move(PieceColor.RED, (4, 3), (3, 2))
+    g.move(PieceColor.RED, (5, 4), (4, 5))
+    g.move(PieceColor.RED, (4, 5), (3, 4))
+
+    assert not g.has_legal_move(PieceColor.BLACK)
+    assert g.player_valid_moves(PieceColor.BLACK) == {}
+    assert g.get_winner() == PieceColor.RED
+
+def test_iter_moves():
+    """
+    Checks that iter_moves yields the moves of player_valid_moves in the same
+    order and only captures when a capture is available.
+    """
+    g = CheckersGame(5)
+    moves = g.iter_moves(PieceColor.BLACK)
+    assert next(moves) == ((4, 1), [(5, 2)])
+
+    g.move(PieceColor.BLACK, (4, 1), (5, 0))
+    g.move(PieceColor.RED, (7, 2), (6, 1))
+    g._remove_piece((9, 0))
+    g._remove_piece((11, 2))
+    expected = [(start, path) for start, paths in
+                g.player_valid_moves(PieceColor.BLACK).items()
+                for path in paths]
+    assert list(g.iter_moves(PieceColor.BLACK)) == expected
+    assert expected == [((5, 0), [(7, 2), (9, 0), (11, 2)])]
+
+def test_generate_moves():
+    """
+    Checks that generated moves match player_valid_moves and encode their
+    squares and captures.
+    """
+    g = CheckersGame(5)
+    g.move(PieceColor.BLACK, (4, 1), (5, 0))
+    g.move(PieceColor.RED, (7, 2), (6, 1))
+    g._remove_piece((9, 0))
+    g._remove_piece((11, 2))
+
+    moves = g.generate_moves(PieceColor.BLACK)
+    assert [(move.get_start(), move.get_path()) for move in moves] == \
+        list(g.iter_moves(PieceColor.BLACK))
+    move = moves[0]
+    index = g._tables.index
+    assert move.get_end() == (11, 2)
+    assert move.get_captures() == (index[(6, 1)], index[(8, 1)],
+                                   index[(10, 1)])
+    assert move == g.generate_moves(PieceColor.BLACK)[0]
+    assert len({move, moves[0]}) == 1
+
+def test_play():
+    """
+    Checks that play makes a whole move and rejects moves that are no longer
+    valid.
+    """
+    g = CheckersGame(3)
+    move = g.generate_moves(PieceColor.BLACK)[0]
+    g.play(move)
+    assert g.board_to_str()[3][2] == "b"
+    assert not g.turn_incomplete()
+
+    with pytest.raises(ValueError):
+        g.play(move)
+
+    reply = g.generate_moves(PieceColor.RED)[0]
+    record = g.apply_move(reply)
+    g.unmake_move(record)
+    g.play(reply)
+    assert g.board_to_str()[4][1] == "r"
+
+def full_state(game):
+    return (game_state(game), game.position_hash(), game._composition(),
+            game._turn, list(game._black_pieces), list(game._red_pieces))
+
+def test_clone_and_pickle():
+    """
+    Checks that clones and unpickled copies match the game exactly and are
+    independent of it.
+    """
+    rng = random.Random(7)
+    g = CheckersGame(4)
+    color = PieceColor.BLACK
+    for _ in range(30):
+        moves = g.generate_moves(color)
+        g.play(rng.choice(moves))
+        if color == PieceColor.BLACK:
+            color = PieceColor.RED
+        else:
+            color = PieceColor.BLACK
+    start, path = next(g.iter_moves(color))
+    g.move(color, start, path[0])
+
+    state = pickle.dumps(g)
+    for copy in (g.clone(), pickle.loads(state)):
+        assert full_state(copy) == full_state(g)
+        move = copy.generate_moves(copy._turn)[0]
+        copy.play(move)
+        assert full_state(copy) != full_state(g)
+        assert copy.position_hash() == copy._compute_hash()
+    assert len(state) < 200
+
+def test_fen_round_trip():
+    """
+    Checks that to_fen and from_fen rebuild the same position along a random
+    game, including a piece in the middle of a jump.
+    """
+    g = CheckersGame(3)
+    assert g.to_fen() == ("B:B1,2,3,4,5,6,7,8,9,10,11,12:"
+                          "R21,22,23,24,25,26,27,28,29,30,31,32:8:-:0:0")
+
+    rng = random.Random(8)
+    g = CheckersGame(4, check_hash=True)
+    color = PieceColor.BLACK
+    for _ in range(120):
+        if g.get_winner() is not None:
+            break
+        start, path = rng.choice(list(g.iter_moves(color)))
+        g.move(color, start, path[0])
+        copy = CheckersGame.from_fen(g.to_fen(), check_hash=True)
+        assert copy.to_fen() == g.to_fen()
+        assert copy.board_to_str() == g.board_to_str()
+        assert copy.position_hash() == g.position_hash()
+        assert copy._composition() == g._composition()
+        assert sorted(copy.player_valid_moves(color).items()) == \
+            sorted(g.player_valid_moves(color).items())
+        if not g.turn_incomplete():
+            if color == PieceColor.BLACK:
+                color = PieceColor.RED
+            else:
+                color = PieceColor.BLACK
+
+@pytest.mark.parametrize("fen", ["", "B:B1:R2:8:-:0", "X:B1:R32:8:-:0:0",
+                                 "B:B1,1:R32:8:-:0:0", "B:B1:R33:8:-:0:0",
+                                 "B:B1:R32:7:-:0:0", "B:B1:R32:8:5:0:0",
+                                 "B:B1:R32:8:32:0:0", "R:B1:R32:8:1:0:0",
+                                 "B:B1:R32:8:-:-1:0", "B:B1:R32:8:-:0:-1",
+                                 "B:B1:R32:8:-:65536:0", "B:B1:R2:4:-:0:0",
+                                 "B:B1:R32:22:-:0:0"])
+def test_fen_invalid(fen):
+    with pytest.raises(ValueError):
+        CheckersGame.from_fen(fen)
+
+def test_fen_limits():
+    """
+    Checks that the smallest and largest boards and the largest counters are
+    accepted and survive pickling.
+    """
+    for fen in ("B:B1:R18:6:-:0:0", "B:B1:R200:20:-:0:0",
+                "B:B1:R32:8:-:65535:65535"):
+        g = CheckersGame.from_fen(fen)
+        assert pickle.loads(pickle.dumps(g)).to_fen() == fen
+
+def test_position():
+    """
+    Checks that Position generates the same moves as the game and that
+    applying moves gives the same positions as playing them.
+    """
+    rng = random.Random(9)
+    g = CheckersGame(4)
+    position = g.position()
+    seen = {position: 0}
+
+    for i in range(1, 120):
+        if g.get_winner() is not None:
+            break
+        moves = g.generate_moves(g._turn)
+        assert set(position.generate_moves()) == set(moves)
+        move = rng.choice(moves)
+        g.play(move)
+        position = position.apply(move)
+        assert position == g.position()
+        assert hash(position) == hash(g.position())
+        assert position.board_to_str() == g.board_to_str()
+        assert position.evaluate() == g.evaluate()
+        seen[position] = i
+
+    assert position.get_winner() == g.get_winner()
+    assert g.position() in seen
+    with pytest.raises(AttributeError):
+        position._turn = PieceColor.RED
+    assert pickle.loads(pickle.dumps(position)) == position
+
+def test_board_snapshot():
+    """
+    Checks that board_to_str returns the same immutable snapshot until the
+    position changes and then only rebuilds the rows that changed.
+    """
+    g = CheckersGame(3)
+    before = g.board_to_str()
+    assert g.board_to_str() is before
+    assert isinstance(before, tuple) and isinstance(before[0], tuple)
+
+    g.move(PieceColor.BLACK, (2, 1), (3, 0))
+    after = g.board_to_str()
+    assert after[2][1] == " " and after[3][0] == "b"
+    assert after[0] is before[0] and after[2] is not before[2]
+
+    copy = g.clone()
+    copy.move(PieceColor.RED, (5, 0), (4, 1))
+    assert copy.board_to_str()[4][1] == "r"
+    assert g.board_to_str() == after
+
+    # moves made without move or play are found by comparing the boards
+    rng = random.Random(18)
+    for _ in range(20):
+        moves = g.generate_moves(g._turn)
+        if not moves:
+            break
+        if rng.random() < 0.5:
+            g.play(rng.choice(moves))
+        else:
+            g.apply_move(rng.choice(moves))
+        assert g.board_to_str() == g.position().board_to_str()
+    g.setup()
+    assert g.board_to_str() == before
+
+def test_move_events():
+    """
+    Checks that listeners get an event for every move played with move or
+    play, and none for moves made while searching.
+    """
+    fen = "B:B14:R18,27,29:8:-:0:0"
+    g = CheckersGame.from_fen(fen)
+    events = []
+    g.subscribe(events.append)
+
+    g.move(PieceColor.BLACK, (3, 2), (5, 4))
+    event = events[-1]
+    assert event.color == PieceColor.BLACK
+    assert (event.vacated, event.occupied) == ([(3, 2)], [(5, 4)])
+    assert event.captured == [(4, 3)] and event.promoted is None
+    assert not event.turn_complete and event.winner is None
+
+    g.move(PieceColor.BLACK, (5, 4), (7, 6))
+    event = events[-1]
+    assert event.captured == [(6, 5)] and event.promoted == (7, 6)
+    assert event.turn_complete
+    assert event.changed_squares() == [(5, 4), (6, 5), (7, 6)]
+
+    g = CheckersGame.from_fen(fen)
+    g.subscribe(events.append)
+    del events[:]
+    move = g.generate_moves(PieceColor.BLACK)[0]
+    g.unmake_move(g.apply_move(move))
+    assert events == []
+
+    g.play(move)
+    assert len(events) == 1
+    assert events[0].captured == [(4, 3), (6, 5)]
+    assert events[0].occupied == [(7, 6)] and events[0].promoted == (7, 6)
+
+    g.unsubscribe(events.append)
+    g.play(g.generate_moves(PieceColor.RED)[0])
+    assert len(events) == 1
+    with pytest.raises(ValueError):
+        g.unsubscribe(events.append)
+    assert g.clone()._listeners == []
+
+def test_snapshot():
+    """
+    Checks that snapshots answer queries like the game they were taken from
+    and are not changed by later moves.
+    """
+    g = CheckersGame(3)
+    rng = random.Random(20)
+    for _ in range(30):
+        if g.get_winner() is not None:
+            break
+        snap = g.snapshot()
+        assert g.snapshot() is snap
+        fen = g.to_fen()
+        expected = {color: g.player_valid_moves(color)
+                    for color in (PieceColor.BLACK, PieceColor.RED)}
+
+        start, paths = rng.choice(list(g.player_valid_moves(g._turn).items()))
+        g.move(g._turn, start, rng.choice(paths)[0])
+        assert g.snapshot() is not snap
+
+        for color, moves in expected.items():
+            # same moves in the same order as the game
+            assert (list(snap.player_valid_moves(color).items()) ==
+                    list(moves.items()))
+        assert snap.evaluate() == CheckersGame.from_fen(fen).evaluate()
+        assert snap.board_to_str() == CheckersGame.from_fen(fen).board_to_str()
+        assert snap.get_winner() is None
+
+    g.end_turn(g._turn, "Resign")
+    assert g.snapshot().get_winner() == g.get_winner()
+    with pytest.raises(AttributeError):
+        g.snapshot()._winner = None
+
+@pytest.mark.parametrize("nrows", [2, 9])
+def test_snapshot_cost(nrows, monkeypatch):
+    """
+    Checks that taking a snapshot copies the game's buffers without going
+    through the pieces one by one or hashing the position, so it does not get
+    slower with more pieces.
+    """
+    g = CheckersGame(nrows)
+    g.play(g.generate_moves(PieceColor.BLACK)[0])
+
+    def no_iter(self):
+        raise AssertionError("snapshot went through the pieces")
+    monkeypatch.setattr(PieceIndex, "__iter__", no_iter)
+    snap = g.snapshot()
+    monkeypatch.undo()
+
+    assert snap.position()._hash is None
+    assert snap.position() == g.position()
+    assert hash(snap.position()) == hash(g.position())
+    assert (list(snap.player_valid_moves(PieceColor.RED).items()) ==
+            list(g.player_valid_moves(PieceColor.RED).items()))
@@ -1,8 +1,8 @@
 import click
 from colorama import Fore, Back, Style
 
-from checkers import CheckersGame, Board, PieceColor, Piece
-from bot import randomBot, smartBot
+from checkers import Board, PieceColor, Piece
+from bot import randomBot, smartBot, SEARCH_MODES, ENGINES
 
 class TUIPlayer:
     """
@@ -11,7 +11,7 @@ class TUIPlayer:
     The TUI player can either be a human or bot
     """
     def __init__(self, player_num, player, board, color, opponent_color,
-    depth = 2):
+    depth = 2, search = "minimax", move_time = None):
         """
         Input:
             player_num (int): Player number (1 or 2)
@@ -21,6 +21,11 @@ class TUIPlayer:
             opponent_color (PieceColor): opponent's color 
             depth (int): optional parameter that only applies to smart-bot 
             algorithm
+            search (str): optional parameter that only applies to smart-bot,
+            the search algorithm (one of SEARCH_MODES)
+            move_time (float): optional parameter that only applies to
+            smart-bot, seconds it may think about each move instead of
+            searching to depth
         """
         self.color = color
         if player == "human":
@@ -34,7 +39,8 @@ class TUIPlayer:
         elif player == "smart-bot":
             self.name = ("Smart Bot " + str(player_num) + 
             " (" + str(self.color) + ")")
-            self.bot = smartBot(board, color, depth)
+            self.bot = smartBot(board, color, depth, search,
+                                move_time = move_time)
         
         self.board = board
         self.opponent_color = opponent_color
@@ -99,8 +105,9 @@ class TUIPlayer:
         moves the bot to the suggested place.
         """
         if self.bot is not None:
-            start, end = self.bot.suggest_move()
-            self.board.move(self.color, start, end)
+            move = self.bot.choose_move()
+            start, end = move.get_start(), move.get_end()
+            self.board.play(move)
             print(str(self.name) + " moved \n" + "From:" + str(start) + 
             "\n" + "To:" + str(end))
 
@@ -230,29 +237,35 @@ def play_checkers(board, players):
               case_sensitive = False), default = "human")
 @click.option('--piece_rows', required = True, prompt = True,
 type = click.Choice(["2", "3", "4", "5", "6", "7", "8", "9"]))
+@click.option('--search', type = click.Choice(SEARCH_MODES),
+              default = "minimax")
+@click.option('--move-time', type = click.FLOAT, default = None)
+@click.option('--engine', type = click.Choice(list(ENGINES)),
+              default = "grid")
 
-def cmd(piece_rows, player1, player2):
+def cmd(piece_rows, player1, player2, search, move_time, engine):
+    game_cls = ENGINES[engine]
     if piece_rows == "2":
-        board = CheckersGame(2)
+        board = game_cls(2)
     elif piece_rows == "3":
-        board = CheckersGame(3)
+        board = game_cls(3)
     elif piece_rows == "4":
-        board = CheckersGame(4)
+        board = game_cls(4)
     elif piece_rows == "5":
-        board = CheckersGame(5)
+        board = game_cls(5)
     elif piece_rows == "6":
-        board = CheckersGame(6)
+        board = game_cls(6)
     elif piece_rows == "7":
-        board = CheckersGame(7)
+        board = game_cls(7)
     elif piece_rows == "8":
-        board = CheckersGame(8)
+        board = game_cls(8)
     elif piece_rows == "9":
-        board = CheckersGame(9)
+        board = game_cls(9)
 
     player1 = TUIPlayer(1, player1, board, PieceColor.BLACK, 
-    PieceColor.RED)
+    PieceColor.RED, search = search, move_time = move_time)
     player2 = TUIPlayer(2, player2, board, PieceColor.RED, 
-    PieceColor.BLACK)
+    PieceColor.BLACK, search = search, move_time = move_time)
 
     players = {PieceColor.BLACK: player1, PieceColor.RED: player2}
 